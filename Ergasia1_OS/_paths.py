@@ -0,0 +1,12 @@
+'''
+Το opsearch (κοινά εργαλεία: IR, portfolio, μετρήσεις ανά φάση) βρίσκεται στη ρίζα του repo.
+Κάθε module που το χρησιμοποιεί κάνει πρώτα `import _paths`, οπότε δουλεύει και όταν
+φορτώνεται μόνο του (π.χ. `python lagrangian.py` ή `import lagrangian` από το Ergasia1_OS).
+'''
+
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
@@ -0,0 +1,213 @@
+'''
+Κοινή κατασκευή των μοντέλων ανάθεσης (erotima1, erotima3, er3_test, test_code).
+
+Αντί για ένα IntVar ανά κελί και solver.Sum ανά γραμμή/στήλη, οι μεταβλητές,
+οι περιορισμοί και οι συντελεστές του objective περνάνε μαζικά στο
+ModelBuilder του OR-Tools από έναν αραιό (CSR) πίνακα περιορισμών.
+Η μεταβλητή x[i][j] έχει δείκτη i * jobs + j.
+
+Το μοντέλο φτιάχνεται πρώτα ως opsearch.ir.Problem (assignment_problem), οπότε
+λύνεται και σε CP-SAT / Gurobi / native (LAP ή Lagrangian) με το ir.solve.
+'''
+
+import time
+import numpy as np
+
+import _paths
+from opsearch import ir
+from opsearch.instrument import traced, current
+
+
+def block_ranges(n, block_size):
+    # ίδια διαμέριση με το range(0, n, 5) των αρχικών μοντέλων
+    return [(start, min(start + block_size, n)) for start in range(0, n, block_size)]
+
+
+def assignment_constraints(workers, jobs, rows_equal=False, block_size=None, block_min=2):
+    '''
+    Επιστρέφει (A, lower, upper) για τους περιορισμούς:
+      γραμμές  sum_j x[i][j] <= 1 (== 1 με rows_equal)
+      στήλες   sum_i x[i][j] == 1
+      blocks   sum x μέσα σε κάθε διαγώνιο block_size x block_size block >= block_min
+    '''
+    import scipy.sparse as sp
+    n_vars = workers * jobs
+    var_index = np.arange(n_vars)
+    row_ids = [var_index // jobs, workers + var_index % jobs]
+    col_ids = [var_index, var_index]
+    lower = [np.full(workers, 1.0 if rows_equal else -np.inf), np.ones(jobs)]
+    upper = [np.ones(workers), np.ones(jobs)]
+
+    if block_size:
+        blocks = block_ranges(min(workers, jobs), block_size)
+        offset = workers + jobs
+        for k, (start, end) in enumerate(blocks):
+            cells = (np.arange(start, end)[:, None] * jobs + np.arange(start, end)[None, :]).ravel()
+            row_ids.append(np.full(cells.size, offset + k))
+            col_ids.append(cells)
+        lower.append(np.full(len(blocks), float(block_min)))
+        upper.append(np.full(len(blocks), np.inf))
+
+    lower = np.concatenate(lower)
+    upper = np.concatenate(upper)
+    row_ids = np.concatenate(row_ids)
+    col_ids = np.concatenate(col_ids)
+    matrix = sp.csr_matrix((np.ones(row_ids.size), (row_ids, col_ids)), shape=(lower.size, n_vars))
+    return matrix, lower, upper
+
+
+def model_cells(shape, fixed_zero=None):
+    # οι δείκτες i * jobs + j των κελιών που έχουν μεταβλητή στο μοντέλο
+    if fixed_zero is None:
+        return np.arange(shape[0] * shape[1])
+    return np.flatnonzero(~np.asarray(fixed_zero, dtype=bool).ravel())
+
+
+def assignment_problem(jobs_matrix, rows_equal=False, block_size=None, block_min=2, fixed_zero=None):
+    '''
+    Το μοντέλο ανάθεσης ως ir.Problem (kind "assignment"). Στο data κρατιούνται ο
+    πίνακας κόστους και τα κελιά των μεταβλητών, για τον native solver.
+    '''
+    jobs_matrix = np.asarray(jobs_matrix)
+    workers, jobs = jobs_matrix.shape
+    matrix, lower, upper = assignment_constraints(workers, jobs, rows_equal, block_size, block_min)
+    cells = model_cells(jobs_matrix.shape, fixed_zero)
+    if fixed_zero is not None:
+        matrix = matrix.tocsc()[:, cells].tocsr()
+    data = {"cost": jobs_matrix, "cells": cells, "rows_equal": rows_equal,
+            "block_size": block_size or 0, "block_min": block_min}
+    return ir.Problem(jobs_matrix.ravel()[cells].astype(np.float64), matrix, lower, upper,
+                      kind="assignment", data=data)
+
+
+def assignment_hint(problem, hint):
+    # λίστα (i, j) μιας λύσης -> (indices, values) στις μεταβλητές του problem
+    jobs = problem.data["cost"].shape[1]
+    cells = np.array([int(i) * jobs + int(j) for i, j in hint], dtype=np.int64)
+    position = np.searchsorted(problem.data["cells"], cells)
+    position = np.minimum(position, problem.n_vars - 1)
+    keep = problem.data["cells"][position] == cells
+    return position[keep], np.ones(int(keep.sum()))
+
+
+def build_assignment_model(jobs_matrix, rows_equal=False, block_size=None, block_min=2, fixed_zero=None, hint=None):
+    '''
+    fixed_zero: boolean πίνακας workers x jobs με τα x[i][j] που κλειδώνονται στο 0·
+    για αυτά δεν δημιουργείται καν μεταβλητή (βλ. model_cells).
+    hint: λίστα από (i, j) μιας γνωστής λύσης, δίνεται στον solver ως αρχική λύση.
+    '''
+    start_time = time.time()
+    problem = assignment_problem(jobs_matrix, rows_equal, block_size, block_min, fixed_zero)
+    model = ir.to_model_builder(problem, assignment_hint(problem, hint) if hint is not None else None)
+    end_time = time.time()
+    return model, end_time - start_time
+
+
+def run_assignment_model(model, solver_name="SCIP", time_limit=None):
+    '''
+    Καλεί τον solver και επιστρέφει (status, best_bound, total_cost, values),
+    όπου values οι τιμές όλων των μεταβλητών (None αν δεν βρέθηκε λύση).
+    '''
+    return ir.solve_model_builder(model, solver_name, time_limit)
+
+
+def extract_assignments(jobs_matrix, values, fixed_zero=None):
+    # οι αναθέσεις (worker, job, κόστος) από το διάνυσμα τιμών των μεταβλητών
+    jobs_matrix = np.asarray(jobs_matrix)
+    chosen = model_cells(jobs_matrix.shape, fixed_zero)[values > 0.5]
+    rows, cols = np.divmod(chosen, jobs_matrix.shape[1])
+    return [(int(i), int(j), jobs_matrix[i][j]) for i, j in zip(rows, cols)]
+
+
+def solve_assignment_model(model, jobs_matrix, solver_name="SCIP", time_limit=None, stats=None, fixed_zero=None):
+    '''
+    Λύνει το μοντέλο και επιστρέφει (total_cost, assignments, solve_time)
+    όπως οι αρχικοί solvers, ή (None, None, solve_time) αν δεν βρεθεί λύση.
+    Στο stats (αν δοθεί) γράφονται το status και το best_bound του solver.
+    Το fixed_zero πρέπει να είναι το ίδιο με αυτό του build_assignment_model.
+    '''
+    start_time = time.time()
+    status, best_bound, total_cost, values = run_assignment_model(model, solver_name, time_limit)
+    end_time = time.time()
+
+    if stats is not None:
+        stats["status"] = status
+        stats["best_bound"] = best_bound
+    if values is None:
+        return None, None, end_time - start_time
+    return total_cost, extract_assignments(jobs_matrix, values, fixed_zero), end_time - start_time
+
+
+def solver_available(solver_name):
+    return ir.model_builder_available(solver_name)
+
+
+@traced("solve.assignment")
+def solve_assignment(jobs_matrix, solver_name="SCIP", rows_equal=False, block_size=None, block_min=2,
+                     time_limit=None, stats=None, hint=None, fixed_zero=None):
+    '''
+    Κατασκευή και επίλυση μαζί. Αν δοθεί dict στο stats, γράφονται σε αυτό
+    χωριστά ο χρόνος κατασκευής (build_time) και επίλυσης (solve_time).
+    '''
+    current().set(solver=solver_name.upper(), n=len(jobs_matrix), block_size=block_size)
+    if not solver_available(solver_name):
+        if stats is not None:
+            stats["build_time"] = stats["solve_time"] = 0.0
+        return None, None, 0
+    model, build_time = build_assignment_model(jobs_matrix, rows_equal, block_size, block_min, fixed_zero, hint)
+    total_cost, assignments, solve_time = solve_assignment_model(model, jobs_matrix, solver_name, time_limit, stats, fixed_zero)
+    if stats is not None:
+        stats["build_time"] = build_time
+        stats["solve_time"] = solve_time
+    return total_cost, assignments, solve_time
+
+
+def solve_portfolio(jobs_matrix, backends=None, rows_equal=False, block_size=None, block_min=2,
+                    time_limit=None, stats=None, log_path=None):
+    '''
+    Όπως το solve_assignment, αλλά τα backends (default SCIP, CBC, NATIVE) τρέχουν
+    παράλληλα και κρατιέται το πρώτο που αποδεικνύει τη βέλτιστη λύση (opsearch.portfolio).
+    Στο stats γράφονται επιπλέον ο νικητής (backend) και τα αποτελέσματα όλων (portfolio).
+    '''
+    from opsearch import portfolio
+
+    start_time = time.time()
+    problem = assignment_problem(jobs_matrix, rows_equal, block_size, block_min)
+    build_time = time.time() - start_time
+    result = portfolio.race(problem, backends or portfolio.DEFAULT_BACKENDS, time_limit,
+                            log_path=log_path or portfolio.DEFAULT_LOG)
+    if stats is not None:
+        stats.update(build_time=build_time, solve_time=result["time"], status=result["status"],
+                     best_bound=result["best_bound"], backend=result["backend"], portfolio=result["results"])
+    if result["values"] is None:
+        return None, None, result["time"]
+    return result["objective"], extract_assignments(jobs_matrix, result["values"]), result["time"]
+
+
+def _native_assignment(problem, time_limit=None, threads=None, gap_limit=None, hint=None):
+    # native για το ir.solve: LAP (χωρίς blocks) ή Lagrangian (με blocks) πάνω στον πίνακα κόστους
+    jobs_matrix = np.array(problem.data["cost"])
+    cells = problem.data["cells"]
+    workers, jobs = jobs_matrix.shape
+    if cells.size != workers * jobs:
+        raise ValueError("the native assignment solver does not support fixed_zero cells")
+    block_size = int(problem.data["block_size"])
+    if block_size:
+        from lagrangian import lagrangian_groups_solver
+        stats = {}
+        total_cost, assignments, _ = lagrangian_groups_solver(jobs_matrix, block_size, int(problem.data["block_min"]),
+                                                              time_limit=time_limit, stats=stats)
+        status = "OPTIMAL" if stats.get("optimal") else "FEASIBLE"
+        best_bound = stats.get("lower_bound")
+    else:
+        from lap import lap_solver
+        total_cost, assignments, _ = lap_solver(jobs_matrix)
+        status, best_bound = "OPTIMAL", total_cost
+    if assignments is None:
+        return "INFEASIBLE", None, None, None
+    values = np.zeros(problem.n_vars)
+    values[[i * jobs + j for i, j, _ in assignments]] = 1.0
+    return status, best_bound, total_cost, values
+
+
+ir.register_native("assignment", _native_assignment)
@@ -0,0 +1,177 @@
+'''
+Παράλληλη εκτέλεση ενός solver πάνω σε πολλά instances (π.χ. assign4...assign800).
+
+Κάθε instance τρέχει σε δική του διεργασία, με το πολύ --workers ταυτόχρονα και
+όριο χρόνου --timeout ανά instance. Τα αποτελέσματα εμφανίζονται όπως τελειώνουν,
+και οι λύσεις γράφονται ατομικά (tmp αρχείο + os.replace) στο solutions/<erotima>.
+Αποτυχία ή timeout ενός instance δεν σταματάει τα υπόλοιπα.
+
+    python batch.py --solver lap --workers 8 "dataset/assign*.txt"
+'''
+
+import os
+import sys
+import glob
+import time
+import argparse
+import traceback
+import multiprocessing
+from multiprocessing.connection import wait
+
+# όνομα -> (module, συνάρτηση, όνομα solver, φάκελος λύσεων, κατάληξη αρχείου)
+SOLVERS = {
+    "scip": ("erotima1", "assignment_problem_solver", "SCIP", "solutions/erotima1", "_erotima1_solution.txt"),
+    "cbc": ("erotima1", "assignment_problem_solver", "CBC", "solutions/erotima1", "_erotima1_solution.txt"),
+    "lap": ("erotima1", "assignment_problem_solver", "LAP", "solutions/erotima1", "_erotima1_solution.txt"),
+    "auction": ("erotima1", "assignment_problem_solver", "AUCTION", "solutions/erotima1", "_erotima1_solution.txt"),
+    "groups": ("erotima3", "assignment_groups_solver", "SCIP", "solutions/erotima3", "_erotima3_solution.txt"),
+    "groups-cbc": ("erotima3", "assignment_groups_solver", "CBC", "solutions/erotima3", "_erotima3_solution.txt"),
+    "groups-lagrange": ("erotima3", "assignment_groups_solver", "LAGRANGE", "solutions/erotima3", "_erotima3_solution.txt"),
+}
+SOLVERS["hungarian"] = SOLVERS["lap"]
+
+DEFAULT_INSTANCES = "dataset/assign*[0-9].txt"
+
+
+def find_instances(patterns=(), manifest=None):
+    files = []
+    for pattern in patterns:
+        files.extend(sorted(glob.glob(pattern)) or [pattern])
+    if manifest:
+        with open(manifest, 'r') as file:
+            for line in file:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    files.append(line)
+    # τα μεγαλύτερα πρώτα, ώστε να μη μείνει το assign800 τελευταίο σε ένα worker
+    unique = list(dict.fromkeys(files))
+    return sorted(unique, key=lambda f: os.path.getsize(f) if os.path.exists(f) else 0, reverse=True)
+
+
+def solution_path(file, solver, output_dir=None):
+    _, _, _, default_dir, suffix = SOLVERS[solver]
+    filename = os.path.basename(file)
+    return os.path.join(output_dir or default_dir, filename.replace(".txt", suffix))
+
+
+def write_solution_atomic(file_path, total_cost, assignments):
+    from solution_io import write_solution
+
+    directory = os.path.dirname(file_path) or "."
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = os.path.join(directory, f".{os.path.basename(file_path)}.{os.getpid()}.tmp")
+    try:
+        write_solution(tmp_path, total_cost, assignments)
+        os.replace(tmp_path, file_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def solve_instance(file, solver, output_dir=None):
+    module_name, function_name, solver_name, _, _ = SOLVERS[solver]
+    module = __import__(module_name)
+    from erotima1 import read_file
+
+    jobs_matrix = read_file(file)
+    stats = {}
+    total_cost, assignments, solve_time = getattr(module, function_name)(jobs_matrix, solver_name, stats=stats)
+    result = {"total_cost": total_cost, "solve_time": solve_time, "build_time": stats.get("build_time", 0.0)}
+    if total_cost is None:
+        result["status"] = "infeasible"
+        return result
+    result["solution_file"] = solution_path(file, solver, output_dir)
+    write_solution_atomic(result["solution_file"], total_cost, assignments)
+    result["status"] = "ok"
+    return result
+
+
+def _worker(conn, file, solver, output_dir):
+    try:
+        result = solve_instance(file, solver, output_dir)
+    except Exception:
+        result = {"status": "failed", "error": traceback.format_exc()}
+    conn.send(result)
+    conn.close()
+
+
+def run_batch(files, solver, workers=None, timeout=None, output_dir=None):
+    '''
+    Generator: επιστρέφει ένα dict αποτελέσματος για κάθε instance μόλις τελειώσει
+    (file, status = ok / infeasible / failed / timeout, total_cost, χρόνοι).
+    '''
+    if solver not in SOLVERS:
+        raise ValueError(f"unknown solver {solver!r}, choose from {sorted(SOLVERS)}")
+    workers = workers or os.cpu_count() or 1
+    # import μία φορά στον parent, ώστε με fork τα παιδιά να κληρονομούν το module (numpy, lap, ...)·
+    # το ortools φορτώνεται lazily μέσα στους solvers, άρα το φορτώνει κάθε παιδί μόνο του
+    __import__(SOLVERS[solver][0])
+    pending = list(files)
+    running = {}  # conn -> (process, file, start)
+
+    while pending or running:
+        while pending and len(running) < workers:
+            file = pending.pop(0)
+            parent_conn, child_conn = multiprocessing.Pipe(duplex=False)
+            process = multiprocessing.Process(target=_worker, args=(child_conn, file, solver, output_dir), daemon=True)
+            process.start()
+            child_conn.close()
+            running[parent_conn] = (process, file, time.perf_counter())
+
+        now = time.perf_counter()
+        wait_time = None
+        if timeout is not None:
+            wait_time = max(0.0, min(start + timeout for _, _, start in running.values()) - now)
+        ready = wait(list(running), timeout=wait_time)
+
+        now = time.perf_counter()
+        for conn in list(running):
+            process, file, start = running[conn]
+            if conn in ready:
+                try:
+                    result = conn.recv()
+                except EOFError:
+                    result = {"status": "failed", "error": f"worker exited with code {process.exitcode}"}
+            elif timeout is not None and now - start >= timeout:
+                process.kill()
+                result = {"status": "timeout"}
+            else:
+                continue
+            process.join()
+            conn.close()
+            del running[conn]
+            result["file"] = file
+            result["wall_time"] = now - start
+            yield result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Παράλληλη επίλυση instances ανάθεσης")
+    parser.add_argument("instances", nargs="*", help="αρχεία ή glob patterns")
+    parser.add_argument("--manifest", help="αρχείο με ένα instance ανά γραμμή")
+    parser.add_argument("--solver", default="scip", choices=sorted(SOLVERS))
+    parser.add_argument("--workers", type=int, default=None, help="default: όλοι οι πυρήνες")
+    parser.add_argument("--timeout", type=float, default=None, help="δευτερόλεπτα ανά instance")
+    parser.add_argument("--output-dir", default=None)
+    args = parser.parse_args(argv)
+
+    patterns = args.instances or ([] if args.manifest else [DEFAULT_INSTANCES])
+    files = find_instances(patterns, args.manifest)
+
+    start = time.perf_counter()
+    failures = 0
+    for result in run_batch(files, args.solver, args.workers, args.timeout, args.output_dir):
+        if result["status"] == "ok":
+            print(f"Solved {result['file']}: Total Cost = {result['total_cost']}, "
+                  f"Time = {result['solve_time']:.2f} sec, Wall = {result['wall_time']:.2f} sec")
+        else:
+            failures += 1
+            print(f"[{result['status']}] {result['file']} after {result['wall_time']:.2f} sec")
+            if "error" in result:
+                print(result["error"], file=sys.stderr)
+    print(f"{len(files)} instances, {failures} failed, Total Time = {time.perf_counter() - start:.2f} sec")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
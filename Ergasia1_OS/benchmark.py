@@ -0,0 +1,389 @@
+'''
+Benchmark όλων των solvers των δύο εργασιών, με επαναλήψιμες μετρήσεις.
+
+- κάθε (case, instance) τρέχει σε καινούργια διεργασία (spawn), ώστε το peak RSS να αφορά μόνο αυτό
+- warmup εκτελέσεις που δεν μετράνε και μετά --repeat μετρήσεις με time.perf_counter
+- χωριστοί χρόνοι για load / build / solve / extract (None όπου η φάση δεν ξεχωρίζει)
+- συνθετικά instances μεγαλύτερα από το assign800 (--synthetic 1000,2000)
+- έξοδος JSON / CSV, σύγκριση με αποθηκευμένο baseline (--baseline) για regressions
+- τα PNG διαγράμματα βγαίνουν headless (Agg) από τα αποτελέσματα
+
+    python benchmark.py --cases scip,lap,hungarian,networkx --repeat 5 --output results.json
+    python benchmark.py --cases lap --synthetic 1000,2000 --baseline results.json
+'''
+
+import os
+import io
+import sys
+import csv
+import glob
+import json
+import time
+import argparse
+import tempfile
+import statistics
+import contextlib
+import multiprocessing
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ERGASIA2_DIR = os.path.join(os.path.dirname(HERE), "Ergasia2_OS")
+PHASES = ("load", "build", "solve", "extract")
+DEFAULT_INSTANCES = os.path.join(HERE, "dataset", "assign*[0-9].txt")
+BURRITO_DAYS = ("burrito:1", "burrito:2", "burrito:3", "burrito:4", "burrito:5")
+
+
+def _timed(phases, name, function, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    phases[name] = time.perf_counter() - start
+    return result
+
+
+# ---------------------------------------------------------------- cases του Ergasia1_OS
+
+def _mip_case(solver_name, block_size=None):
+    def run(instance):
+        from erotima1 import read_file
+        from assignment_model import build_assignment_model, run_assignment_model, extract_assignments
+
+        phases = {}
+        jobs_matrix = _timed(phases, "load", read_file, instance)
+        model, _ = _timed(phases, "build", build_assignment_model, jobs_matrix, block_size=block_size)
+        _, _, total_cost, values = _timed(phases, "solve", run_assignment_model, model, solver_name)
+        if values is not None:
+            _timed(phases, "extract", extract_assignments, jobs_matrix, values)
+        return phases, total_cost, len(jobs_matrix)
+    return run
+
+
+def _lap_case(instance):
+    import numpy as np
+    from erotima1 import read_file
+    from lap import pad_matrix, solve_lap
+
+    phases = {}
+    jobs_matrix = _timed(phases, "load", read_file, instance)
+    costs = _timed(phases, "build", lambda: pad_matrix(np.asarray(jobs_matrix)).astype(np.float64))
+    col4row, _, _ = _timed(phases, "solve", solve_lap, costs)
+    # οι στήλες πέρα από τα jobs είναι τα dummy του pad_matrix, όπως στο lap.lap_solver
+    jobs = jobs_matrix.shape[1]
+    total_cost = _timed(phases, "extract", lambda: float(sum(int(jobs_matrix[i][j]) for i, j in enumerate(col4row) if j < jobs)))
+    return phases, total_cost, len(jobs_matrix)
+
+
+def _lagrangian_case(instance):
+    from erotima1 import read_file
+    from lagrangian import lagrangian_groups_solver
+
+    phases = {}
+    jobs_matrix = _timed(phases, "load", read_file, instance)
+    total_cost, _, _ = _timed(phases, "solve", lagrangian_groups_solver, jobs_matrix)
+    return phases, total_cost, len(jobs_matrix)
+
+
+def _networkx_case(instance):
+    import networkx as nx
+    from erotima1 import read_file
+    from erotima2 import build_bipartite_graph
+
+    phases = {}
+    jobs_matrix = _timed(phases, "load", read_file, instance)
+    n = len(jobs_matrix)
+    graph = _timed(phases, "build", build_bipartite_graph, jobs_matrix)
+    matching = _timed(phases, "solve", nx.algorithms.bipartite.minimum_weight_full_matching,
+                      graph, top_nodes=range(n), weight='weight')
+    total_cost = _timed(phases, "extract", lambda: sum(int(jobs_matrix[i][matching[i] - n]) for i in range(n)))
+    return phases, total_cost, n
+
+
+def _hungarian_case(instance):
+    from erotima1 import read_file
+    from sparse_matching import sparse_matching, matching_cost
+
+    phases = {}
+    jobs_matrix = _timed(phases, "load", read_file, instance)
+    rows, cols = _timed(phases, "solve", sparse_matching, jobs_matrix)
+    total_cost = _timed(phases, "extract", matching_cost, jobs_matrix, rows, cols)
+    return phases, total_cost, len(jobs_matrix)
+
+
+# ---------------------------------------------------------------- cases του Ergasia2_OS
+
+def _burrito_case(module_name, function_name):
+    # οι burrito solvers φορτώνουν τα δεδομένα μόνοι τους, οπότε build/solve/extract μετράνε μαζί στο solve
+    def run(instance):
+        if ERGASIA2_DIR not in sys.path:
+            sys.path.insert(0, ERGASIA2_DIR)
+        os.chdir(ERGASIA2_DIR)
+        from read_dataset import load_data, load_scenario
+
+        day = int(instance.split(":")[1])
+        phases = {}
+        # το load_scenario κρατά το scenario σε LRU: χωρίς cache_clear κάθε επανάληψη μετά την
+        # πρώτη θα μετρούσε ένα cache hit αντί για τη φόρτωση (από το .npz cache, όπως μια νέα διεργασία)
+        load_scenario.cache_clear()
+        demand_nodes, _, _ = _timed(phases, "load", load_data, day)
+        solver = getattr(__import__(module_name), function_name)
+        with contextlib.redirect_stdout(io.StringIO()):
+            profit = _timed(phases, "solve", solver, day)
+        return phases, profit, len(demand_nodes)
+    return run
+
+
+CASES = {
+    "scip": ("assignment", _mip_case("SCIP")),
+    "cbc": ("assignment", _mip_case("CBC")),
+    "lap": ("assignment", _lap_case),
+    "hungarian": ("assignment", _hungarian_case),
+    "networkx": ("assignment", _networkx_case),
+    "groups-scip": ("assignment", _mip_case("SCIP", block_size=5)),
+    "groups-cbc": ("assignment", _mip_case("CBC", block_size=5)),
+    "groups-lagrange": ("assignment", _lagrangian_case),
+    "burrito-cpsat": ("burrito", _burrito_case("cpsat_burrito", "cpsat_solver")),
+    "burrito-gurobi": ("burrito", _burrito_case("gurobi_burrito", "solve_with_gurobi")),
+    "burrito-ufl": ("burrito", _burrito_case("ufl_burrito", "ufl_solver")),
+}
+
+
+# ---------------------------------------------------------------- εκτέλεση
+
+def _summary(values):
+    if not values:
+        return None
+    return {
+        "mean": statistics.fmean(values),
+        "median": statistics.median(values),
+        "stdev": statistics.stdev(values) if len(values) > 1 else 0.0,
+        "min": min(values),
+        "runs": values,
+    }
+
+
+def _peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux: KB, macOS: bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def measure(case, instance, warmup=1, repeat=3):
+    # τρέχει μέσα στη διεργασία που μετράει: warmup + repeat εκτελέσεις
+    _, run = CASES[case]
+    for _ in range(warmup):
+        run(instance)
+    samples = {phase: [] for phase in PHASES}
+    totals = []
+    objective = size = None
+    for _ in range(repeat):
+        phases, objective, size = run(instance)
+        for phase in PHASES:
+            if phase in phases:
+                samples[phase].append(phases[phase])
+        totals.append(sum(phases.values()))
+    return {
+        "case": case,
+        "instance": instance,
+        "size": size,
+        "objective": objective,
+        "warmup": warmup,
+        "repeat": repeat,
+        "phases": {phase: _summary(values) for phase, values in samples.items()},
+        "total": _summary(totals),
+        "peak_rss_mb": _peak_rss_mb(),
+        "status": "ok",
+    }
+
+
+def _child(conn, case, instance, warmup, repeat):
+    sys.path.insert(0, HERE)
+    os.chdir(HERE)
+    try:
+        result = measure(case, instance, warmup, repeat)
+    except Exception as error:
+        result = {"case": case, "instance": instance, "status": "failed", "error": repr(error)}
+    conn.send(result)
+    conn.close()
+
+
+def run_benchmark(cases, instances, warmup=1, repeat=3, timeout=None):
+    '''
+    Generator με ένα αποτέλεσμα (dict) για κάθε (case, instance) με συμβατό είδος.
+    Κάθε μέτρηση γίνεται σε ξεχωριστή spawn διεργασία, η μία μετά την άλλη.
+    '''
+    context = multiprocessing.get_context("spawn")
+    for case in cases:
+        kind, _ = CASES[case]
+        for instance in instances:
+            if instance.startswith("burrito:") != (kind == "burrito"):
+                continue
+            parent_conn, child_conn = context.Pipe(duplex=False)
+            process = context.Process(target=_child, args=(child_conn, case, instance, warmup, repeat))
+            process.start()
+            child_conn.close()
+            if parent_conn.poll(timeout):
+                try:
+                    result = parent_conn.recv()
+                except EOFError:
+                    result = {"case": case, "instance": instance, "status": "failed",
+                              "error": f"exit code {process.exitcode}"}
+            else:
+                process.kill()
+                result = {"case": case, "instance": instance, "status": "timeout"}
+            process.join()
+            yield result
+
+
+def write_synthetic(directory, sizes, seed=0, structure="uniform"):
+    # instances από το generator.py, με κόστη 1..100 όπως το dataset
+    from generator import write_instance
+
+    return [write_instance(os.path.join(directory, f"synthetic{n}.txt"), n, seed=seed, structure=structure)[0]
+            for n in sizes]
+
+
+# ---------------------------------------------------------------- έξοδος
+
+def write_json(results, path):
+    with open(path, 'w') as file:
+        json.dump(results, file, indent=2)
+
+
+def read_json(path):
+    with open(path, 'r') as file:
+        return json.load(file)
+
+
+def write_csv(results, path):
+    with open(path, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(["case", "instance", "size", "objective", "phase", "mean", "median", "stdev", "min", "peak_rss_mb", "status"])
+        for result in results:
+            rows = dict(result.get("phases") or {})
+            rows["total"] = result.get("total")
+            for phase, summary in rows.items():
+                summary = summary or {}
+                writer.writerow([
+                    result["case"], result["instance"], result.get("size"), result.get("objective"), phase,
+                    summary.get("mean"), summary.get("median"), summary.get("stdev"), summary.get("min"),
+                    result.get("peak_rss_mb"), result["status"],
+                ])
+
+
+def compare(results, baseline, tolerance=0.2, min_seconds=0.01):
+    '''
+    Επιστρέφει λίστα μηνυμάτων για κάθε (case, instance) που έγινε πιο αργό από το
+    baseline κατά πάνω από tolerance (στη median συνολικού χρόνου) ή άλλαξε objective.
+    '''
+    old = {(r["case"], os.path.basename(r["instance"])): r for r in baseline if r.get("status") == "ok"}
+    problems = []
+    for result in results:
+        key = (result["case"], os.path.basename(result["instance"]))
+        if result.get("status") != "ok":
+            problems.append(f"{key[0]} {key[1]}: {result.get('status')}")
+            continue
+        if key not in old:
+            continue
+        before, after = old[key]["total"]["median"], result["total"]["median"]
+        if after > before * (1 + tolerance) and after - before > min_seconds:
+            problems.append(f"{key[0]} {key[1]}: {before:.4f}s -> {after:.4f}s ({after / before - 1:+.0%})")
+        if old[key].get("objective") is not None and result.get("objective") is not None \
+                and abs(old[key]["objective"] - result["objective"]) > 1e-6:
+            problems.append(f"{key[0]} {key[1]}: objective {old[key]['objective']} -> {result['objective']}")
+    return problems
+
+
+def plot_results(results, output_dir):
+    # headless: Figure + Agg canvas, χωρίς pyplot και χωρίς παράθυρο
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    by_case = {}
+    for result in results:
+        if result.get("status") == "ok":
+            by_case.setdefault(result["case"], []).append(result)
+
+    os.makedirs(output_dir, exist_ok=True)
+    plots = [
+        ("cost_comparison.png", "Σύγκριση Κόστους", "Κόστος Λύσης", lambda r: r["objective"]),
+        ("time_comparison.png", "Σύγκριση Χρόνου Επίλυσης", "Χρόνος (sec)", lambda r: r["phases"]["solve"]["median"]),
+    ]
+    paths = []
+    for filename, title, ylabel, value in plots:
+        figure = Figure()
+        FigureCanvasAgg(figure)
+        axes = figure.add_subplot()
+        for case, rows in by_case.items():
+            rows = sorted(rows, key=lambda r: r["size"])
+            axes.plot([r["size"] for r in rows], [value(r) for r in rows], label=case, marker='o')
+        axes.set_xlabel('Μέγεθος Προβλήματος (n)')
+        axes.set_ylabel(ylabel)
+        axes.set_title(title)
+        axes.legend()
+        axes.grid(True)
+        path = os.path.join(output_dir, filename)
+        figure.savefig(path)
+        paths.append(path)
+    return paths
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark των solvers ανάθεσης και burrito")
+    parser.add_argument("--cases", default="scip,lap,hungarian", help=f"από: {','.join(CASES)}")
+    parser.add_argument("--instances", nargs="*", default=None,
+                        help="αρχεία/globs ή burrito:<day>· default όλο το dataset (και οι 5 μέρες για τα burrito cases)")
+    parser.add_argument("--synthetic", default="", help="μεγέθη συνθετικών instances, π.χ. 1000,2000")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=None, help="δευτερόλεπτα ανά (case, instance)")
+    parser.add_argument("--output", default=None, help="αρχείο JSON αποτελεσμάτων")
+    parser.add_argument("--csv", default=None)
+    parser.add_argument("--baseline", default=None, help="JSON προηγούμενης εκτέλεσης για σύγκριση")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument("--plot", default=None, help="φάκελος για τα PNG διαγράμματα")
+    args = parser.parse_args(argv)
+
+    cases = [case.strip() for case in args.cases.split(",") if case.strip()]
+    unknown = [case for case in cases if case not in CASES]
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(unknown)}")
+
+    instances = []
+    for pattern in args.instances or [DEFAULT_INSTANCES, *BURRITO_DAYS]:
+        instances.extend(pattern.split() if pattern.startswith("burrito:")
+                         else [os.path.abspath(p) for p in sorted(glob.glob(pattern)) or [pattern]])
+
+    with tempfile.TemporaryDirectory() as directory:
+        sizes = [int(size) for size in args.synthetic.split(",") if size.strip()]
+        instances.extend(write_synthetic(directory, sizes, args.seed))
+
+        results = []
+        for result in run_benchmark(cases, instances, args.warmup, args.repeat, args.timeout):
+            results.append(result)
+            if result["status"] == "ok":
+                total = result["total"]
+                print(f"{result['case']:>16} {os.path.basename(result['instance']):>20}: "
+                      f"objective = {result['objective']}, median = {total['median']:.4f} sec "
+                      f"(± {total['stdev']:.4f}), peak RSS = {result['peak_rss_mb']:.0f} MB")
+            else:
+                print(f"{result['case']:>16} {os.path.basename(result['instance']):>20}: {result['status']} {result.get('error', '')}")
+
+    if args.output:
+        write_json(results, args.output)
+    if args.csv:
+        write_csv(results, args.csv)
+    if args.plot:
+        plot_results(results, args.plot)
+    if args.baseline:
+        problems = compare(results, read_json(args.baseline), args.tolerance)
+        for problem in problems:
+            print(f"REGRESSION {problem}")
+        return 1 if problems else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -1,90 +1,10 @@
 import os
-import time
-import numpy as np
-from ortools.linear_solver import pywraplp
-from erotima1 import read_file, write_solution
-def faster_solver(jobs_matrix):
-    n = len(jobs_matrix)
-    solver = pywraplp.Solver.CreateSolver("CBC")
-    if not solver:
-        return None, None, 0
+from erotima1 import read_file
+from solution_io import write_solution
+from erotima3 import assignment_groups_solver
+def faster_solver(jobs_matrix, stats=None):
+    return assignment_groups_solver(jobs_matrix, "CBC", stats)
 
-    x = {}
-    for i in range(n):
-        for j in range(n):
-            x[i, j] = solver.IntVar(0, 1, f"x_{i}_{j}")
-
-    # Περιορισμοί ανάθεσης
-    for i in range(n):
-        solver.Add(solver.Sum([x[i, j] for j in range(n)]) <= 1)
-    for j in range(n):
-        solver.Add(solver.Sum([x[i, j] for i in range(n)]) == 1)
-
-    for start in range(0, n, 5):
-        jobs = range(start, min(start + 5, n))
-        workers = range(start, min(start + 5, n))
-        assignments = []
-        for i in jobs:
-            for j in workers:
-                assignments.append(x[i,j])
-        solver.Add(solver.Sum(assignments) >=2)
-
-    objective_terms = [jobs_matrix[i][j] * x[i,j] for i in range(n) for j in range (n)]
-    solver.Minimize(solver.Sum(objective_terms))
-
-    start = time.time()
-    status = solver.Solve()
-    end = time.time()
-
-    if status == pywraplp.Solver.OPTIMAL or status == pywraplp.Solver.FEASIBLE:
-        total_cost = solver.Objective().Value()
-        assignments = [(i, j, jobs_matrix[i][j]) for i in range(n) for j in range(n) if x[i, j].solution_value() > 0.5]
-        return total_cost, assignments, end - start
-    else:
-        return None, None, end - start
-
-
-
-
-def assignment_groups_solver(jobs_matrix):
-    n = len(jobs_matrix)
-    solver = pywraplp.Solver.CreateSolver("SCIP")
-    if not solver:
-        return None, None, 0
-
-    x = {}
-    for i in range(n):
-        for j in range(n):
-            x[i, j] = solver.IntVar(0, 1, f"x_{i}_{j}")
-
-    # Περιορισμοί ανάθεσης
-    for i in range(n):
-        solver.Add(solver.Sum([x[i, j] for j in range(n)]) <= 1)
-    for j in range(n):
-        solver.Add(solver.Sum([x[i, j] for i in range(n)]) == 1)
-
-    for start in range(0, n, 5):
-        jobs = range(start, min(start + 5, n))
-        workers = range(start, min(start + 5, n))
-        assignments = []
-        for i in jobs:
-            for j in workers:
-                assignments.append(x[i,j])
-        solver.Add(solver.Sum(assignments) >=2)
-
-    objective_terms = [jobs_matrix[i][j] * x[i,j] for i in range(n) for j in range (n)]
-    solver.Minimize(solver.Sum(objective_terms))
-
-    start = time.time()
-    status = solver.Solve()
-    end = time.time()
-
-    if status == pywraplp.Solver.OPTIMAL or status == pywraplp.Solver.FEASIBLE:
-        total_cost = solver.Objective().Value()
-        assignments = [(i, j, jobs_matrix[i][j]) for i in range(n) for j in range(n) if x[i, j].solution_value() > 0.5]
-        return total_cost, assignments, end - start
-    else:
-        return None, None, end - start
 
 def main():
     files = [
@@ -96,17 +16,19 @@ def main():
     output_dir = "solutions/erotima3"
     for file in files:
         jobs_matrix = read_file(file)
-        total_cost_f, assignments_f, solve_time_f = faster_solver(jobs_matrix)
-        print(f"[Faster Method] Solved {file}: Total Cost = {total_cost_f}, Time = {solve_time_f:.2f} sec")
+        stats = {}
+        total_cost_f, assignments_f, solve_time_f = faster_solver(jobs_matrix, stats)
+        print(f"[Faster Method] Solved {file}: Total Cost = {total_cost_f}, Build = {stats['build_time']:.2f} sec, Time = {solve_time_f:.2f} sec")
 
     for file in files:
         filename = os.path.basename(file)
         jobs_matrix = read_file(file)
         # print("cbc" , total_cost_f, solve_time_f)
-        total_cost, assignments, solve_time = assignment_groups_solver(jobs_matrix)
+        stats = {}
+        total_cost, assignments, solve_time = assignment_groups_solver(jobs_matrix, stats=stats)
         solution_file = os.path.join(output_dir, filename.replace(".txt", "_erotima3_solution.txt"))
         write_solution(solution_file, total_cost, assignments)
-        print(f"[Group Constraint] Solved {file}: Total Cost = {total_cost}, Time = {solve_time:.2f} sec")
+        print(f"[Group Constraint] Solved {file}: Total Cost = {total_cost}, Build = {stats['build_time']:.2f} sec, Time = {solve_time:.2f} sec")
 
 if __name__ == "__main__":
     main()
@@ -1,70 +1,38 @@
 import os
-import time
-import numpy as np
-from ortools.linear_solver import pywraplp
+import sys
+import argparse
+from lap import lap_solver
+from matrix_loader import load_matrix
+from solution_io import write_solution, check_solution
 
 def read_file(filename):
-    with open(filename, 'r') as file:
-        lines = file.readlines()
-    n = int(lines[0].strip())
-    matrix = []
-    all_costs = []
-    for line in lines[1:]:
-        numbers = line.split()          # Χωρίζει τη γραμμή σε ξεχωριστούς αριθμούς (ως strings)
-        for num in numbers:
-            all_costs.append(int(num))  # Μετατρέπει κάθε αριθμό σε int και τον προσθέτει στη λίστα
-    for i in range(n):
-        matrix.append(all_costs[i * n:(i + 1) * n])
-    return np.array(matrix)
+    # vectorised parsing + binary cache (.npy/memmap), βλ. matrix_loader
+    return load_matrix(filename)
+
+def assignment_problem_solver(jobs_matrix, solver_name="SCIP", stats=None, hint=None):
+    # "LAP": shortest augmenting path χωρίς MIP, "AUCTION": auction ανά blocks γραμμών
+    # (out_of_core, για πίνακες που δεν χωράνε στη μνήμη), αλλιώς MIP μέσω του assignment_model
+    # hint: προηγούμενη λύση ως λίστα (worker, job), π.χ. από IncrementalAssignment.hint()
+    if solver_name.upper() == "LAP":
+        total_cost, assignments, solve_time = lap_solver(jobs_matrix)
+        if stats is not None:
+            stats["build_time"] = 0.0
+            stats["solve_time"] = solve_time
+        return total_cost, assignments, solve_time
+    if solver_name.upper() == "AUCTION":
+        from out_of_core import auction_solver
+        return auction_solver(jobs_matrix, stats)
+
+    # το scipy.sparse / OR-Tools φορτώνονται μόνο για τους MIP solvers
+    from assignment_model import solve_assignment
+    return solve_assignment(jobs_matrix, solver_name, stats=stats, hint=hint)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--solver", default="SCIP", help="SCIP, CBC, LAP ή AUCTION")
+    args = parser.parse_args(argv)
 
-def assignment_problem_solver(jobs_matrix):
-    workers = len(jobs_matrix)
-    jobs = len(jobs_matrix[0])
-    
-    solver =  pywraplp.Solver.CreateSolver("SCIP")
-    if not solver:
-        return
-    
-    x = {}
-    for i in range(workers):
-        for j in range(jobs):
-            x[i, j] = solver.IntVar(0, 1, "")
-
-    for i in range(workers):
-        solver.Add(solver.Sum([x[i, j] for j in range(jobs)]) <= 1)
-    for j in range(jobs):
-        solver.Add(solver.Sum([x[i, j] for i in range(workers)]) == 1)
-
-
-    objective_terms = []
-    for i in range(workers):
-        for j in range(jobs):
-            objective_terms.append(jobs_matrix[i][j] * x[i, j])
-    solver.Minimize(solver.Sum(objective_terms))
-
-    start_time = time.time()
-    status = solver.Solve()
-    end_time = time.time()
-
-    if status == pywraplp.Solver.OPTIMAL or status == pywraplp.Solver.FEASIBLE:
-        total_cost = solver.Objective().Value()
-        assignments = []
-        for i in range(workers):
-            for j in range(jobs):
-                if x[i,j].solution_value() > 0.5:
-                    assignments.append((i, j, jobs_matrix[i][j]))
-        return total_cost, assignments, end_time-start_time
-    else:
-        return None, None, end_time - start_time
-
-
-def write_solution(file_path, total_cost, assignments):
-    with open(file_path, 'w') as file:
-        file.write(f"{total_cost}\n")
-        for assignment in assignments:
-            file.write(f"{assignment[0]},{assignment[1]},{assignment[2]}\n")
-
-def main():
     files = [
         "dataset/assign4.txt",
         "dataset/assign100.txt", "dataset/assign200.txt", "dataset/assign300.txt",
@@ -76,11 +44,18 @@ def main():
     for file in files:
         filename = os.path.basename(file)
         jobs_matrix = read_file(file)
-        total_cost, assignments, solve_time = assignment_problem_solver(jobs_matrix)
+        stats = {}
+        total_cost, assignments, solve_time = assignment_problem_solver(jobs_matrix, args.solver, stats)
         # solution_file = file.replace(".txt", "_solution.txt")
         solution_file = os.path.join(output_dir, filename.replace(".txt", "_erotima1_solution.txt"))
         write_solution(solution_file, total_cost, assignments)
-        print(f"Solved {file}: Total Cost = {total_cost}, Time = {solve_time:.2f} seconds")
+        print(f"Solved {file}: Total Cost = {total_cost}, Build = {stats['build_time']:.2f} seconds, Time = {solve_time:.2f} seconds")
+        # το αρχείο ξαναδιαβάζεται και ελέγχεται απέναντι στον πίνακα κόστους (βλ. solution_io)
+        if total_cost is None:
+            print("    No solution found")
+        else:
+            for problem in check_solution(solution_file, jobs_matrix):
+                print(f"    Invalid solution: {problem}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main(sys.argv[1:])
\ No newline at end of file
@@ -5,12 +5,13 @@ https://pypi.org/project/hungarian-algorithm/
 
 '''
 
+import os
 import time
-import networkx as nx
-import matplotlib.pyplot as plt
-from erotima1 import read_file, assignment_problem_solver
+from sparse_matching import sparse_matching, matching_cost
+
+def build_bipartite_graph(cost_matrix):
+    import networkx as nx
 
-def hungarian_algorithm(cost_matrix):
     n = len(cost_matrix)
     G = nx.Graph()
     #left = job
@@ -23,65 +24,64 @@ def hungarian_algorithm(cost_matrix):
         for j in right:
             # print(i, j, cost_matrix[i][j - n])
             G.add_edge(i, j, weight=cost_matrix[i][j - n])
+    return G
+
+
+def hungarian_algorithm(cost_matrix, threshold=None, forbidden=None):
+    # η αντιστοίχιση λύνεται απευθείας από τον πίνακα (scipy), ο γράφος χρειάζεται μόνο για σχεδίαση
     start = time.time()
-    matching = nx.algorithms.bipartite.minimum_weight_full_matching(G, top_nodes=left, weight='weight')
+    rows, cols = sparse_matching(cost_matrix, threshold, forbidden)
     end = time.time()
 
-    total_cost = 0
-    for i in left:
-        j = matching[i]
-        cost = cost_matrix[i][j - n]
-        total_cost += cost
+    total_cost = matching_cost(cost_matrix, rows, cols)
     return total_cost, end - start
 
 
-def run_comparison(files):
-    sizes, costs_lp, times_lp, costs_nx, times_nx = [], [], [], [], []
+def run_comparison(files, warmup=0, repeat=1):
+    # οι μετρήσεις γίνονται από το benchmark.py, κάθε instance σε δική του διεργασία
+    from benchmark import run_benchmark
 
+    results = {}
+    for result in run_benchmark(["scip", "hungarian"], [os.path.abspath(file) for file in files], warmup, repeat):
+        if result["status"] != "ok":
+            raise RuntimeError(f"{result['case']} failed on {result['instance']}: {result.get('error', result['status'])}")
+        results[result["case"], os.path.basename(result["instance"])] = result
+
+    sizes, costs_lp, times_lp, costs_nx, times_nx = [], [], [], [], []
     for file in files:
-        print(f"Processing {file}")
-        matrix = read_file(file)
-        n = len(matrix)
-        sizes.append(n)
-
-        # ortools
-        cost_lp, _, time_lp = assignment_problem_solver(matrix)
-        costs_lp.append(cost_lp)
-        times_lp.append(time_lp)
-
-        # hungarian
-        cost_nx, time_nx = hungarian_algorithm(matrix)
-        costs_nx.append(cost_nx)
-        times_nx.append(time_nx)
-
-        print(f"For {file}: ortools time = {time_lp:.2f} sec, hungarian algo time = {time_nx:.2f} sec")
+        lp = results["scip", os.path.basename(file)]
+        hungarian = results["hungarian", os.path.basename(file)]
+        sizes.append(lp["size"])
+        costs_lp.append(lp["objective"])
+        times_lp.append(lp["phases"]["solve"]["median"])
+        costs_nx.append(hungarian["objective"])
+        times_nx.append(hungarian["phases"]["solve"]["median"])
+        print(f"For {file}: ortools time = {times_lp[-1]:.2f} sec, hungarian algo time = {times_nx[-1]:.2f} sec")
     return sizes, costs_lp, times_lp, costs_nx, times_nx
 
 
-def plot_comparisons(sizes, costs_lp, times_lp, costs_nx, times_nx):
-    # Cost
-    plt.figure()
-    plt.plot(sizes, costs_lp, label='OR-Tools', marker='o')
-    plt.plot(sizes, costs_nx, label='Hungarian Algorithm', marker='x')
-    plt.xlabel('Μέγεθος Προβλήματος (n)')
-    plt.ylabel('Κόστος Λύσης')
-    plt.title('Σύγκριση Κόστους')
-    plt.legend()
-    plt.grid(True)
-    plt.savefig("comparison_img/cost_comparison.png")
-
-    # Time
-    plt.figure()
-    plt.plot(sizes, times_lp, label='OR-Tools', marker='o')
-    plt.plot(sizes, times_nx, label='Hungarian Algorithm', marker='x')
-    plt.xlabel('Μέγεθος Προβλήματος (n)')
-    plt.ylabel('Χρόνος (sec)')
-    plt.title('Σύγκριση Χρόνου Επίλυσης')
-    plt.legend()
-    plt.grid(True)
-    plt.savefig("comparison_img/time_comparison.png")
-
-    plt.show()
+def plot_comparisons(sizes, costs_lp, times_lp, costs_nx, times_nx, output_dir="comparison_img"):
+    # headless (Agg), χωρίς plt.show: τα διαγράμματα γράφονται μόνο στα PNG
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    plots = [
+        ("cost_comparison.png", costs_lp, costs_nx, 'Κόστος Λύσης', 'Σύγκριση Κόστους'),
+        ("time_comparison.png", times_lp, times_nx, 'Χρόνος (sec)', 'Σύγκριση Χρόνου Επίλυσης'),
+    ]
+    os.makedirs(output_dir, exist_ok=True)
+    for filename, values_lp, values_nx, ylabel, title in plots:
+        figure = Figure()
+        FigureCanvasAgg(figure)
+        axes = figure.add_subplot()
+        axes.plot(sizes, values_lp, label='OR-Tools', marker='o')
+        axes.plot(sizes, values_nx, label='Hungarian Algorithm', marker='x')
+        axes.set_xlabel('Μέγεθος Προβλήματος (n)')
+        axes.set_ylabel(ylabel)
+        axes.set_title(title)
+        axes.legend()
+        axes.grid(True)
+        figure.savefig(os.path.join(output_dir, filename))
 
 
 def main():
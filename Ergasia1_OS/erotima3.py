@@ -1,50 +1,26 @@
 import os
-import time
-import numpy as np
-from ortools.linear_solver import pywraplp
-from erotima1 import read_file, write_solution
+import sys
+import argparse
+from erotima1 import read_file
+from solution_io import write_solution, check_solution
+from assignment_model import solve_assignment, solve_portfolio
+from lagrangian import lagrangian_groups_solver
+
+def assignment_groups_solver(jobs_matrix, solver_name="SCIP", stats=None, hint=None):
+    # τουλάχιστον 2 αναθέσεις μέσα σε κάθε διαγώνιο block 5x5
+    # "LAGRANGE": Lagrangian relaxation πάνω στο LAP, βλ. lagrangian.py
+    # "PORTFOLIO": SCIP, CBC και Lagrangian παράλληλα, κερδίζει όποιος αποδείξει πρώτος
+    if solver_name.upper() == "LAGRANGE":
+        return lagrangian_groups_solver(jobs_matrix, block_size=5, block_min=2, stats=stats)
+    if solver_name.upper() == "PORTFOLIO":
+        return solve_portfolio(jobs_matrix, block_size=5, block_min=2, stats=stats)
+    return solve_assignment(jobs_matrix, solver_name, block_size=5, block_min=2, stats=stats, hint=hint)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--solver", default="SCIP", help="SCIP, CBC, LAGRANGE ή PORTFOLIO")
+    args = parser.parse_args(argv)
 
-def assignment_groups_solver(jobs_matrix):
-    n = len(jobs_matrix)
-    solver = pywraplp.Solver.CreateSolver("SCIP")
-    if not solver:
-        return None, None, 0
-
-    x = {}
-    for i in range(n):
-        for j in range(n):
-            x[i, j] = solver.IntVar(0, 1, f"x_{i}_{j}")
-
-    # Περιορισμοί ανάθεσης
-    for i in range(n):
-        solver.Add(solver.Sum([x[i, j] for j in range(n)]) <= 1)
-    for j in range(n):
-        solver.Add(solver.Sum([x[i, j] for i in range(n)]) == 1)
-
-    for start in range(0, n, 5):
-        jobs = range(start, min(start + 5, n))
-        workers = range(start, min(start + 5, n))
-        assignments = []
-        for i in jobs:
-            for j in workers:
-                assignments.append(x[i,j])
-        solver.Add(solver.Sum(assignments) >=2)
-
-    objective_terms = [jobs_matrix[i][j] * x[i,j] for i in range(n) for j in range (n)]
-    solver.Minimize(solver.Sum(objective_terms))
-
-    start = time.time()
-    status = solver.Solve()
-    end = time.time()
-
-    if status == pywraplp.Solver.OPTIMAL or status == pywraplp.Solver.FEASIBLE:
-        total_cost = solver.Objective().Value()
-        assignments = [(i, j, jobs_matrix[i][j]) for i in range(n) for j in range(n) if x[i, j].solution_value() > 0.5]
-        return total_cost, assignments, end - start
-    else:
-        return None, None, end - start
-
-def main():
     files = [
         "dataset/assign4.txt",
         "dataset/assign100.txt", "dataset/assign200.txt", "dataset/assign300.txt",
@@ -56,10 +32,20 @@ def main():
         filename = os.path.basename(file)
         jobs_matrix = read_file(file)
         # print("cbc" , total_cost_f, solve_time_f)
-        total_cost, assignments, solve_time = assignment_groups_solver(jobs_matrix)
+        stats = {}
+        total_cost, assignments, solve_time = assignment_groups_solver(jobs_matrix, args.solver, stats)
         solution_file = os.path.join(output_dir, filename.replace(".txt", "_erotima3_solution.txt"))
         write_solution(solution_file, total_cost, assignments)
-        print(f"Solved {file}: Total Cost = {total_cost}, Time = {solve_time:.2f} sec")
+        print(f"Solved {file}: Total Cost = {total_cost}, Build = {stats['build_time']:.2f} sec, Time = {solve_time:.2f} sec")
+        if total_cost is None:
+            print("    No solution found")
+        else:
+            for problem in check_solution(solution_file, jobs_matrix, block_size=5, block_min=2):
+                print(f"    Invalid solution: {problem}")
+        if "gap" in stats:
+            print(f"    Lower Bound = {stats['lower_bound']}, Gap = {stats['gap']:.4%}, Optimal = {stats['optimal']}")
+        if "backend" in stats:
+            print(f"    Winner = {stats['backend']} ({stats['status']})")
 
 if __name__ == "__main__":
-    main()
+    main(sys.argv[1:])
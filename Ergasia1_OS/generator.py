@@ -0,0 +1,214 @@
+'''
+Γεννήτρια συνθετικών instances ανάθεσης στη μορφή της read_file
+(n στην πρώτη γραμμή και μετά μία γραμμή ακεραίων ανά worker).
+
+Δομές κόστους:
+- uniform:   ανεξάρτητα κόστη στο [low, high]
+- clustered: workers και jobs σε ομάδες, κόστος = βάση του ζεύγους ομάδων + θόρυβος
+- lowrank:   U V^T (rank όρων) + θόρυβος, κλιμακωμένο στο [low, high]
+
+--planted: κρυμμένη βέλτιστη λύση (μοναδική, κόστος n * low), για έλεγχο ορθότητας.
+--block-size: μετατόπιση --block-offset στα κόστη μέσα στα διαγώνια blocks, όπως ο
+περιορισμός ομάδων του erotima3 (θετικό offset τον κάνει δεσμευτικό). Με planted και
+block-size η κρυμμένη λύση μένει μέσα στα blocks, οπότε είναι βέλτιστη και για το erotima3.
+
+Κάθε γραμμή i παράγεται από δικό της seed (seed, i), άρα το αποτέλεσμα δεν εξαρτάται από
+το πώς χωρίζονται οι γραμμές σε chunks ή σε διεργασίες. Το αρχείο γράφεται ανά chunk,
+οπότε ένα 20000 x 20000 instance χρειάζεται μνήμη μόνο για λίγα chunks.
+
+    python generator.py dataset/assign20000.txt --n 20000 --structure clustered --planted --workers 8
+'''
+
+import os
+import sys
+import argparse
+import functools
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+STRUCTURES = ("uniform", "clustered", "lowrank")
+DEFAULT_CHUNK_ROWS = 256
+
+# ξεχωριστά ρεύματα τυχαίων αριθμών ανά χρήση, ώστε να μην επηρεάζει το ένα το άλλο
+_ROW, _COLUMNS, _PLANTED = 0, 1, 2
+
+
+def _options(n, structure="uniform", seed=0, low=1, high=100, clusters=8, rank=4, noise=0.1,
+             planted=False, block_size=None, block_offset=None):
+    if structure not in STRUCTURES:
+        raise ValueError(f"unknown structure {structure!r}, choose from {STRUCTURES}")
+    if not 0 <= low < high:
+        raise ValueError("expected 0 <= low < high")
+    if block_offset is None:
+        block_offset = (high - low) // 4 if block_size else 0
+    return dict(n=n, structure=structure, seed=seed, low=low, high=high, clusters=clusters, rank=rank,
+                noise=noise, planted=planted, block_size=block_size, block_offset=block_offset)
+
+
+def planted_permutation(n, seed=0, block_size=None):
+    # τυχαία μετάθεση· με block_size κάθε worker παίρνει job μέσα στο δικό του block
+    rng = np.random.default_rng([seed, _PLANTED])
+    if not block_size:
+        return rng.permutation(n)
+    perm = np.empty(n, dtype=np.int64)
+    for start in range(0, n, block_size):
+        end = min(start + block_size, n)
+        perm[start:end] = start + rng.permutation(end - start)
+    return perm
+
+
+def _column_data(options):
+    # ό,τι μοιράζονται όλες οι γραμμές (ομάδες / παράγοντες των στηλών), ίδιο σε κάθε διεργασία
+    n, seed = options["n"], options["seed"]
+    rng = np.random.default_rng([seed, _COLUMNS])
+    data = {}
+    if options["structure"] == "clustered":
+        k = options["clusters"]
+        data["col_cluster"] = rng.integers(0, k, size=n)
+        data["base"] = rng.random((k, k))
+    elif options["structure"] == "lowrank":
+        data["factors"] = rng.random((n, options["rank"]))
+    if options["planted"]:
+        data["perm"] = planted_permutation(n, seed, options["block_size"])
+    return data
+
+
+def generate_rows(start, stop, options, column_data=None):
+    '''
+    Οι γραμμές [start, stop) του πίνακα κόστους, ως int array (stop - start) x n.
+    '''
+    n, low, high = options["n"], options["low"], options["high"]
+    column_data = column_data or _column_data(options)
+    structure = options["structure"]
+    planted = options["planted"]
+    # με planted μόνο τα κελιά της κρυμμένης λύσης παίρνουν την τιμή low
+    floor = low + 1 if planted else low
+
+    rows = np.empty((stop - start, n), dtype=np.int64)
+    for k, i in enumerate(range(start, stop)):
+        rng = np.random.default_rng([options["seed"], _ROW, i])
+        if structure == "uniform":
+            values = rng.random(n)
+        elif structure == "clustered":
+            cluster = rng.integers(0, options["clusters"])
+            values = column_data["base"][cluster, column_data["col_cluster"]] + options["noise"] * rng.standard_normal(n)
+        else:
+            rank = options["rank"]
+            values = column_data["factors"] @ rng.random(rank) / rank + options["noise"] * rng.standard_normal(n)
+        row = floor + np.floor(np.clip(values, 0.0, 1.0 - 1e-12) * (high - floor + 1)).astype(np.int64)
+        if options["block_size"]:
+            block = i // options["block_size"] * options["block_size"]
+            inside = slice(block, min(block + options["block_size"], n))
+            row[inside] = np.clip(row[inside] + options["block_offset"], floor, high)
+        if planted:
+            row[column_data["perm"][i]] = low
+        rows[k] = row
+    return rows
+
+
+def format_rows(rows, width):
+    # κάθε τιμή ως " " + ψηφία στοιχισμένα δεξιά σε width θέσεις, όπως τα αρχεία του dataset
+    count, n = rows.shape
+    text = np.full((count, n, width + 1), ord(' '), dtype=np.uint8)
+    values = rows.copy()
+    for position in range(width, 0, -1):
+        digit = values % 10
+        visible = (values > 0) | (position == width)
+        text[:, :, position][visible] = ord('0') + digit[visible]
+        values //= 10
+    lines = np.empty((count, n * (width + 1) + 1), dtype=np.uint8)
+    lines[:, :-1] = text.reshape(count, -1)
+    lines[:, -1] = ord('\n')
+    return lines.tobytes()
+
+
+@functools.lru_cache(maxsize=4)
+def _cached_column_data(key):
+    # μία φορά ανά διεργασία για όλα τα chunks του ίδιου instance
+    return _column_data(dict(key))
+
+
+def _chunk(start, stop, options):
+    column_data = _cached_column_data(tuple(sorted(options.items())))
+    return format_rows(generate_rows(start, stop, options, column_data), len(str(options["high"])))
+
+
+def generate_matrix(n, **kwargs):
+    # ολόκληρος ο πίνακας στη μνήμη, για μικρά n
+    options = _options(n, **kwargs)
+    return generate_rows(0, n, options)
+
+
+def write_instance(filename, n, workers=1, chunk_rows=DEFAULT_CHUNK_ROWS, **kwargs):
+    '''
+    Γράφει το instance ανά chunk γραμμών (παράλληλα με workers > 1) σε προσωρινό αρχείο
+    και το μετονομάζει στο τέλος. Επιστρέφει (filename, planted_cost ή None).
+    '''
+    options = _options(n, **kwargs)
+    ranges = [(start, min(start + chunk_rows, n)) for start in range(0, n, chunk_rows)]
+    directory = os.path.dirname(filename) or "."
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = os.path.join(directory, f".{os.path.basename(filename)}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, 'wb') as file:
+            file.write(f" {n}\n".encode())
+            if workers <= 1:
+                for start, stop in ranges:
+                    file.write(_chunk(start, stop, options))
+            else:
+                # το πολύ 2 chunks ανά worker σε αναμονή, ώστε η μνήμη να μένει φραγμένη
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    pending = []
+                    for start, stop in ranges:
+                        pending.append(executor.submit(_chunk, start, stop, options))
+                        if len(pending) >= 2 * workers:
+                            file.write(pending.pop(0).result())
+                    for future in pending:
+                        file.write(future.result())
+        os.replace(tmp_path, filename)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return filename, n * options["low"] if options["planted"] else None
+
+
+def write_planted_solution(filename, n, low=1, seed=0, block_size=None):
+    # στη μορφή των dataset/assign*_sol.txt: συνολικό κόστος και μετά worker,job,κόστος
+    from solution_io import write_solution
+
+    perm = planted_permutation(n, seed, block_size)
+    write_solution(filename, n * low, ((i, j, low) for i, j in enumerate(perm)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Συνθετικά instances ανάθεσης")
+    parser.add_argument("output", help="π.χ. dataset/assign5000.txt")
+    parser.add_argument("--n", type=int, required=True)
+    parser.add_argument("--structure", default="uniform", choices=STRUCTURES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--low", type=int, default=1)
+    parser.add_argument("--high", type=int, default=100)
+    parser.add_argument("--clusters", type=int, default=8)
+    parser.add_argument("--rank", type=int, default=4)
+    parser.add_argument("--noise", type=float, default=0.1)
+    parser.add_argument("--planted", action="store_true", help="κρυμμένη βέλτιστη λύση, γράφεται και το _sol.txt")
+    parser.add_argument("--block-size", type=int, default=None)
+    parser.add_argument("--block-offset", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    args = parser.parse_args(argv)
+
+    filename, planted_cost = write_instance(
+        args.output, args.n, workers=args.workers, chunk_rows=args.chunk_rows, structure=args.structure,
+        seed=args.seed, low=args.low, high=args.high, clusters=args.clusters, rank=args.rank, noise=args.noise,
+        planted=args.planted, block_size=args.block_size, block_offset=args.block_offset,
+    )
+    print(f"Wrote {filename} ({args.n} x {args.n}, {args.structure})")
+    if args.planted:
+        solution = filename.replace(".txt", "_sol.txt")
+        write_planted_solution(solution, args.n, args.low, args.seed, args.block_size)
+        print(f"Planted optimum = {planted_cost}, written to {solution}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -1,72 +1,58 @@
+import os
+import sys
 import time
-import networkx as nx
-import matplotlib.pyplot as plt
-from erotima1 import read_file
-def hungarian_algorithm(cost_matrix):
-    n = len(cost_matrix)
-    G = nx.Graph()
+import argparse
+from matrix_loader import load_matrix as read_file
+from sparse_matching import sparse_matching, matching_cost
 
-    # 'left' are the job nodes (0..n-1)
-    left = range(n)
-    # 'right' are the worker nodes (n..2n-1)
-    right = range(n, 2*n)
+def hungarian_algorithm(cost_matrix, threshold=None, forbidden=None, draw=None, mode="auto", sample_edges=None):
+    # Solve straight from the cost matrix (scipy); entries above threshold or
+    # marked in the forbidden mask are pruned, leaving a sparse bipartite graph
+    start = time.time()
+    rows, cols = sparse_matching(cost_matrix, threshold, forbidden)
+    end = time.time()
 
-    print("Left partition (Jobs):", list(left))
-    print("Right partition (Workers):", list(right))
+    # Compute the total cost from the matching
+    total_cost = matching_cost(cost_matrix, rows, cols)
+    print("Hungarian total cost:", total_cost)
 
-    # Build the bipartite graph
-    for i in left:
-        for j in right:
-            G.add_edge(i, j, weight=cost_matrix[i][j - n])
-    
-    # -- (Optional) Draw the bipartite graph to visualize it --
+    # -- (Optional) Draw the solution to a file, only after solving --
+    # draw is the output path (png/svg/pdf); the renderer is headless (Agg, no pyplot)
+    # and switches from the bipartite graph to a heat map for large n
+    if draw:
+        from render import render_matching
 
-    # Build a position dict to place the two partitions side by side
-    pos = {}
-    # Put left nodes (jobs) at x=0, spaced by their index
-    for index, node in enumerate(left):
-        pos[node] = (0, index)
-    # Put right nodes (workers) at x=1, spaced by their index
-    for index, node in enumerate(right):
-        pos[node] = (1, index - n)
+        render_start = time.time()
+        used_mode = render_matching(cost_matrix, rows, cols, draw, mode=mode, sample_edges=sample_edges)
+        print(f"Rendered {used_mode} view to {draw} in {time.time() - render_start:.2f} seconds")
+    # -------------------------------------------------------------
 
-    # Draw the graph with node labels
-    plt.figure()
-    nx.draw(G, pos, with_labels=True)
-    
-    # Draw edge labels showing weights (the cost)
-    edge_labels = nx.get_edge_attributes(G, 'weight')
-    nx.draw_networkx_edge_labels(G, pos, edge_labels=edge_labels)
+    return total_cost, end - start
 
-    # Show the graph in a pop-up window (or you can savefig instead)
-    plt.title("Bipartite Graph Representation of Cost Matrix")
-    plt.show()
-    # -------------------------------------------------------------
 
-    # Now run the Hungarian (minimum weight full matching) algorithm
-    start = time.time()
-    matching = nx.algorithms.bipartite.minimum_weight_full_matching(
-        G, top_nodes=left, weight='weight'
-    )
-    end = time.time()
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("files", nargs="*", default=["dataset/assign4.txt"])
+    parser.add_argument("--threshold", type=float, default=None, help="costs above this are pruned")
+    parser.add_argument("--draw", default=None, help="output image, e.g. comparison_img/hungarian.png")
+    parser.add_argument("--mode", default="auto", choices=["auto", "graph", "matched", "heatmap"])
+    parser.add_argument("--sample-edges", type=int, default=None, help="draw only this many unmatched edges")
+    args = parser.parse_args(argv)
 
-    # Compute the total cost from the matching
-    total_cost = 0
-    for i in left:
-        j = matching[i]
-        cost = cost_matrix[i][j - n]
-        total_cost += cost
-    print("Hungarian total cost:", total_cost)
+    for file in args.files:
+        cost_matrix = read_file(file)
+        draw = args.draw
+        if draw and len(args.files) > 1:
+            # one image per instance
+            stem, ext = os.path.splitext(draw)
+            draw = f"{stem}_{os.path.splitext(os.path.basename(file))[0]}{ext}"
+        total_cost, solve_time = hungarian_algorithm(cost_matrix, args.threshold, draw=draw, mode=args.mode,
+                                                     sample_edges=args.sample_edges)
+        print(f"Solved {file}: Total Cost = {total_cost}, Time = {solve_time:.2f} seconds")
 
-    return total_cost, end - start
 
 # Example of how you might call this:
+#   python hungarian.py dataset/assign4.txt --draw comparison_img/hungarian4.png
+#   python hungarian.py dataset/assign800.txt --draw comparison_img/hungarian800.png
 if __name__ == "__main__":
-    # A sample 4x4 cost matrix (row=Job, col=Worker)
-    files = [
-        "dataset/assign4.txt"
-    ]
-    output_dir = "solutions/erotima1"
-    for file in files:
-        cost_matrix = read_file(file)
-        hungarian_algorithm(cost_matrix)
+    main(sys.argv[1:])
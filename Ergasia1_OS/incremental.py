@@ -0,0 +1,184 @@
+'''
+Incremental επίλυση προβλημάτων ανάθεσης που αλλάζουν λίγο από επίλυση σε επίλυση
+(μερικές γραμμές/στήλες/κελιά με νέο κόστος, worker που προστίθεται ή αφαιρείται).
+
+Κρατάμε τα δυναμικά u, v και το matching της τελευταίας επίλυσης. Μετά από μια αλλαγή
+ελευθερώνονται μόνο οι γραμμές που χάνουν τη βελτιστότητα (reduced cost != 0 στην ανάθεσή
+τους ή αρνητικό reduced cost κάπου), και στο solve() γίνονται augment μόνο αυτές.
+
+    engine = IncrementalAssignment(read_file("dataset/assign800.txt"))
+    engine.solve()
+    engine.update_rows([3, 17], new_rows)
+    total_cost, assignments, solve_time = engine.solve()
+
+Οι workers (γραμμές) μπορούν να είναι περισσότεροι από τα jobs (στήλες): προστίθενται
+dummy jobs μηδενικού κόστους μετά τα πραγματικά, όπως στο lap.pad_matrix.
+'''
+
+import time
+import numpy as np
+from lap import solve_lap
+from assignment_model import solve_assignment
+import _paths
+from opsearch.instrument import traced, current
+
+
+def _cost_array(values):
+    # ακέραια κόστη ως int64 (χωρίς overflow στα αθροίσματα), όλα τα άλλα ως float64
+    values = np.array(values)
+    return values.astype(np.int64 if values.dtype.kind in "iub" else np.float64)
+
+
+class IncrementalAssignment:
+
+    def __init__(self, jobs_matrix):
+        self.jobs_matrix = _cost_array(jobs_matrix)
+        workers, jobs = self.jobs_matrix.shape
+        if workers < jobs:
+            raise ValueError(f"{jobs} jobs cannot be covered by {workers} workers")
+        self.costs = np.zeros((workers, workers))
+        self.costs[:, :jobs] = self.jobs_matrix
+        self.u = self.v = self.col4row = self.row4col = None
+        self.augmented = 0
+
+    @property
+    def workers(self):
+        return self.jobs_matrix.shape[0]
+
+    @property
+    def jobs(self):
+        return self.jobs_matrix.shape[1]
+
+    def _accept(self, values):
+        # κλασματικά κόστη σε ακέραιο πίνακα: ο πίνακας γίνεται float64 αντί να κοπούν τα κόστη
+        values = _cost_array(values)
+        if values.dtype != self.jobs_matrix.dtype and values.dtype.kind == "f":
+            self.jobs_matrix = self.jobs_matrix.astype(np.float64)
+        return values
+
+    def _free_rows(self, rows):
+        if self.col4row is None:
+            return
+        rows = np.unique(np.asarray(rows, dtype=np.int64))
+        rows = rows[self.col4row[rows] >= 0]
+        self.row4col[self.col4row[rows]] = -1
+        self.col4row[rows] = -1
+
+    def _tighten_columns(self, cols):
+        # v[j] = min πάνω στις ανατεθειμένες γραμμές, ώστε να ισχύει ξανά c - u - v >= 0
+        matched = np.flatnonzero(self.col4row >= 0)
+        if matched.size == 0:
+            return
+        slack = self.costs[np.ix_(matched, cols)] - self.u[matched][:, None]
+        self.v[cols] = slack.min(axis=0)
+
+    @traced("solve.incremental_lap")
+    def solve(self):
+        '''
+        Επιστρέφει (total_cost, assignments, solve_time) όπως το lap_solver.
+        Η πρώτη κλήση κάνει πλήρη επίλυση, οι επόμενες μόνο τα augment που χρειάζονται.
+        '''
+        start_time = time.time()
+        if self.col4row is None:
+            self.augmented = self.workers
+            self.col4row, self.u, self.v = solve_lap(self.costs)
+            self.row4col = np.empty_like(self.col4row)
+            self.row4col[self.col4row] = np.arange(self.workers)
+        else:
+            self.augmented = int((self.col4row == -1).sum())
+            solve_lap(self.costs, self.u, self.v, self.col4row, self.row4col)
+        end_time = time.time()
+        current().set(augmented=self.augmented)
+
+        rows = np.flatnonzero(self.col4row < self.jobs)
+        costs = self.jobs_matrix[rows, self.col4row[rows]]
+        assignments = [(i, int(j), self.jobs_matrix[i][j]) for i, j in enumerate(self.col4row) if j < self.jobs]
+        total_cost = float(costs.astype(np.int64).sum() if costs.dtype.kind in "iu" else costs.sum())
+        return total_cost, assignments, end_time - start_time
+
+    def update_rows(self, rows, values):
+        # νέο κόστος για ολόκληρες γραμμές (workers)· η γραμμή γίνεται ελεύθερη
+        rows = np.atleast_1d(np.asarray(rows, dtype=np.int64))
+        values = self._accept(values).reshape(rows.size, self.jobs)
+        self.jobs_matrix[rows] = values
+        self.costs[rows, :self.jobs] = values
+        self._free_rows(rows)
+
+    def update_cols(self, cols, values):
+        # νέο κόστος για ολόκληρες στήλες (jobs)· ελευθερώνεται ο worker που τις είχε
+        cols = np.atleast_1d(np.asarray(cols, dtype=np.int64))
+        values = self._accept(values).reshape(self.workers, cols.size)
+        self.jobs_matrix[:, cols] = values
+        self.costs[:, cols] = values
+        if self.col4row is None:
+            return
+        self._free_rows(self.row4col[cols][self.row4col[cols] >= 0])
+        self._tighten_columns(cols)
+
+    def update_cells(self, rows, cols, values):
+        rows = np.atleast_1d(np.asarray(rows, dtype=np.int64))
+        cols = np.atleast_1d(np.asarray(cols, dtype=np.int64))
+        values = np.broadcast_to(self._accept(values), rows.shape)
+        self.jobs_matrix[rows, cols] = values
+        self.costs[rows, cols] = values
+        if self.col4row is None:
+            return
+        # χαλάει η ανάθεση αν άλλαξε το δικό της κελί ή αν κάποιο reduced cost έγινε αρνητικό
+        reduced = self.costs[rows, cols] - self.u[rows] - self.v[cols]
+        broken = (self.col4row[rows] == cols) | (reduced < -1e-9)
+        self._free_rows(rows[broken])
+
+    def add_worker(self, costs_row):
+        # νέα γραμμή και ένα νέο dummy job, ώστε ο πίνακας να μένει τετραγωνικός
+        costs_row = self._accept(costs_row).reshape(1, self.jobs)
+        self.jobs_matrix = np.vstack([self.jobs_matrix, costs_row])
+        n = self.costs.shape[0]
+        costs = np.zeros((n + 1, n + 1))
+        costs[:n, :n] = self.costs
+        costs[n, :self.jobs] = costs_row
+        self.costs = costs
+        if self.col4row is None:
+            return
+        self.col4row = np.append(self.col4row, -1)
+        self.row4col = np.append(self.row4col, -1)
+        self.u = np.append(self.u, 0.0)
+        self.v = np.append(self.v, 0.0)
+        self._tighten_columns([n])
+
+    def remove_worker(self, row):
+        # αφαιρείται η γραμμή και ένα dummy job· αν ο worker είχε πραγματικό job,
+        # ελευθερώνεται η γραμμή που είχε το dummy και θα πάρει εκείνη το job
+        if self.workers == self.jobs:
+            raise ValueError("removing a worker would leave a job uncovered")
+        if self.col4row is None:
+            dummy = self.costs.shape[1] - 1
+        else:
+            dummy = int(self.col4row[row])
+            if dummy < self.jobs:
+                dummy = self.costs.shape[1] - 1
+                self._free_rows([row, self.row4col[dummy]] if self.row4col[dummy] >= 0 else [row])
+
+        self.jobs_matrix = np.delete(self.jobs_matrix, row, axis=0)
+        self.costs = np.delete(np.delete(self.costs, row, axis=0), dummy, axis=1)
+        if self.col4row is None:
+            return
+        self._free_rows([row])
+        col4row = np.delete(self.col4row, row)
+        col4row[col4row > dummy] -= 1
+        self.col4row = col4row
+        self.u = np.delete(self.u, row)
+        self.v = np.delete(self.v, dummy)
+        self.row4col = np.full(self.costs.shape[1], -1, dtype=np.int64)
+        matched = self.col4row >= 0
+        self.row4col[self.col4row[matched]] = np.flatnonzero(matched)
+
+    def hint(self):
+        # η τρέχουσα λύση ως (worker, job), για MIP hint στον SCIP/CBC
+        if self.col4row is None:
+            return None
+        return [(i, int(j)) for i, j in enumerate(self.col4row) if 0 <= j < self.jobs]
+
+    def solve_mip(self, solver_name="SCIP", block_size=None, block_min=2, stats=None):
+        # επίλυση του μοντέλου MIP με αρχική λύση (hint) το τελευταίο matching
+        return solve_assignment(self.jobs_matrix, solver_name, block_size=block_size, block_min=block_min,
+                                stats=stats, hint=self.hint())
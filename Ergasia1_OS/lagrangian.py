@@ -0,0 +1,300 @@
+'''
+Ειδικός solver για τον περιορισμό ομάδων του erotima3: τουλάχιστον block_min αναθέσεις
+μέσα σε κάθε διαγώνιο block block_size x block_size.
+
+1. Ξεκινάμε από τη βέλτιστη λύση χωρίς blocks (Ουγγρικός / LAP): κάτω φράγμα και πρώτη λύση.
+2. Lagrangian relaxation των περιορισμών των blocks με πολλαπλασιαστές lam >= 0:
+       L(lam) = LAP(c - lam μέσα στα blocks) + block_min * sum(lam)
+   Οι πολλαπλασιαστές ενημερώνονται με subgradient (βήμα Polyak προς το best_cost) και
+   το LAP ξαναλύνεται κάθε φορά με το scipy.
+3. Άνω φράγμα (_fix_blocks): από κάθε λύση του LAP κρατάμε block_min αναθέσεις μέσα σε κάθε
+   block, συμπληρώνουμε όσα blocks δεν φτάνουν και λύνουμε τις υπόλοιπες γραμμές ως LAP με τα
+   αρχικά κόστη. Μετά local search με ανταλλαγές στηλών, μόνο προς τις φθηνότερες στήλες κάθε
+   γραμμής. Ήδη από το LAP χωρίς blocks η λύση είναι κοντά στη βέλτιστη, οπότε το βήμα Polyak
+   έχει καλό στόχο και στα dataset/assign*.txt τα φράγματα κλείνουν σε λίγες δεκάδες επαναλήψεις
+   (assign800: 3601 σε 0.5-0.7 s σε έναν πυρήνα) χωρίς MIP.
+4. Αν μείνει gap, reduced cost fixing με τα lam και τα δυναμικά του καλύτερου κάτω φράγματος
+   και ένα MIP (CBC) μόνο με τις μεταβλητές που απομένουν, με hint την καλύτερη λύση. Αν
+   μένουν πάνω από MIP_CELLS_PER_ROW μεταβλητές ανά γραμμή, το MIP παραλείπεται και το gap
+   γράφεται στο stats. Το subgradient σταματά όταν ούτε το κάτω ούτε το άνω φράγμα
+   βελτιώνονται για patience επαναλήψεις.
+Με ακέραια κόστη το κάτω φράγμα στρογγυλεύεται προς τα πάνω και μια λύση αρκεί να είναι
+κατά 1 καλύτερη από το best_cost· με κλασματικά κόστη δεν γίνεται καμία στρογγυλοποίηση.
+'''
+
+import time
+import numpy as np
+from lap import potentials
+from assignment_model import solve_assignment
+import _paths
+from opsearch.instrument import traced, current
+
+EPS = 1e-9
+# υποψήφιες στήλες ανά γραμμή για τις ανταλλαγές του _improve
+NEIGHBOURS = 16
+# το τελικό MIP τρέχει μόνο αν μετά το reduced cost fixing μένουν το πολύ τόσες μεταβλητές ανά γραμμή
+MIP_CELLS_PER_ROW = 20
+
+
+def _row4col(col4row):
+    row4col = np.full(col4row.size, -1, dtype=np.int64)
+    matched = col4row >= 0
+    row4col[col4row[matched]] = np.flatnonzero(matched)
+    return row4col
+
+
+def block_counts(col4row, block_of, n_blocks):
+    # πόσες αναθέσεις πέφτουν μέσα σε κάθε block
+    inside = block_of == block_of[col4row]
+    return np.bincount(block_of[inside], minlength=n_blocks)
+
+
+class _LagrangianLAP:
+    # LAP πάνω στα κόστη c - lam μέσα στα blocks
+
+    def __init__(self, costs, block_size):
+        self.costs = costs.copy()
+        n = costs.shape[0]
+        self.block_of = np.arange(n) // block_size
+        self.n_blocks = int(self.block_of[-1]) + 1 if n else 0
+        self.block_size = block_size
+        self.lam = np.zeros(self.n_blocks)
+        self._resolve()
+
+    def copy(self):
+        other = object.__new__(_LagrangianLAP)
+        other.__dict__.update({k: (v.copy() if isinstance(v, np.ndarray) else v) for k, v in self.__dict__.items()})
+        return other
+
+    def value(self, block_min):
+        n = self.costs.shape[0]
+        return self.costs[np.arange(n), self.col4row].sum() + block_min * self.lam.sum()
+
+    def counts(self):
+        return block_counts(self.col4row, self.block_of, self.n_blocks)
+
+    def set_multipliers(self, new_lam):
+        # ένα βήμα του subgradient αλλάζει σχεδόν όλα τα blocks, οπότε το LAP ξαναλύνεται από την
+        # αρχή με το scipy (C)· ο warm start του solve_lap ήταν πιο αργός στο assign800
+        delta = new_lam - self.lam
+        for k in np.flatnonzero(delta != 0):
+            start = k * self.block_size
+            end = min(start + self.block_size, self.costs.shape[0])
+            self.costs[start:end, start:end] -= delta[k]
+        self.lam = new_lam.copy()
+        self._resolve()
+
+    def _resolve(self):
+        from scipy.optimize import linear_sum_assignment
+
+        _, self.col4row = linear_sum_assignment(self.costs)
+
+    def reduced_costs(self):
+        # c - lam - u - v με τα δυναμικά της τρέχουσας λύσης, για το reduced cost fixing
+        u, v = potentials(self.costs, self.col4row)
+        return self.costs - u[:, None] - v[None, :]
+
+
+def _block_pairs(costs, rows, cols, count):
+    # οι count αναθέσεις ανάμεσα σε rows και cols με το μικρότερο συνολικό κόστος: LAP με
+    # cols - count dummy γραμμές και rows - count dummy στήλες μηδενικού κόστους (dummy-dummy
+    # απαγορεύεται), οπότε ακριβώς count πραγματικές γραμμές παίρνουν πραγματική στήλη
+    from scipy.optimize import linear_sum_assignment
+
+    size = rows.size + cols.size - count
+    padded = np.zeros((size, size))
+    padded[:rows.size, :cols.size] = costs[np.ix_(rows, cols)]
+    padded[rows.size:, cols.size:] = np.inf
+    row_ind, col_ind = linear_sum_assignment(padded)
+    real = (row_ind < rows.size) & (col_ind < cols.size)
+    return rows[row_ind[real]], cols[col_ind[real]]
+
+
+def _fix_blocks(costs, col4row, block_of, n_blocks, block_min):
+    '''
+    Εφικτή λύση (ή None) από μια ανάθεση που μπορεί να παραβιάζει blocks: σε κάθε block κρατάμε
+    τις block_min φθηνότερες αναθέσεις της μέσα στο block, όσα blocks δεν φτάνουν συμπληρώνονται
+    με τις φθηνότερες αναθέσεις ανάμεσα στις ελεύθερες γραμμές και στήλες τους (_block_pairs),
+    και οι υπόλοιπες γραμμές λύνονται ως LAP με τα αρχικά κόστη, όπου οι περιορισμοί ισχύουν ήδη.
+    '''
+    from scipy.optimize import linear_sum_assignment
+
+    n = col4row.size
+    rows = np.flatnonzero(block_of == block_of[col4row])
+    rows = rows[np.lexsort((costs[rows, col4row[rows]], block_of[rows]))]
+    # θέση κάθε ανάθεσης μέσα στο block της, κατά αύξον κόστος
+    first = np.searchsorted(block_of[rows], block_of[rows])
+    rows = rows[np.arange(rows.size) - first < block_min]
+
+    fixed = np.full(n, -1, dtype=np.int64)
+    fixed[rows] = col4row[rows]
+    taken = np.zeros(n, dtype=bool)
+    taken[fixed[rows]] = True
+    for k in np.flatnonzero(np.bincount(block_of[rows], minlength=n_blocks) < block_min):
+        block = np.flatnonzero(block_of == k)
+        free_rows, free_cols = block[fixed[block] < 0], block[~taken[block]]
+        count = block_min - (block.size - free_rows.size)
+        if count > min(free_rows.size, free_cols.size):
+            return None
+        pair_rows, pair_cols = _block_pairs(costs, free_rows, free_cols, count)
+        fixed[pair_rows] = pair_cols
+        taken[pair_cols] = True
+
+    free_rows, free_cols = np.flatnonzero(fixed < 0), np.flatnonzero(~taken)
+    row_ind, col_ind = linear_sum_assignment(costs[np.ix_(free_rows, free_cols)])
+    fixed[free_rows[row_ind]] = free_cols[col_ind]
+    return fixed
+
+
+def _neighbours(costs, count=NEIGHBOURS):
+    # οι count φθηνότερες στήλες κάθε γραμμής
+    count = min(count, costs.shape[1])
+    return np.argpartition(costs, count - 1, axis=1)[:, :count]
+
+
+def _improve(costs, col4row, block_of, n_blocks, block_min, neighbours, max_passes=50, max_candidates=5000):
+    # local search με ανταλλαγές στηλών ανάμεσα σε δύο γραμμές, που κρατάνε εφικτά τα blocks:
+    # η γραμμή i παίρνει μία από τις neighbours[i] στήλες και η γραμμή k που την είχε παίρνει τη στήλη του i.
+    # Σε κάθε πέρασμα εφαρμόζονται μαζί όσες καλές ανταλλαγές δεν αγγίζουν τα ίδια blocks.
+    n = col4row.size
+    col4row = col4row.copy()
+    rows = np.repeat(np.arange(n), neighbours.shape[1])
+    targets = neighbours.ravel()
+    for _ in range(max_passes):
+        counts = block_counts(col4row, block_of, n_blocks)
+        others = _row4col(col4row)[targets]
+        old = col4row[rows]
+        delta = (costs[rows, targets] + costs[others, old]) - (costs[rows, old] + costs[others, targets])
+        block_i, block_k = block_of[rows], block_of[others]
+        # αλλαγή στις αναθέσεις μέσα στο block της γραμμής i και της γραμμής k
+        gain_i = (block_of[targets] == block_i).astype(np.int64) - (block_of[old] == block_i)
+        gain_k = (block_of[old] == block_k).astype(np.int64) - (block_of[targets] == block_k)
+        feasible = np.where(block_i == block_k, counts[block_i] + gain_i + gain_k >= block_min,
+                            (counts[block_i] + gain_i >= block_min) & (counts[block_k] + gain_k >= block_min))
+        candidates = np.flatnonzero((delta < -EPS) & feasible & (rows != others))
+        if candidates.size == 0:
+            break
+        candidates = candidates[np.argsort(delta[candidates], kind="stable")[:max_candidates]]
+        used = set()
+        for i, k in zip(rows[candidates], others[candidates]):
+            blocks = {block_of[i], block_of[k]}
+            if used.isdisjoint(blocks):
+                used.update(blocks)
+                col4row[i], col4row[k] = col4row[k], col4row[i]
+    return col4row
+
+
+@traced("solve.lagrangian")
+def lagrangian_groups_solver(jobs_matrix, block_size=5, block_min=2, max_iterations=300, patience=30,
+                             exact=True, mip_solver="CBC", time_limit=None, stats=None):
+    '''
+    Επιστρέφει (total_cost, assignments, solve_time) όπως το assignment_groups_solver.
+    Στο stats γράφονται lower_bound, gap, optimal, iterations και fixed (μεταβλητές που
+    κλειδώθηκαν στο 0 από το reduced cost fixing, 0 αν τα φράγματα έκλεισαν χωρίς αυτό).
+    '''
+    jobs_matrix = np.asarray(jobs_matrix)
+    n = jobs_matrix.shape[0]
+    costs = jobs_matrix.astype(np.float64)
+    start_time = time.time()
+
+    state = _LagrangianLAP(costs, block_size)
+    best_lb = state.value(block_min)
+    best_state = state.copy()
+    best_cost, best_cols = np.inf, None
+    neighbours = _neighbours(costs)
+    # με ακέραια κόστη κάθε λύση διαφέρει από την άλλη τουλάχιστον κατά step
+    step = 1.0 if np.array_equal(costs, np.round(costs)) else 0.0
+
+    def rounded(lb):
+        return float(np.ceil(lb - EPS)) if step else float(lb)
+
+    def tolerance():
+        # όπως το anytime.proven: απόλυτη ανοχή 1e-6, σχετική 1e-9
+        return max(1e-6, EPS * abs(best_cost)) if np.isfinite(best_cost) else 1e-6
+
+    def consider(col4row):
+        nonlocal best_cost, best_cols
+        col4row = _fix_blocks(costs, col4row, state.block_of, state.n_blocks, block_min)
+        if col4row is None:
+            return
+        col4row = _improve(costs, col4row, state.block_of, state.n_blocks, block_min, neighbours)
+        cost = costs[np.arange(n), col4row].sum()
+        if cost < best_cost:
+            best_cost, best_cols = cost, col4row.copy()
+
+    def closed():
+        return best_cost <= rounded(best_lb) + tolerance()
+
+    def out_of_time():
+        return time_limit is not None and time.time() - start_time >= time_limit
+
+    consider(state.col4row)
+    theta, stall, iterations = 1.5, 0, 0
+    progress, idle = (rounded(best_lb), best_cost), 0
+    while (best_cols is not None and not closed() and not out_of_time() and iterations < max_iterations
+           and theta > 1e-4 and idle < patience):
+        iterations += 1
+        subgradient = block_min - state.counts()
+        subgradient[(state.lam <= 0) & (subgradient < 0)] = 0
+        norm = float(subgradient @ subgradient)
+        if norm == 0:
+            break
+        # βήμα Polyak προς το best_cost, που από την πρώτη λύση του _fix_blocks είναι ήδη κοντά στο βέλτιστο
+        move = theta * (best_cost - state.value(block_min)) / norm
+        state.set_multipliers(np.maximum(0.0, state.lam + move * subgradient))
+
+        lb = state.value(block_min)
+        consider(state.col4row)
+        if lb > best_lb + EPS:
+            best_lb, best_state, stall = lb, state.copy(), 0
+        else:
+            stall += 1
+            if stall >= 5:
+                theta, stall = theta / 2, 0
+        if (rounded(best_lb), best_cost) == progress:
+            idle += 1
+        else:
+            progress, idle = (rounded(best_lb), best_cost), 0
+
+    fixed = 0
+    if exact and best_cols is not None and not closed() and not out_of_time():
+        # reduced cost fixing με τα lam και τα δυναμικά του καλύτερου κάτω φράγματος: όποια ανάθεση
+        # ανεβάζει το L(lam) πάνω από το best_cost - step αποκλείεται. Αν μένουν πολλές μεταβλητές
+        # δεν λύνεται (σχεδόν πυκνό) MIP· επιστρέφεται η λύση με το gap της στο stats.
+        fixed_zero = best_lb + best_state.reduced_costs() > best_cost - step + tolerance()
+        fixed_zero[np.arange(n), best_cols] = False
+        fixed = int(fixed_zero.sum())
+        if fixed_zero.size - fixed <= MIP_CELLS_PER_ROW * n:
+            remaining = None if time_limit is None else max(0.0, time_limit - (time.time() - start_time))
+            mip_stats = {}
+            total_cost, assignments, _ = solve_assignment(
+                jobs_matrix, mip_solver, block_size=block_size, block_min=block_min, time_limit=remaining,
+                stats=mip_stats, hint=list(enumerate(best_cols)), fixed_zero=fixed_zero,
+            )
+            if total_cost is not None and total_cost < best_cost - EPS:
+                best_cost = total_cost
+                best_cols = np.full(n, -1, dtype=np.int64)
+                for i, j, _ in assignments:
+                    best_cols[i] = j
+            if mip_stats.get("status") == "OPTIMAL":
+                best_lb = max(best_lb, best_cost)
+            elif mip_stats.get("best_bound") is not None:
+                best_lb = max(best_lb, mip_stats["best_bound"])
+    end_time = time.time()
+    current().set(iterations=iterations, fixed=fixed, objective=None if best_cols is None else float(best_cost),
+                  bound=rounded(best_lb))
+
+    if stats is not None:
+        lower_bound = rounded(best_lb)
+        stats["lower_bound"] = lower_bound
+        stats["iterations"] = iterations
+        stats["fixed"] = fixed
+        stats["build_time"] = 0.0
+        stats["solve_time"] = end_time - start_time
+        if best_cols is not None:
+            stats["gap"] = float(max(0.0, (best_cost - lower_bound) / max(abs(best_cost), 1.0)))
+            stats["optimal"] = bool(best_cost <= lower_bound + tolerance())
+    if best_cols is None:
+        return None, None, end_time - start_time
+    assignments = [(i, int(j), jobs_matrix[i][j]) for i, j in enumerate(best_cols)]
+    return float(best_cost), assignments, end_time - start_time
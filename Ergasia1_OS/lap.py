@@ -0,0 +1,166 @@
+'''
+Επίλυση του προβλήματος ανάθεσης με shortest augmenting path (Jonker-Volgenant),
+απευθείας πάνω στον NumPy πίνακα που επιστρέφει η read_file.
+
+Οι γραμμές είναι οι workers (το πολύ μία ανάθεση ο καθένας) και οι στήλες τα jobs
+(ακριβώς μία ανάθεση η καθεμία), όπως και στο μοντέλο του erotima1.
+Διατηρούνται δυναμικά u (γραμμές), v (στήλες) με c[i][j] - u[i] - v[j] >= 0,
+ώστε να μπορούν να ξαναχρησιμοποιηθούν για warm start.
+'''
+
+import time
+import numpy as np
+
+import _paths
+from opsearch.instrument import traced, current
+
+
+def _augment(costs, u, v, col4row, row4col, cur_row):
+    # Dijkstra πάνω στα reduced costs, ξεκινώντας από την ελεύθερη γραμμή cur_row.
+    # bound: καλύτερη απόσταση για μη σαρωμένες στήλες και -inf για σαρωμένες,
+    # candidates: το ίδιο αλλά +inf για σαρωμένες (για το argmin),
+    # free_candidates: μόνο οι ελεύθερες στήλες, ώστε σε ισοπαλία να τελειώνει νωρίτερα το path
+    n_cols = costs.shape[1]
+    free = row4col == -1
+    free_candidates = np.full(n_cols, np.inf)
+    better_free = np.empty(n_cols, dtype=bool)
+    shortest = np.empty(n_cols)
+    bound = np.full(n_cols, np.inf)
+    candidates = np.full(n_cols, np.inf)
+    path = np.full(n_cols, -1, dtype=np.int64)
+    scanned = np.zeros(n_cols, dtype=bool)
+    reduced = np.empty(n_cols)
+    better = np.empty(n_cols, dtype=bool)
+    scanned_rows = []
+
+    min_val = 0.0
+    i = cur_row
+    sink = -1
+    while sink == -1:
+        scanned_rows.append(i)
+        np.subtract(costs[i], v, out=reduced)
+        reduced += min_val - u[i]
+        np.less(reduced, bound, out=better)
+        np.copyto(path, i, where=better)
+        np.copyto(bound, reduced, where=better)
+        np.copyto(candidates, reduced, where=better)
+        np.logical_and(better, free, out=better_free)
+        np.copyto(free_candidates, reduced, where=better_free)
+
+        j = int(candidates.argmin())
+        min_val = candidates[j]
+        if min_val == np.inf:
+            raise ValueError("cost matrix is infeasible")
+        if not free[j]:
+            j_free = int(free_candidates.argmin())
+            if free_candidates[j_free] == min_val:
+                j = j_free
+
+        shortest[j] = min_val
+        scanned[j] = True
+        bound[j] = -np.inf
+        candidates[j] = np.inf
+        if row4col[j] == -1:
+            sink = j
+        else:
+            i = row4col[j]
+
+    # ενημέρωση δυναμικών
+    u[cur_row] += min_val
+    if len(scanned_rows) > 1:
+        rows = np.array(scanned_rows[1:])
+        u[rows] += min_val - shortest[col4row[rows]]
+    v[scanned] -= min_val - shortest[scanned]
+
+    # αντιστροφή του augmenting path
+    j = sink
+    while True:
+        i = path[j]
+        row4col[j] = i
+        col4row[i], j = j, col4row[i]
+        if i == cur_row:
+            break
+
+
+def _initial_matching(costs):
+    # column reduction: v[j] = min στήλης και ανάθεση της γραμμής του ελαχίστου, αν είναι ελεύθερη
+    n_rows, n_cols = costs.shape
+    u = np.zeros(n_rows)
+    v = costs.min(axis=0).astype(np.float64)
+    col4row = np.full(n_rows, -1, dtype=np.int64)
+    row4col = np.full(n_cols, -1, dtype=np.int64)
+    for j, i in enumerate(costs.argmin(axis=0)):
+        if col4row[i] == -1:
+            col4row[i] = j
+            row4col[j] = i
+    return u, v, col4row, row4col
+
+
+def solve_lap(cost_matrix, u=None, v=None, col4row=None, row4col=None):
+    '''
+    Επιστρέφει (col4row, u, v) για τετραγωνικό πίνακα κόστους.
+    Αν δοθούν δυναμικά και μερικό matching (π.χ. από προηγούμενη επίλυση),
+    γίνονται augment μόνο οι ελεύθερες γραμμές.
+    '''
+    costs = np.asarray(cost_matrix, dtype=np.float64)
+    n_rows, n_cols = costs.shape
+    if n_rows != n_cols:
+        raise ValueError("solve_lap expects a square matrix, use pad_matrix first")
+
+    if u is None:
+        u, v, col4row, row4col = _initial_matching(costs)
+
+    for cur_row in np.flatnonzero(col4row == -1):
+        _augment(costs, u, v, col4row, row4col, int(cur_row))
+    return col4row, u, v
+
+
+def potentials(cost_matrix, col4row, tolerance=1e-9):
+    '''
+    Δυναμικά (u, v) για ένα ήδη βέλτιστο πλήρες matching (π.χ. του scipy), ώστε να
+    ξαναχρησιμοποιηθεί ως warm start. Το v είναι οι αποστάσεις στο residual γράφημα
+    των στηλών (Bellman-Ford, ένα διάνυσμα ανά γύρο) και u[i] = c[i][col4row[i]] - v[col4row[i]].
+    '''
+    costs = np.asarray(cost_matrix, dtype=np.float64)
+    assigned = costs[np.arange(costs.shape[0]), col4row]
+    # v[j] <= v[col4row[i]] + c[i][j] - c[i][col4row[i]] για κάθε i, j
+    weights = costs - assigned[:, None]
+    v = np.zeros(costs.shape[1])
+    # το πολύ n γύροι· με float κόστη η σύγκλιση ελέγχεται με ανοχή (αλλιώς στρογγυλέματα
+    # δίνουν μικρούς αρνητικούς κύκλους και το v κατεβαίνει για πάντα)
+    for _ in range(costs.shape[1]):
+        relaxed = (v[col4row][:, None] + weights).min(axis=0)
+        if not (relaxed < v - tolerance).any():
+            break
+        np.minimum(v, relaxed, out=v)
+    return assigned - v[col4row], v
+
+
+def pad_matrix(jobs_matrix):
+    # περισσότεροι workers από jobs: προσθέτουμε dummy jobs μηδενικού κόστους
+    workers, jobs = jobs_matrix.shape
+    if workers < jobs:
+        raise ValueError(f"{jobs} jobs cannot be covered by {workers} workers")
+    if workers == jobs:
+        return jobs_matrix
+    padded = np.zeros((workers, workers), dtype=jobs_matrix.dtype)
+    padded[:, :jobs] = jobs_matrix
+    return padded
+
+
+@traced("solve.lap")
+def lap_solver(jobs_matrix):
+    jobs_matrix = np.asarray(jobs_matrix)
+    current().set(workers=jobs_matrix.shape[0], jobs=jobs_matrix.shape[1])
+    jobs = jobs_matrix.shape[1]
+
+    start_time = time.time()
+    col4row, _, _ = solve_lap(pad_matrix(jobs_matrix))
+    end_time = time.time()
+
+    rows = np.flatnonzero(col4row < jobs)
+    costs = jobs_matrix[rows, col4row[rows]]
+    assignments = [(i, int(j), jobs_matrix[i][j]) for i, j in enumerate(col4row) if j < jobs]
+    total_cost = float(costs.astype(np.int64).sum() if costs.dtype.kind in "iu" else costs.sum())
+    current().set(objective=total_cost)
+    return total_cost, assignments, end_time - start_time
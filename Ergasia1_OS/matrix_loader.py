@@ -0,0 +1,153 @@
+'''
+Φόρτωση πινάκων κόστους ανάθεσης (μορφή: n στην πρώτη γραμμή και μετά n*n ακέραιοι).
+
+Το κείμενο διαβάζεται με ένα vectorised πέρασμα του NumPy και αποθηκεύεται μία φορά
+σε binary cache (.npy: header + typed array) στο .cache/ δίπλα στο αρχείο.
+Οι επόμενες εκτελέσεις κάνουν np.memmap το .npy χωρίς καθόλου parsing.
+Αρχεία μεγαλύτερα από STREAM_BYTES μετατρέπονται ανά κομμάτια (stream_to_cache),
+ώστε ούτε το κείμενο ούτε ο πίνακας να χρειάζεται να χωρέσει στη μνήμη.
+'''
+
+import os
+import numpy as np
+
+import _paths
+from opsearch.instrument import traced, current
+
+CACHE_DIR = ".cache"
+STREAM_BYTES = 256 << 20
+CHUNK_BYTES = 8 << 20
+INT_DTYPES = (np.int8, np.int16, np.int32, np.int64)
+
+
+def smallest_int_dtype(values):
+    # ο μικρότερος ακέραιος τύπος που χωράει όλες τις τιμές
+    if values.size == 0:
+        return np.dtype(np.int8)
+    low, high = values.min(), values.max()
+    for dtype in INT_DTYPES:
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+def parse_text(filename):
+    with open(filename, 'r') as file:
+        text = file.read()
+    data = np.fromstring(text, dtype=np.int64, sep=' ')
+    if data.size == 0:
+        raise ValueError(f"{filename}: empty cost matrix file")
+    n = int(data[0])
+    if data.size - 1 < n * n:
+        raise ValueError(f"{filename}: expected {n * n} costs, found {data.size - 1}")
+    matrix = data[1:n * n + 1].reshape(n, n)
+    return matrix.astype(smallest_int_dtype(matrix))
+
+
+def _number_chunks(filename, chunk_bytes=CHUNK_BYTES):
+    # οι ακέραιοι του αρχείου ανά κομμάτια· ένας αριθμός που κόβεται στο όριο περνά στο επόμενο
+    with open(filename, 'rb') as file:
+        rest = b""
+        while True:
+            data = file.read(chunk_bytes)
+            if not data:
+                break
+            data = rest + data
+            cut = len(data.rstrip(b"0123456789+-"))
+            rest = data[cut:]
+            if cut:
+                yield np.fromstring(data[:cut], dtype=np.int64, sep=' ')
+        if rest:
+            yield np.fromstring(rest, dtype=np.int64, sep=' ')
+
+
+def stream_to_cache(filename, chunk_bytes=CHUNK_BYTES):
+    '''
+    Γράφει το .npy cache χωρίς να κρατά ολόκληρο τον πίνακα: ένα πέρασμα για n, min και max
+    (άρα τον τύπο, όπως το smallest_int_dtype) και ένα δεύτερο που γράφει σε memmap.
+    '''
+    n, count, low, high = None, 0, None, None
+    for values in _number_chunks(filename, chunk_bytes):
+        if n is None and values.size:
+            n, values = int(values[0]), values[1:]
+        values = values[:max(0, n * n - count)] if n is not None else values
+        if values.size:
+            count += values.size
+            low = values.min() if low is None else min(low, values.min())
+            high = values.max() if high is None else max(high, values.max())
+    if n is None:
+        raise ValueError(f"{filename}: empty cost matrix file")
+    if count < n * n:
+        raise ValueError(f"{filename}: expected {n * n} costs, found {count}")
+
+    path = cache_path(filename)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        out = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=smallest_int_dtype(np.array([low, high])), shape=(n, n))
+        flat = out.reshape(-1)
+        position = 0
+        first = True
+        for values in _number_chunks(filename, chunk_bytes):
+            if first and values.size:
+                values, first = values[1:], False
+            values = values[:n * n - position]
+            flat[position:position + values.size] = values
+            position += values.size
+        out.flush()
+        del out, flat
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return path
+
+
+def cache_path(filename):
+    directory, name = os.path.split(os.path.abspath(filename))
+    return os.path.join(directory, CACHE_DIR, os.path.splitext(name)[0] + ".npy")
+
+
+def write_cache(filename, matrix):
+    path = cache_path(filename)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as file:
+            np.save(file, matrix)
+        os.replace(tmp_path, path)
+    except OSError:
+        # read-only dataset: απλώς δεν κρατάμε cache
+        return None
+    return path
+
+
+@traced("load.matrix")
+def load_matrix(filename, cache=True):
+    '''
+    Επιστρέφει τον πίνακα κόστους ως NumPy array με τον μικρότερο επαρκή ακέραιο τύπο.
+    Με cache=True επιστρέφεται read-only memmap του .npy cache, που ξαναγράφεται
+    όταν το αρχείο κειμένου είναι νεότερο.
+    '''
+    if not cache:
+        return parse_text(filename)
+
+    path = cache_path(filename)
+    current().set(file=filename)
+    if os.path.exists(path) and os.path.getmtime(path) >= os.path.getmtime(filename):
+        current().set(cached=True)
+        return np.load(path, mmap_mode='r')
+
+    if os.path.getsize(filename) > STREAM_BYTES:
+        try:
+            path = stream_to_cache(filename)
+        except OSError:
+            # read-only dataset ή γεμάτος δίσκος: όπως στο write_cache, parsing στη μνήμη
+            return parse_text(filename)
+        current().set(streamed=True)
+        return np.load(path, mmap_mode='r')
+    matrix = parse_text(filename)
+    if write_cache(filename, matrix) is None:
+        return matrix
+    return np.load(path, mmap_mode='r')
@@ -0,0 +1,324 @@
+'''
+Ανάθεση για πίνακες που δεν χωράνε στη μνήμη (π.χ. 50000 x 50000), πάνω στο memmap
+του .npy cache (matrix_loader· τα μεγάλα αρχεία κειμένου μετατρέπονται ανά κομμάτια).
+
+Auction (Bertsekas) με ε-scaling, ανά blocks γραμμών:
+- μόνιμα στη μνήμη μόνο O(n): τιμές στηλών (prices), col4row, row4col
+- σε κάθε γύρο διαβάζονται από τον δίσκο μόνο οι γραμμές που δεν έχουν ανάθεση,
+  ταξινομημένες και ανά block το πολύ block_bytes, και κάνουν προσφορά όλες μαζί
+  (best / second best πάνω στις τρέχουσες τιμές)· οι τιμές ενημερώνονται μετά από κάθε block
+- τα κόστη πολλαπλασιάζονται με n + 1, οπότε η τελευταία φάση με ε = 1 δίνει τη
+  βέλτιστη λύση για ακέραια κόστη· για δεκαδικά κόστη οι φάσεις συνεχίζουν ως ε =
+  FLOAT_EPSILON (σχετικά με το μέγεθος των τιμών), ώστε το φράγμα να απέχει ~1e-7
+- στο τέλος ένα πέρασμα όλων των γραμμών δίνει το dual φράγμα (best_bound), και το
+  auction_solver γράφει με αυτό optimal / gap / status (όπως ο Lagrangian solver)
+- progress ανά γύρο (on_progress) και checkpoint (np.savez, ατομικά) κάθε
+  checkpoint_every δευτερόλεπτα, στο τέλος κάθε φάσης και σε Ctrl-C· με resume η
+  επίλυση συνεχίζει από το checkpoint αν είναι του ίδιου πίνακα (hash όλων των δεδομένων)
+
+    python out_of_core.py dataset/assign20000.txt --block-mb 256 --checkpoint .cache/assign20000.ckpt.npz --progress
+'''
+
+import os
+import sys
+import time
+import hashlib
+import argparse
+import numpy as np
+from matrix_loader import load_matrix
+import _paths
+from opsearch.instrument import traced, current
+
+BLOCK_BYTES = 256 << 20
+SCALING = 8
+CHECKPOINT_EVERY = 60.0
+CHECKPOINT_VERSION = 2
+# τελικό ε για δεκαδικά κόστη, απόλυτο και σχετικό με το μεγαλύτερο (κλιμακωμένο) κόστος
+FLOAT_EPSILON = 1e-7
+FLOAT_EPSILON_SHARE = 1e-12
+
+
+def open_matrix(filename):
+    # .npy: απευθείας memmap, αλλιώς το cache του matrix_loader
+    if filename.endswith(".npy"):
+        return np.load(filename, mmap_mode='r')
+    return load_matrix(filename)
+
+
+def block_rows(n, block_bytes=BLOCK_BYTES):
+    # γραμμές ανά block ώστε το block (float64) να μένει κάτω από block_bytes
+    return max(1, int(block_bytes) // (8 * n))
+
+
+def _read_block(matrix, rows, n, scale):
+    # οφέλη -(n + 1) * κόστος· οι στήλες πέρα από τα jobs είναι dummy με κόστος 0
+    block = np.zeros((rows.size, n))
+    block[:, :matrix.shape[1]] = matrix[rows]
+    block *= -scale
+    return block
+
+
+def fingerprint(matrix, block_bytes=BLOCK_BYTES):
+    # σχήμα, τύπος και όλα τα δεδομένα, ανά blocks γραμμών (ένα σειριακό πέρασμα του memmap),
+    # ώστε ένα checkpoint να μη συνεχίζεται σε πίνακα που άλλαξε έστω και σε ένα κελί
+    digest = hashlib.sha256(f"{matrix.shape}:{matrix.dtype.str}".encode())
+    rows_per_block = max(1, int(block_bytes) // max(1, matrix.shape[1] * matrix.dtype.itemsize))
+    for start in range(0, matrix.shape[0], rows_per_block):
+        digest.update(np.ascontiguousarray(matrix[start:start + rows_per_block]))
+    return digest.hexdigest()[:16]
+
+
+def _column_pass(matrix, n, rows_per_block):
+    # ένα σειριακό πέρασμα: min ανά στήλη και εύρος κόστους, για αρχικές τιμές και ε
+    column_min = np.full(n, np.inf)
+    if matrix.shape[1] < n:
+        column_min[matrix.shape[1]:] = 0.0
+    low, high = np.inf, -np.inf
+    for start in range(0, matrix.shape[0], rows_per_block):
+        block = np.asarray(matrix[start:start + rows_per_block])
+        np.minimum(column_min[:matrix.shape[1]], block.min(axis=0), out=column_min[:matrix.shape[1]])
+        low, high = min(low, float(block.min())), max(high, float(block.max()))
+    if matrix.shape[1] < n:
+        low, high = min(low, 0.0), max(high, 0.0)
+    return column_min, high - low
+
+
+def save_checkpoint(path, state):
+    tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+    try:
+        np.savez(tmp_path, **state)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def load_checkpoint(path, key):
+    # το checkpoint αν υπάρχει και είναι του ίδιου πίνακα / ρυθμίσεων, αλλιώς None
+    if not path or not os.path.exists(path):
+        return None
+    with np.load(path, allow_pickle=False) as data:
+        state = {name: data[name] for name in data.files}
+    if int(state.get("version", -1)) != CHECKPOINT_VERSION or str(state["key"]) != key:
+        return None
+    return state
+
+
+def print_progress(event):
+    print(f"  [{event['elapsed']:.1f}s] phase {event['phase']} (eps {event['epsilon']:.4g}): "
+          f"{event['assigned']}/{event['n']} assigned, round {event['rounds']}, "
+          f"{event['bytes_read'] / 2 ** 30:.2f} GiB read")
+
+
+def _bid(block, prices, epsilon):
+    # για κάθε γραμμή: καλύτερη στήλη και η προσφορά τιμής (διαφορά best - second best + ε)
+    block -= prices
+    index = np.arange(block.shape[0])
+    best = block.argmax(axis=1)
+    first = block[index, best]
+    if block.shape[1] > 1:
+        block[index, best] = -np.inf
+        second = block.max(axis=1)
+    else:
+        second = first
+    return best, prices[best] + (first - second) + epsilon
+
+
+def _assign(rows, best, bids, prices, col4row, row4col):
+    # η μεγαλύτερη προσφορά ανά στήλη κερδίζει· ο προηγούμενος κάτοχος μένει ελεύθερος
+    order = np.lexsort((-bids, best))
+    columns = best[order]
+    first = np.ones(order.size, dtype=bool)
+    first[1:] = columns[1:] != columns[:-1]
+    winners = order[first]
+    columns = best[winners]
+    previous = row4col[columns]
+    col4row[previous[previous >= 0]] = -1
+    row4col[columns] = rows[winners]
+    col4row[rows[winners]] = columns
+    prices[columns] = bids[winners]
+
+
+def dual_bound(matrix, prices, n, scale, rows_per_block):
+    '''
+    Κάτω φράγμα στο κόστος από τις τιμές: max_j (όφελος - τιμή) ανά γραμμή σε ένα πέρασμα,
+    dual = sum(αυτά) + sum(prices) και φράγμα = -dual / (n + 1).
+    '''
+    total = float(prices.sum())
+    for start in range(0, matrix.shape[0], rows_per_block):
+        rows = np.arange(start, min(start + rows_per_block, matrix.shape[0]))
+        block = _read_block(matrix, rows, n, scale)
+        block -= prices
+        total += float(block.max(axis=1).sum())
+    return -total / scale
+
+
+@traced("solve.auction")
+def auction(matrix, block_bytes=BLOCK_BYTES, scaling=SCALING, checkpoint=None, checkpoint_every=CHECKPOINT_EVERY,
+            resume=True, on_progress=None, progress_every=1.0, certify=True, stats=None):
+    '''
+    Επιστρέφει col4row (job ανά worker, -1 για worker με dummy job) για πίνακα
+    workers x jobs με workers >= jobs (όπως το lap.pad_matrix, χωρίς να φτιάχνεται).
+    Στο stats γράφονται phases, rounds, bytes_read, best_bound (με certify) και resumed.
+    '''
+    workers, jobs = matrix.shape
+    if workers < jobs:
+        raise ValueError(f"{jobs} jobs cannot be covered by {workers} workers")
+    n = workers
+    scale = float(n + 1)
+    rows_per_block = block_rows(n, block_bytes)
+    row_bytes = matrix.shape[1] * matrix.dtype.itemsize
+    # το fingerprint διαβάζει όλο τον πίνακα, άρα μόνο όταν υπάρχει checkpoint
+    key = f"{fingerprint(matrix, block_bytes)}:{scaling}" if checkpoint else None
+    current().set(n=n, jobs=jobs, rows_per_block=rows_per_block)
+
+    start_time = time.time()
+    state = load_checkpoint(checkpoint, key) if resume else None
+    if state is not None:
+        prices, col4row, row4col = state["prices"], state["col4row"], state["row4col"]
+        epsilon, phase, rounds, bytes_read = float(state["epsilon"]), int(state["phase"]), int(state["rounds"]), int(state["bytes_read"])
+        epsilon_floor = float(state["epsilon_floor"])
+        start_time -= float(state["elapsed"])
+    else:
+        column_min, spread = _column_pass(matrix, n, rows_per_block)
+        # αρχικές τιμές: το μεγαλύτερο όφελος κάθε στήλης (column reduction)
+        prices = -scale * column_min
+        if matrix.dtype.kind in "iub":
+            epsilon_floor = 1.0
+        else:
+            # κάτω από το ulp των τιμών οι προσφορές δεν θα τις ανέβαζαν
+            magnitude = (float(np.abs(column_min).max(initial=0.0)) + spread) * scale
+            epsilon_floor = max(FLOAT_EPSILON, FLOAT_EPSILON_SHARE * magnitude)
+        epsilon = max(epsilon_floor, spread * scale / scaling)
+        col4row = np.full(n, -1, dtype=np.int64)
+        row4col = np.full(n, -1, dtype=np.int64)
+        phase, rounds, bytes_read = 1, 0, workers * row_bytes
+
+    def snapshot():
+        return {"version": CHECKPOINT_VERSION, "key": key, "prices": prices, "col4row": col4row, "row4col": row4col,
+                "epsilon": epsilon, "epsilon_floor": epsilon_floor, "phase": phase, "rounds": rounds, "bytes_read": bytes_read,
+                "elapsed": time.time() - start_time}
+
+    def report():
+        if on_progress is not None:
+            on_progress({"phase": phase, "epsilon": epsilon, "assigned": int((col4row >= 0).sum()), "n": n,
+                         "rounds": rounds, "bytes_read": bytes_read, "elapsed": time.time() - start_time})
+
+    last_checkpoint = last_progress = time.time()
+    try:
+        while True:
+            free = np.flatnonzero(col4row == -1)
+            if free.size == 0:
+                report()
+                if epsilon <= epsilon_floor:
+                    break
+                # επόμενη φάση: μικρότερο ε, οι τιμές μένουν και οι αναθέσεις ξεκινούν από την αρχή
+                epsilon = max(epsilon_floor, epsilon / scaling)
+                phase += 1
+                col4row[:] = -1
+                row4col[:] = -1
+                if checkpoint:
+                    save_checkpoint(checkpoint, snapshot())
+                    last_checkpoint = time.time()
+                continue
+
+            rounds += 1
+            for start in range(0, free.size, rows_per_block):
+                rows = free[start:start + rows_per_block]
+                block = _read_block(matrix, rows, n, scale)
+                bytes_read += rows.size * row_bytes
+                best, bids = _bid(block, prices, epsilon)
+                _assign(rows, best, bids, prices, col4row, row4col)
+
+            now = time.time()
+            if now - last_progress >= progress_every:
+                report()
+                last_progress = now
+            if checkpoint and now - last_checkpoint >= checkpoint_every:
+                save_checkpoint(checkpoint, snapshot())
+                last_checkpoint = now
+    except KeyboardInterrupt:
+        if checkpoint:
+            save_checkpoint(checkpoint, snapshot())
+            print(f"Interrupted, checkpoint written to {checkpoint}")
+        raise
+
+    if stats is not None:
+        stats.update(phases=phase, rounds=rounds, bytes_read=bytes_read, resumed=state is not None)
+        if certify:
+            stats["best_bound"] = dual_bound(matrix, prices, n, scale, rows_per_block)
+            stats["bytes_read"] += workers * row_bytes
+    current().set(phases=phase, rounds=rounds, bytes_read=bytes_read)
+    if checkpoint and os.path.exists(checkpoint):
+        os.remove(checkpoint)
+    # οι dummy στήλες (>= jobs) σημαίνουν worker χωρίς ανάθεση
+    col4row[col4row >= jobs] = -1
+    return col4row
+
+
+def auction_solver(jobs_matrix, stats=None, **options):
+    '''
+    Όπως το lap.lap_solver: (total_cost, assignments, solve_time). Στο stats
+    γράφονται επιπλέον τα στατιστικά του auction (phases, rounds, best_bound, ...)
+    και optimal, gap, status: με ακέραια κόστη το φράγμα στρογγυλεύεται προς τα πάνω,
+    με δεκαδικά η λύση είναι βέλτιστη μόνο αν φτάνει το φράγμα.
+    '''
+    matrix = jobs_matrix if isinstance(jobs_matrix, np.ndarray) else np.asarray(jobs_matrix)
+    stats = {} if stats is None else stats
+    start_time = time.time()
+    col4row = auction(matrix, stats=stats, **options)
+    end_time = time.time()
+
+    rows = np.flatnonzero(col4row >= 0)
+    costs = np.asarray(matrix[rows, col4row[rows]])
+    assignments = [(int(i), int(j), c) for i, j, c in zip(rows, col4row[rows], costs)]
+    integral = costs.dtype.kind in "iu"
+    total_cost = float(costs.astype(np.int64).sum() if integral else costs.sum())
+    if "best_bound" in stats:
+        lower_bound = float(np.ceil(stats["best_bound"] - 1e-9)) if integral else stats["best_bound"]
+        stats["gap"] = float(max(0.0, (total_cost - lower_bound) / max(abs(total_cost), 1.0)))
+        stats["optimal"] = bool(total_cost - lower_bound <= max(1e-6, 1e-9 * abs(total_cost)))
+    else:
+        # χωρίς certify: η θεωρία του ε-scaling εγγυάται τη βέλτιστη λύση μόνο για ακέραια κόστη
+        stats["optimal"] = integral
+    stats["status"] = "OPTIMAL" if stats["optimal"] else "FEASIBLE"
+    stats["build_time"] = 0.0
+    stats["solve_time"] = end_time - start_time
+    return total_cost, assignments, end_time - start_time
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ανάθεση για πίνακες που δεν χωράνε στη μνήμη (auction ανά blocks)")
+    parser.add_argument("instance", help="αρχείο κειμένου (π.χ. dataset/assign20000.txt) ή .npy")
+    parser.add_argument("--block-mb", type=float, default=BLOCK_BYTES / 2 ** 20, help="μέγεθος block γραμμών σε MiB")
+    parser.add_argument("--scaling", type=float, default=SCALING, help="διαίρεση του ε ανά φάση")
+    parser.add_argument("--checkpoint", default=None, help="αρχείο .npz για checkpoint / resume")
+    parser.add_argument("--checkpoint-every", type=float, default=CHECKPOINT_EVERY, help="δευτερόλεπτα")
+    parser.add_argument("--no-resume", action="store_true", help="αγνοεί υπάρχον checkpoint")
+    parser.add_argument("--progress", action="store_true", help="τυπώνει την πρόοδο κάθε --progress-every δευτερόλεπτα")
+    parser.add_argument("--progress-every", type=float, default=5.0)
+    parser.add_argument("--output", default=None, help="αρχείο λύσης (κείμενο ή .bin, βλ. solution_io)")
+    args = parser.parse_args(argv)
+
+    matrix = open_matrix(args.instance)
+    stats = {}
+    total_cost, assignments, solve_time = auction_solver(
+        matrix, stats, block_bytes=args.block_mb * 2 ** 20, scaling=args.scaling, checkpoint=args.checkpoint,
+        checkpoint_every=args.checkpoint_every, resume=not args.no_resume,
+        on_progress=print_progress if args.progress else None, progress_every=args.progress_every)
+    print(f"Solved {args.instance}: Total Cost = {total_cost}, Lower Bound = {stats['best_bound']:.2f}, "
+          f"Time = {solve_time:.2f} seconds")
+    if not stats["optimal"]:
+        print(f"    Not proven optimal (gap {stats['gap']:.4%})")
+    print(f"    {stats['phases']} phases, {stats['rounds']} rounds, {stats['bytes_read'] / 2 ** 30:.2f} GiB read"
+          + (" (resumed)" if stats["resumed"] else ""))
+    if args.output:
+        from solution_io import write_solution, write_binary_solution
+        if args.output.endswith(".bin"):
+            write_binary_solution(args.output, total_cost, assignments, matrix.shape[0])
+        else:
+            write_solution(args.output, total_cost, assignments)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
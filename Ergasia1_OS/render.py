@@ -0,0 +1,129 @@
+'''
+Σχεδίαση μιας λύσης ανάθεσης σε αρχείο, headless (Agg canvas, χωρίς pyplot).
+
+Τρεις τρόποι:
+- "graph":   διμερής γράφος με όλες τις ακμές (ή δείγμα sample_edges από αυτές), με τις
+             ακμές της λύσης τονισμένες
+- "matched": μόνο οι ακμές της λύσης
+- "heatmap": imshow του πίνακα κόστους με τη λύση από πάνω, για μεγάλα n
+Με mode="auto" επιλέγεται graph μέχρι max_nodes γραμμές και heatmap μετά.
+
+Καλείται μόνο μετά την επίλυση, οπότε τα solvers δεν φορτώνουν ποτέ το matplotlib.
+'''
+
+import os
+import numpy as np
+
+MODES = ("auto", "graph", "matched", "heatmap")
+MAX_NODES = 30        # πάνω από αυτό το auto γυρνάει σε heatmap
+MAX_LABELS = 100      # κόστη πάνω στις ακμές μόνο αν οι ακμές είναι λίγες
+LABEL_POS = 0.3       # θέση της ετικέτας κατά μήκος της ακμής (όχι στη μέση, όπου συμπίπτουν)
+
+
+def _new_figure(size):
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    figure = Figure(figsize=size)
+    FigureCanvasAgg(figure)
+    return figure
+
+
+def _edges(shape, rows, cols, mode, sample_edges, seed):
+    # ακμές που θα σχεδιαστούν, εκτός από αυτές της λύσης
+    if mode == "matched":
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    n_rows, n_cols = shape
+    total = n_rows * n_cols
+    if sample_edges is not None and sample_edges < total:
+        flat = np.random.default_rng(seed).choice(total, size=sample_edges, replace=False)
+    else:
+        flat = np.arange(total)
+    edge_rows, edge_cols = np.divmod(flat, n_cols)
+    matched = np.zeros(shape, dtype=bool)
+    matched[rows, cols] = True
+    keep = ~matched[edge_rows, edge_cols]
+    return edge_rows[keep], edge_cols[keep]
+
+
+def _draw_graph(axes, costs, rows, cols, mode, sample_edges, seed):
+    from matplotlib.collections import LineCollection
+
+    n_rows, n_cols = costs.shape
+    # αριστερά οι γραμμές στο x=0, δεξιά οι στήλες στο x=1, όπως στο αρχικό nx.draw
+    left_y = -np.arange(n_rows, dtype=np.float64)
+    right_y = -np.arange(n_cols, dtype=np.float64)
+
+    edge_rows, edge_cols = _edges(costs.shape, rows, cols, mode, sample_edges, seed)
+    segments = np.stack([
+        np.column_stack([np.zeros(edge_rows.size), left_y[edge_rows]]),
+        np.column_stack([np.ones(edge_cols.size), right_y[edge_cols]]),
+    ], axis=1)
+    axes.add_collection(LineCollection(segments, colors="lightgray", linewidths=0.5, zorder=1))
+
+    matched = np.stack([
+        np.column_stack([np.zeros(rows.size), left_y[rows]]),
+        np.column_stack([np.ones(cols.size), right_y[cols]]),
+    ], axis=1)
+    axes.add_collection(LineCollection(matched, colors="tab:red", linewidths=1.5, zorder=2))
+
+    axes.scatter(np.zeros(n_rows), left_y, s=200 if n_rows <= MAX_NODES else 10, color="tab:blue", zorder=3)
+    axes.scatter(np.ones(n_cols), right_y, s=200 if n_cols <= MAX_NODES else 10, color="tab:blue", zorder=3)
+    if n_rows <= MAX_NODES and n_cols <= MAX_NODES:
+        for i in range(n_rows):
+            axes.text(0, left_y[i], str(i), ha="center", va="center", color="white", fontsize=8, zorder=4)
+        for j in range(n_cols):
+            axes.text(1, right_y[j], str(n_rows + j), ha="center", va="center", color="white", fontsize=8, zorder=4)
+
+    label_rows = np.concatenate([rows, edge_rows])
+    label_cols = np.concatenate([cols, edge_cols])
+    if label_rows.size <= MAX_LABELS:
+        for i, j in zip(label_rows, label_cols):
+            y = left_y[i] + LABEL_POS * (right_y[j] - left_y[i])
+            axes.text(LABEL_POS, y, str(costs[i, j]), ha="center", va="center", fontsize=7,
+                      bbox={"facecolor": "white", "edgecolor": "none", "pad": 0.5}, zorder=3)
+
+    axes.set_xlim(-0.2, 1.2)
+    axes.set_ylim(-max(n_rows, n_cols), 1)
+    axes.axis("off")
+
+
+def _draw_heatmap(figure, axes, costs, rows, cols):
+    image = axes.imshow(costs, cmap="viridis", interpolation="nearest", aspect="auto")
+    figure.colorbar(image, ax=axes, label="Κόστος")
+    axes.scatter(cols, rows, s=max(1.0, 2000.0 / max(costs.shape)), color="red", marker="s", linewidths=0)
+    axes.set_xlabel("Job")
+    axes.set_ylabel("Worker")
+
+
+def render_matching(cost_matrix, rows, cols, path, mode="auto", max_nodes=MAX_NODES, sample_edges=None,
+                    seed=0, title=None):
+    '''
+    Γράφει στο path (png, svg, pdf ...) τη λύση (rows[k] -> cols[k]) πάνω στον πίνακα κόστους.
+    Επιστρέφει τον τρόπο σχεδίασης που χρησιμοποιήθηκε.
+    '''
+    if mode not in MODES:
+        raise ValueError(f"unknown mode {mode!r}, choose from {MODES}")
+    costs = np.asarray(cost_matrix)
+    rows = np.asarray(rows, dtype=np.int64)
+    cols = np.asarray(cols, dtype=np.int64)
+    if mode == "auto":
+        mode = "graph" if max(costs.shape) <= max_nodes else "heatmap"
+
+    if mode == "heatmap":
+        figure = _new_figure((8, 7))
+        axes = figure.add_subplot()
+        _draw_heatmap(figure, axes, costs, rows, cols)
+    else:
+        height = min(60.0, max(4.0, 0.3 * max(costs.shape)))
+        figure = _new_figure((6, height))
+        axes = figure.add_subplot()
+        _draw_graph(axes, costs, rows, cols, mode, sample_edges, seed)
+    default_title = "Cost Matrix and Matching" if mode == "heatmap" else "Bipartite Graph Representation of Cost Matrix"
+    axes.set_title(title or default_title)
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    figure.savefig(path, dpi=100)
+    return mode
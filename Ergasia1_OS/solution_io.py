@@ -0,0 +1,188 @@
+'''
+Εγγραφή, ανάγνωση και έλεγχος των λύσεων ανάθεσης (solutions/erotima*/…_solution.txt).
+
+- κείμενο: το συνολικό κόστος στην πρώτη γραμμή και μετά worker,job,κόστος ανά γραμμή,
+  byte προς byte όπως τα υπάρχοντα αρχεία· γράφεται με ένα μόνο write. Όταν ο solver
+  δεν βρήκε λύση, η πρώτη γραμμή είναι MISSING_COST και δεν ακολουθούν αναθέσεις
+- binary (.bin): header (magic, έκδοση, n, κόστος) και ένας int32 πίνακας job ανά worker
+  (-1 για worker χωρίς ανάθεση), διαβάζεται με np.frombuffer χωρίς parsing· χωρίς λύση
+  το κόστος είναι NaN
+- read_solution διαβάζει και τις δύο μορφές (αναγνωρίζει το magic)
+- verify_solution ελέγχει μια λύση απέναντι στον πίνακα κόστους με πράξεις NumPy:
+  έγκυρους δείκτες, κάθε job ακριβώς μία φορά, κάθε worker το πολύ μία (ακριβώς με
+  rows_equal), το κόστος και τους περιορισμούς των blocks του erotima3
+
+    python solution_io.py solutions/erotima3/assign100_erotima3_solution.txt dataset/assign100.txt --block-size 5
+    python solution_io.py solutions/erotima1/assign800_erotima1_solution.txt --to-binary assign800.bin
+'''
+
+import sys
+import struct
+import argparse
+import numpy as np
+
+import _paths
+from opsearch.instrument import traced
+
+MAGIC = b"ASOL"
+VERSION = 1
+# magic, έκδοση, n (workers), συνολικό κόστος
+HEADER = struct.Struct("<4sIqd")
+# πρώτη γραμμή του αρχείου κειμένου όταν δεν βρέθηκε λύση (total_cost None)
+MISSING_COST = "None"
+
+
+def format_solution(total_cost, assignments):
+    # ίδιο κείμενο με τα αρχικά file.write ανά γραμμή
+    if total_cost is None:
+        return f"{MISSING_COST}\n"
+    return f"{total_cost}\n" + "".join(f"{i},{j},{c}\n" for i, j, c in assignments)
+
+
+@traced("write.solution")
+def write_solution(file_path, total_cost, assignments):
+    with open(file_path, 'w') as file:
+        file.write(format_solution(total_cost, assignments))
+
+
+def to_permutation(rows, cols, n=None):
+    # job ανά worker, -1 όπου δεν υπάρχει ανάθεση
+    rows = np.asarray(rows, dtype=np.int64)
+    n = int(rows.max()) + 1 if n is None and rows.size else (n or 0)
+    permutation = np.full(n, -1, dtype=np.int32)
+    permutation[rows] = cols
+    return permutation
+
+
+@traced("write.solution_binary")
+def write_binary_solution(file_path, total_cost, assignments, n=None):
+    # assignments: (worker, job) ή (worker, job, κόστος)· n: πλήθος workers (default ο μεγαλύτερος + 1)
+    pairs = np.array([pair[:2] for pair in assignments or ()], dtype=np.float64).reshape(-1, 2).astype(np.int64)
+    permutation = to_permutation(pairs[:, 0], pairs[:, 1], n)
+    with open(file_path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, VERSION, permutation.size, np.nan if total_cost is None else float(total_cost)))
+        file.write(permutation.astype("<i4").tobytes())
+
+
+def _parse_cost(text):
+    text = text.strip()
+    if text == MISSING_COST:
+        return None
+    return float(text) if any(ch in text for ch in ".eEn") else int(text)
+
+
+@traced("load.solution")
+def read_solution(file_path):
+    '''
+    Επιστρέφει (total_cost, rows, cols, costs) σε NumPy arrays· το costs είναι
+    None για τη binary μορφή, που δεν κρατά το κόστος ανά γραμμή, και το total_cost
+    None για αρχείο χωρίς λύση.
+    '''
+    with open(file_path, 'rb') as file:
+        data = file.read()
+    if data[:len(MAGIC)] == MAGIC:
+        _, version, n, total_cost = HEADER.unpack_from(data)
+        if version != VERSION:
+            raise ValueError(f"{file_path}: unsupported solution version {version}")
+        permutation = np.frombuffer(data, dtype="<i4", count=n, offset=HEADER.size)
+        rows = np.flatnonzero(permutation >= 0)
+        if np.isnan(total_cost):
+            total_cost = None
+        return total_cost, rows, permutation[rows].astype(np.int64), None
+
+    first, _, body = data.decode().partition("\n")
+    values = np.fromstring(body.replace("\n", ","), dtype=np.float64, sep=",")
+    if values.size % 3:
+        raise ValueError(f"{file_path}: expected worker,job,cost lines")
+    values = values.reshape(-1, 3)
+    return _parse_cost(first), values[:, 0].astype(np.int64), values[:, 1].astype(np.int64), values[:, 2]
+
+
+@traced("verify.solution")
+def verify_solution(jobs_matrix, rows, cols, total_cost=None, costs=None, rows_equal=False, block_size=None,
+                    block_min=2, tolerance=1e-6):
+    '''
+    Ελέγχει τη λύση (rows[k] -> cols[k]) και επιστρέφει λίστα με τα προβλήματα
+    που βρέθηκαν (κενή αν η λύση είναι έγκυρη).
+    '''
+    jobs_matrix = np.asarray(jobs_matrix)
+    workers, jobs = jobs_matrix.shape
+    rows = np.asarray(rows, dtype=np.int64)
+    cols = np.asarray(cols, dtype=np.int64)
+    problems = []
+
+    valid = (rows >= 0) & (rows < workers) & (cols >= 0) & (cols < jobs)
+    if not valid.all():
+        problems.append(f"{int((~valid).sum())} assignments outside the {workers}x{jobs} matrix")
+        rows, cols = rows[valid], cols[valid]
+        costs = None if costs is None else np.asarray(costs)[valid]
+
+    worker_count = np.bincount(rows, minlength=workers)
+    job_count = np.bincount(cols, minlength=jobs)
+    if (worker_count > 1).any():
+        problems.append(f"{int((worker_count > 1).sum())} workers assigned more than once")
+    if rows_equal and (worker_count == 0).any():
+        problems.append(f"{int((worker_count == 0).sum())} workers without a job")
+    if (job_count != 1).any():
+        problems.append(f"{int((job_count != 1).sum())} jobs not assigned exactly once")
+
+    actual = jobs_matrix[rows, cols]
+    if costs is not None:
+        wrong = np.abs(np.asarray(costs) - actual) > tolerance
+        if wrong.any():
+            problems.append(f"{int(wrong.sum())} lines with a cost different from the matrix")
+    if total_cost is not None and abs(float(total_cost) - float(actual.sum())) > tolerance:
+        problems.append(f"total cost {total_cost} but the assignments cost {actual.sum()}")
+
+    if block_size:
+        # ίδια διαγώνια blocks με το assignment_model.block_ranges
+        size = min(workers, jobs)
+        n_blocks = -(-size // block_size)
+        inside = (rows < size) & (cols < size) & (rows // block_size == cols // block_size)
+        per_block = np.bincount(rows[inside] // block_size, minlength=n_blocks)
+        short = np.flatnonzero(per_block < block_min)
+        if short.size:
+            problems.append(f"{short.size} blocks with fewer than {block_min} assignments (first: block {short[0]})")
+    return problems
+
+
+def check_solution(file_path, jobs_matrix, **constraints):
+    # διάβασμα + verify_solution (constraints: rows_equal, block_size, block_min)
+    total_cost, rows, cols, costs = read_solution(file_path)
+    return verify_solution(jobs_matrix, rows, cols, total_cost, costs, **constraints)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Έλεγχος / μετατροπή λύσεων ανάθεσης")
+    parser.add_argument("solution", help="αρχείο λύσης (κείμενο ή .bin)")
+    parser.add_argument("instance", nargs="?", help="ο πίνακας κόστους, π.χ. dataset/assign100.txt")
+    parser.add_argument("--rows-equal", action="store_true")
+    parser.add_argument("--block-size", type=int, default=None, help="5 για τις λύσεις του erotima3")
+    parser.add_argument("--block-min", type=int, default=2)
+    parser.add_argument("--to-binary", default=None, help="γράφει τη λύση σε binary μορφή")
+    parser.add_argument("--to-text", default=None, help="γράφει τη λύση σε μορφή κειμένου (χρειάζεται instance)")
+    args = parser.parse_args(argv)
+
+    total_cost, rows, cols, costs = read_solution(args.solution)
+    print(f"{args.solution}: total cost {total_cost}, {rows.size} assignments")
+    jobs_matrix = None
+    if args.instance:
+        from matrix_loader import load_matrix
+        jobs_matrix = load_matrix(args.instance)
+        problems = verify_solution(jobs_matrix, rows, cols, total_cost, costs, args.rows_equal,
+                                   args.block_size, args.block_min)
+        for problem in problems:
+            print(f"  {problem}")
+        print("Valid solution" if not problems else "Invalid solution")
+    if args.to_binary:
+        n = jobs_matrix.shape[0] if jobs_matrix is not None else None
+        write_binary_solution(args.to_binary, total_cost, list(zip(rows, cols)), n)
+    if args.to_text:
+        if jobs_matrix is None:
+            parser.error("--to-text needs the instance for the per-line costs")
+        write_solution(args.to_text, total_cost, zip(rows, cols, jobs_matrix[rows, cols]))
+    return 0 if jobs_matrix is None or not problems else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,58 @@
+'''
+Minimum weight full matching απευθείας από τον NumPy πίνακα κόστους, χωρίς networkx γράφο.
+
+Χωρίς κλάδεμα λύνεται με scipy.optimize.linear_sum_assignment πάνω στον πυκνό πίνακα.
+Με threshold (κόστη πάνω από αυτό αφαιρούνται) ή forbidden (boolean πίνακας με τις
+απαγορευμένες αναθέσεις) φτιάχνεται sparse biadjacency matrix και λύνεται με
+scipy.sparse.csgraph.min_weight_full_bipartite_matching.
+'''
+
+import numpy as np
+
+import _paths
+from opsearch.instrument import traced, current
+
+
+def biadjacency_matrix(cost_matrix, threshold=None, forbidden=None):
+    '''
+    CSR πίνακας με μόνο τις επιτρεπτές ακμές. Τα κόστη μετατοπίζονται ώστε να είναι >= 1,
+    γιατί το scipy αγνοεί ακμές με βάρος 0· επιστρέφει (biadjacency, shift).
+    '''
+    import scipy.sparse as sp
+    costs = np.asarray(cost_matrix)
+    keep = np.ones(costs.shape, dtype=bool)
+    if threshold is not None:
+        keep &= costs <= threshold
+    if forbidden is not None:
+        keep &= ~np.asarray(forbidden, dtype=bool)
+    rows, cols = np.nonzero(keep)
+    weights = costs[rows, cols].astype(np.float64)
+    shift = 1.0 - weights.min() if weights.size else 0.0
+    biadjacency = sp.csr_matrix((weights + shift, (rows, cols)), shape=costs.shape)
+    return biadjacency, shift
+
+
+@traced("solve.sparse_matching")
+def sparse_matching(cost_matrix, threshold=None, forbidden=None):
+    '''
+    Επιστρέφει (rows, cols) της βέλτιστης ανάθεσης: κάθε στήλη (job) ανατίθεται σε μία
+    γραμμή όταν οι γραμμές είναι περισσότερες, αλλιώς κάθε γραμμή σε μία στήλη.
+    ValueError αν μετά το κλάδεμα δεν υπάρχει πλήρες matching.
+    '''
+    costs = np.asarray(cost_matrix)
+    # κάθε κλάδος φορτώνει μόνο το κομμάτι του scipy που χρειάζεται (το scipy.optimize είναι βαρύ)
+    if threshold is None and forbidden is None:
+        from scipy.optimize import linear_sum_assignment
+        return linear_sum_assignment(costs)
+    biadjacency, _ = biadjacency_matrix(costs, threshold, forbidden)
+    current().set(edges=int(biadjacency.nnz))
+    from scipy.sparse.csgraph import min_weight_full_bipartite_matching
+    return min_weight_full_bipartite_matching(biadjacency)
+
+
+def matching_cost(cost_matrix, rows, cols):
+    # όπως το lap_solver: ακέραια κόστη αθροίζονται σε int64 (χωρίς overflow), τα υπόλοιπα ως float
+    costs = np.asarray(cost_matrix)[rows, cols]
+    if costs.dtype.kind in "iu":
+        return int(costs.astype(np.int64).sum())
+    return float(costs.sum())
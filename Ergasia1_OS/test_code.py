@@ -1,28 +1,13 @@
-from ortools.linear_solver import pywraplp
+from assignment_model import solve_assignment as solve_assignment_model
+from matrix_loader import load_matrix
+from solution_io import write_solution
 import time
 
 def read_cost_matrix(filename):
-    with open(filename, 'r') as f:
-        data = list(map(int, f.read().split()))
-    n = data[0]
-    costs = data[1:]
-    return [costs[i*n:(i+1)*n] for i in range(n)]
+    return load_matrix(filename)
 
 def solve_assignment(cost_matrix):
-    n = len(cost_matrix)
-    solver = pywraplp.Solver.CreateSolver('CBC')
-    x = [[solver.BoolVar('x[%d][%d]' % (i, j)) for j in range(n)] for i in range(n)]
-    
-    for i in range(n):
-        solver.Add(solver.Sum(x[i][j] for j in range(n)) == 1)
-    for j in range(n):
-        solver.Add(solver.Sum(x[i][j] for i in range(n)) == 1)
-
-    solver.Minimize(solver.Sum(cost_matrix[i][j] * x[i][j] for i in range(n) for j in range(n)))
-    solver.Solve()
-
-    total_cost = solver.Objective().Value()
-    assignments = [(i, j, cost_matrix[i][j]) for i in range(n) for j in range(n) if x[i][j].solution_value() > 0.5]
+    total_cost, assignments, _ = solve_assignment_model(cost_matrix, 'CBC', rows_equal=True)
     return total_cost, assignments
 
 def main():
@@ -39,10 +24,7 @@ def main():
         cost, assignments = solve_assignment(matrix)
         print(f"Cost: {int(cost)}, Time: {time.time() - start:.2f}s")
 
-        with open(file.replace(".txt", "_sol.txt"), "w") as f:
-            f.write(f"{int(cost)}\n")
-            for task, worker, c in assignments:
-                f.write(f"{task},{worker},{c}\n")
+        write_solution(file.replace(".txt", "_sol.txt"), int(cost), assignments)
 
 if __name__ == "__main__":
     main()
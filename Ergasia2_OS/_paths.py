@@ -0,0 +1,9 @@
+# To opsearch (koina ergaleia: IR, portfolio, metriseis ana fasi) einai sti riza tou repo.
+# Kathe module pou to xrisimopoiei kanei prwta `import _paths`, opote douleuei kai otan
+# fortwnetai monaxo tou (p.x. `python presolve.py` i `import spatial` apo to Ergasia2_OS).
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
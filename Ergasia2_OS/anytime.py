@@ -0,0 +1,51 @@
+import sys
+import math
+import time
+
+# Anytime epilysi: kathe fora pou enas solver vriskei kalyteri lysi kalei to on_solution(event),
+# me to event ena dict
+#   {'day', 'time', 'objective', 'bound', 'gap', 'active_trucks'}
+# (CP-SAT: CpSolverSolutionCallback, Gurobi: MIPSOL callback, ufl_burrito: branch and bound).
+# Otan o solver stamataei se orio (xronos / gap) xwris apodeiksi, kratietai i kalyteri lysi
+# kai typwnetai mazi me to anw fragma, anti gia "No optimal solution found".
+
+# o Gurobi dinei 1e100 gia "den yparxei akoma fragma"
+INFINITE_BOUND = 1e30
+
+def relative_gap(objective, bound):
+    return abs(bound - objective) / max(abs(objective), 1e-9)
+
+
+def proven(objective, bound, step=0.0):
+    # me akeraia kerdi (step = 1, vlepe BurritoInstance.profit_step) i lysi einai veltisti otan
+    # to fragma den xwraei +step, alliws otan to fragma den ksepernaei to objective (me anoxi)
+    if step > 0:
+        return bound < objective + step - 1e-6
+    return bound - objective <= max(1e-6, 1e-9 * abs(objective))
+
+
+def incumbent_event(day, start, objective, bound, active_trucks):
+    if abs(bound) >= INFINITE_BOUND:
+        bound = math.copysign(math.inf, bound)
+    return {
+        'day': day,
+        'time': time.time() - start,
+        'objective': objective + 0.0,     # oxi -0.0
+        'bound': bound,
+        'gap': relative_gap(objective, bound),
+        'active_trucks': list(active_trucks),
+    }
+
+
+def print_incumbent(event, file=None):
+    # apli katanalwtis gia to --progress tou run_scenarios. Grafei sto stderr (oxi sto stdout,
+    # pou to solve_day kratei gia tin teliki anafora), wste kathe incumbent na fainetai amesws
+    bound = f"bound €{event['bound']:.2f}, gap {event['gap']:.2%}" if math.isfinite(event['bound']) else 'no bound yet'
+    print(f"  [day {event['day']}, {event['time']:.3f}s] incumbent €{event['objective']:.2f}, {bound}",
+          file=file or sys.stderr, flush=True)
+
+
+def bound_line(objective, bound):
+    if abs(bound) >= INFINITE_BOUND:
+        return 'Upper bound: none yet (not proven optimal)'
+    return f'Upper bound: €{bound:.2f} (not proven optimal, gap {relative_gap(objective, bound):.2%})'
@@ -0,0 +1,140 @@
+import numpy as np
+from preprocess import BurritoInstance
+
+import _paths
+from opsearch import ir
+from opsearch.instrument import traced, current
+
+# To modelo twn burritos mia fora, ws ir.Problem (kind 'facility'), panw sto apotelesma
+# tou presolve:
+#   metavlites: x gia kathe zeygos pou emeine (seira pre.pairs), meta y gia kathe truck (pre.trucks)
+#   max  sum w_p x_p - truck_cost * sum y_t
+#   kathe demand:  sum x <= 1
+#   linking:       'pair' x_p - y_t <= 0,  'aggregated' sum x - |D_t| y_t <= 0,
+#                  None: kanena (o caller prosthetei implications / indicators)
+#   ta fixed open trucks exoun lb = 1
+# To cpsat_burrito / gurobi_burrito to pernoun apo to ir.to_cpsat / ir.to_gurobi, kai to
+# ir.solve(problem, 'NATIVE') to lynei me to ufl_burrito.
+
+
+@traced('build.ir')
+def burrito_problem(inst, pre, linking='pair'):
+    import scipy.sparse as sp
+    n_x, n_y = pre.pairs.size, pre.trucks.size
+    w = inst.pair_coefficients()[pre.pairs].astype(np.float64)
+    c = np.concatenate([w, np.full(n_y, -float(inst.truck_cost))])
+
+    # mia grammi ana demand pou exei zeygi
+    ptr = pre.demand_slices()
+    has_pairs = np.diff(ptr) > 0
+    demand_row = np.cumsum(has_pairs) - 1
+    rows = [demand_row[pre.pair_demand]]
+    cols = [np.arange(n_x)]
+    coefficients = [np.ones(n_x)]
+    n_rows = int(has_pairs.sum())
+
+    if linking == 'pair':
+        rows += [n_rows + np.arange(n_x), n_rows + np.arange(n_x)]
+        cols += [np.arange(n_x), n_x + pre.pair_truck]
+        coefficients += [np.ones(n_x), -np.ones(n_x)]
+        n_rows += n_x
+    elif linking == 'aggregated':
+        counts = np.bincount(pre.pair_truck, minlength=n_y)
+        trucks = np.flatnonzero(counts)
+        truck_row = np.full(n_y, -1)
+        truck_row[trucks] = n_rows + np.arange(trucks.size)
+        rows += [truck_row[pre.pair_truck], truck_row[trucks]]
+        cols += [np.arange(n_x), n_x + trucks]
+        coefficients += [np.ones(n_x), -counts[trucks].astype(np.float64)]
+        n_rows += trucks.size
+    elif linking is not None:
+        raise ValueError(f'linking {linking!r} is not linear, use None and add it on the backend model')
+
+    A = sp.csr_matrix((np.concatenate(coefficients), (np.concatenate(rows), np.concatenate(cols))), shape=(n_rows, n_x + n_y))
+    lower = np.full(n_rows, -np.inf)
+    upper = np.concatenate([np.ones(int(has_pairs.sum())), np.zeros(n_rows - int(has_pairs.sum()))])
+    lb = np.concatenate([np.zeros(n_x), pre.fixed_open[pre.trucks].astype(np.float64)])
+
+    data = {
+        'demand_names': inst.demand_names.astype(str), 'truck_names': inst.truck_names[pre.trucks].astype(str),
+        'pair_demand': pre.pair_demand, 'pair_truck': pre.pair_truck, 'pair_units': inst.pair_units[pre.pairs],
+        'price': inst.price, 'ingredient_cost': inst.ingredient_cost, 'truck_cost': inst.truck_cost,
+    }
+    problem = ir.Problem(c, A, lower, upper, lb=lb, sense='max', kind='facility', data=data)
+    current().set(linking=linking, **problem.stats())
+    return problem
+
+
+def reduced_instance(problem):
+    # BurritoInstance me mono ta zeygi / trucks tou problem (deiktes idioi me ta x / y)
+    data = problem.data
+    problem_data = {'burrito_price': [float(data['price'])], 'ingredient_cost': [float(data['ingredient_cost'])],
+                    'truck_cost': [float(data['truck_cost'])]}
+    return BurritoInstance.from_arrays(data['demand_names'], data['truck_names'], data['pair_demand'],
+                                       data['pair_truck'], data['pair_units'], problem_data)
+
+
+def _native_facility(problem, time_limit=None, threads=None, gap_limit=None, hint=None):
+    # native gia to ir.solve: local search + dual ascent + branch and bound tou ufl_burrito
+    from ufl_burrito import UFLSearch
+
+    inst = reduced_instance(problem)
+    n_x = inst.n_pairs
+    fixed_open = problem.lb[n_x:] > 0.5
+    search = UFLSearch(inst)
+    incumbent = None
+    if hint is not None:
+        start = fixed_open.copy()
+        indices, values = hint
+        trucks = np.asarray(indices) - n_x
+        start[trucks[(trucks >= 0) & (np.asarray(values) > 0.5)]] = True
+        incumbent = search.local_search(start, fixed_open)
+    profit, open_trucks, bound, optimal, _ = search.branch_and_bound(time_limit, incumbent, gap_limit=gap_limit,
+                                                                     fixed_open=fixed_open)
+    values = np.concatenate([search.selection(open_trucks), open_trucks]).astype(np.float64)
+    return ('OPTIMAL' if optimal else 'FEASIBLE'), bound, profit, values
+
+
+ir.register_native('facility', _native_facility)
+
+
+def portfolio_solver(day, scenario=None, threads=1, time_limit=None, backends=('CPSAT', 'GUROBI', 'NATIVE'),
+                     gap_limit=None, log_path=None):
+    # ola ta backends parallila (opsearch.portfolio), kerdizei to prwto pou apodeiknyei to veltisto;
+    # an ola ftasoun to orio xronou, kratietai to kalytero incumbent
+    from opsearch import portfolio
+    from preprocess import load_instance
+    from presolve import presolve
+    from read_dataset import SCENARIO
+    from anytime import proven, bound_line
+
+    inst = load_instance(day, scenario or SCENARIO)
+    pre = presolve(inst)
+    problem = burrito_problem(inst, pre)
+    result = portfolio.race(problem, backends, time_limit, threads, gap_limit,
+                            log_path=log_path or portfolio.DEFAULT_LOG)
+
+    print(f'\nDay {day}')
+    for backend, outcome in result['results'].items():
+        details = f", €{outcome['objective']:.2f} in {outcome['time']:.4f} sec" if outcome.get('objective') is not None else ''
+        print(f"  {backend}: {outcome['status']}{details}")
+    if result['values'] is None:
+        print('No solution found.')
+        return 0
+    profit = result['objective']
+    print(f'Profit: €{profit:.2f}')
+    print(f"Total Time (Portfolio, {result['backend']}): {result['time']:.4f}")
+    if result['best_bound'] is not None and not proven(profit, result['best_bound'], inst.profit_step()):
+        print(bound_line(profit, result['best_bound']))
+    print(pre.describe())
+
+    values = result['values'] > 0.5
+    selected, open_trucks = pre.expand(values[:pre.pairs.size], values[pre.pairs.size:])
+    summary = inst.summary(selected, open_trucks)
+    print('Active trucks:', summary['active_trucks'])
+
+    print(f'Total units sold: {summary["total_units"]}')
+    print(f'Revenue: €{summary["revenue"]:.2f}')
+    print(f'Ingredient costs: €{summary["ingredient_costs"]:.2f}')
+    print(f'Truck costs: €{summary["truck_costs"]:.2f}')
+    return profit
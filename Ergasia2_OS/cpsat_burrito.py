@@ -1,115 +1,122 @@
-from ortools.sat.python import cp_model
-from read_dataset import load_data
-import pandas as pd
+from preprocess import load_instance
+from read_dataset import SCENARIO
+from presolve import presolve, no_presolve
+from burrito_model import burrito_problem, ir
+from anytime import incumbent_event, proven, bound_line
+import _paths
+from opsearch.instrument import span, gap
+import numpy as np
 import time
 
-def cpsat_solver(day):
-    demand_nodes, truck_assignments, problem_data = load_data(day)
-    model = cp_model.CpModel()
 
-    #parametroi
-    price = problem_data['burrito_price'][0]
-    cost = problem_data['ingredient_cost'][0]
-    truck_cost = problem_data['truck_cost'][0]
-
-    demands = demand_nodes['index'].unique()
-    trucks = truck_assignments['truck_node_index'].unique()
-    
-    feasible_assignments = truck_assignments[truck_assignments['scaled_demand'] > 0]
-
-    #boolean gia na kserw an h kantina einai active h oxi 
-    truck_active = {}
-    for truck in trucks:
-        truck_active[truck] = model.NewBoolVar(f"truck_{truck}")
-
-    #boolean gia na kserw an h syndesi demand kai kantina einai ok
-    assignments = {} 
-    for _, row in feasible_assignments.iterrows():
-        demand = row['demand_node_index']
-        truck = row['truck_node_index']
-        var = model.NewBoolVar(f'assign_{demand}_{truck}')
-        assignments[(demand, truck)] = var
-
-    #kathe demand kalyptetai mono apo mia kantina
-    for demand in demands:
-        relevant_assignments = []
-        for (d, t), var in assignments.items():
-            if d == demand:
-                relevant_assignments.append(var)
-
-        if relevant_assignments:
-            model.Add(sum(relevant_assignments) <= 1)
-
-    #elegxos gia kantina active or not
-    for (d, t), var in assignments.items():
-        model.Add(var <= truck_active[t])
-
-    # Ypologizoume posa burritos tha poulithoun synolika,
-    # vlepontas poia assignments ginontai kai posi zitisi exoun
-    total_units = 0 
-
-    for (demand, truck), var in assignments.items():
-        row = feasible_assignments[
-            (feasible_assignments['demand_node_index'] == demand) &
-            (feasible_assignments['truck_node_index'] == truck)
-        ]
-
-        if not row.empty:
-            scaled_demand = row.iloc[0]['scaled_demand']
-            total_units += scaled_demand * var
-
-
-    total_truck_costs = sum(truck_active[t] * truck_cost for t in trucks)
-    
-    # profit = (price - cost)*units - truck_costs
-    model.Maximize((price - cost) * total_units - total_truck_costs)
+def incumbent_callback(day, truck_active, truck_names, on_solution):
+    #kathe kalyteri lysi tou CP-SAT -> on_solution(event) (vlepe anytime.py)
+    #i klasi orizetai edw, wste to ortools na fortwnetai mono otan lynetai kati
+    from ortools.sat.python import cp_model
+
+    class IncumbentCallback(cp_model.CpSolverSolutionCallback):
+
+        def __init__(self):
+            cp_model.CpSolverSolutionCallback.__init__(self)
+            self.start = time.time()
+
+        def on_solution_callback(self):
+            active = [name for var, name in zip(truck_active, truck_names) if self.BooleanValue(var)]
+            on_solution(incumbent_event(day, self.start, self.ObjectiveValue(), self.BestObjectiveBound(), active))
+
+    return IncumbentCallback()
+
+
+def cpsat_solver(day, scenario=SCENARIO, workers=None, time_limit=None, use_presolve=True, linking='pair', rolling=None,
+                 gap_limit=None, on_solution=None):
+    from ortools.sat.python import cp_model
+    inst = load_instance(day, scenario)
+    #presolve: trucks pou den symferei pote / anoigoun panta kai zeygi pou den xreiazontai
+    pre = presolve(inst) if use_presolve else no_presolve(inst)
+    #to modelo mia fora ws IR (burrito_model.py) kai apo ekei se CP-SAT:
+    #prwta ena x ana zeygos pou emeine (seira pre.pairs), meta ena y ana truck (pre.trucks)
+    problem = burrito_problem(inst, pre, None if linking == 'implication' else linking)
+    model, variables = ir.to_cpsat(problem)
+    assignments = variables[:pre.pairs.size]
+    truck_active = variables[pre.pairs.size:]
+
+    #elegxos gia kantina active or not: i implication den einai grammiki, mpainei edw
+    if linking == 'implication':
+        for var, k in zip(assignments, pre.pair_truck):
+            model.AddImplication(var, truck_active[k])
+
+    #rolling horizon: to CP-SAT den allazei modelo metaksy lysewn, ara xtizetai ksana
+    #(grigoro) kai to plano tis proigoumenis meras dinetai ws hint
+    changes = hint = None
+    if rolling is not None:
+        changes = rolling.start(inst)
+        hint = rolling.warm_start(inst)
+        if hint is not None:
+            for var, value in zip(assignments, hint[0][pre.pairs]):
+                model.AddHint(var, bool(value))
+            for var, value in zip(truck_active, hint[1][pre.trucks]):
+                model.AddHint(var, bool(value))
     
     solver = cp_model.CpSolver()
+    #posoi search workers (pyrines) kai xroniko orio ana mera, an dothoun
+    if workers:
+        solver.parameters.num_workers = workers
+    if time_limit is not None:
+        solver.parameters.max_time_in_seconds = time_limit
+    #anytime: stamataei otan (bound - profit) / profit <= gap_limit
+    if gap_limit is not None:
+        solver.parameters.relative_gap_limit = gap_limit
+    callback = None
+    if on_solution is not None:
+        callback = incumbent_callback(day, truck_active, inst.truck_names[pre.trucks], on_solution)
     
     start_time = time.time()
-    status = solver.Solve(model)
+    with span('solve.cpsat', day=day) as solve_span:
+        status = solver.Solve(model, callback)
+        solve_span.set(status=solver.StatusName(status), branches=solver.NumBranches(), conflicts=solver.NumConflicts(),
+                       objective=solver.ObjectiveValue(), bound=solver.BestObjectiveBound(),
+                       gap=gap(solver.ObjectiveValue(), solver.BestObjectiveBound()))
     end_time = time.time()
     total_time = end_time - start_time 
 
-    if status == cp_model.OPTIMAL:
+    #kai me FEASIBLE (orio xronou / gap) kratame tin kalyteri lysi pou vrethike
+    if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
         print(f'\nDay {day}')
         profit = solver.ObjectiveValue()
         print(f'Profit: €{profit:.2f}')
         print(f"Total Time (CP-SAT): {total_time:.4f}")
-
-        active_trucks = [t for t in trucks if solver.Value(truck_active[t])]
-        print('Active trucks:', active_trucks)
-
-        total_units = 0
-        for (d, t), var in assignments.items():
-            if solver.Value(var):
-                units = feasible_assignments[
-                    (feasible_assignments['demand_node_index'] == d) & 
-                    (feasible_assignments['truck_node_index'] == t)
-                ]['scaled_demand'].values[0]
-                total_units += units
-
-        print(f'Total units sold: {total_units}')
-        print(f'Revenue: €{total_units * price:.2f}')
-        print(f'Ingredient costs: €{total_units * cost:.2f}')
-        print(f'Truck costs: €{len(active_trucks) * truck_cost:.2f}')
+        bound = solver.BestObjectiveBound()
+        if not proven(profit, bound, inst.profit_step()):
+            print(bound_line(profit, bound))
+
+        print(pre.describe())
+        print(f'Branches: {solver.NumBranches()}, Conflicts: {solver.NumConflicts()}')
+        if rolling is not None:
+            print(changes.describe() if changes is not None else 'Changes: first day, full build')
+            if hint is not None:
+                print(f"Warm start: previous plan €{hint[2]:.2f}, after local search €{hint[3]:.2f}")
+
+        selected = np.fromiter((solver.BooleanValue(v) for v in assignments), dtype=bool, count=len(assignments))
+        open_trucks = np.fromiter((solver.BooleanValue(v) for v in truck_active), dtype=bool, count=len(truck_active))
+        selected, open_trucks = pre.expand(selected, open_trucks)
+        if rolling is not None:
+            rolling.record(inst, selected, open_trucks)
+        summary = inst.summary(selected, open_trucks)
+        print('Active trucks:', summary['active_trucks'])
+
+        print(f'Total units sold: {summary["total_units"]}')
+        print(f'Revenue: €{summary["revenue"]:.2f}')
+        print(f'Ingredient costs: €{summary["ingredient_costs"]:.2f}')
+        print(f'Truck costs: €{summary["truck_costs"]:.2f}')
 
         return profit
     else:
         print(f'\nDay {day}')
-        print('No optimal solution found.')
+        print('No solution found.' if status == cp_model.UNKNOWN else 'No optimal solution found.')
         return 0  
 
 if __name__ == '__main__':
-    total_profit = 0
-    total_start = time.time() 
-
-    for day in range(1, 6):
-        total_profit += cpsat_solver(day)
-
-    total_end = time.time()
-    total_time = total_end - total_start
-
-    print("\n==============================")
-    print(f"Total Score (5 days): €{total_profit:.2f}")
-    print(f"Total Time (CP-SAT): {total_time:.4f} seconds")
\ No newline at end of file
+    # oi meres lynontai parallila, vlepe run_scenarios.py gia tis epiloges (--days, --jobs, --time-limit)
+    import sys
+    from run_scenarios import main
+    main(sys.argv[1:], solver='cpsat')
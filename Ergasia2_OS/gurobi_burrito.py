@@ -1,105 +1,240 @@
-from gurobipy import Model, GRB, quicksum
-from read_dataset import load_data
-import pandas as pd
+from preprocess import load_instance
+from read_dataset import SCENARIO
+from presolve import presolve, no_presolve
+from burrito_model import burrito_problem, ir
+from rolling import pair_keys
+from anytime import incumbent_event, proven, bound_line
+import _paths
+from opsearch.instrument import span, traced, current
+import numpy as np
 import time
 
-def solve_with_gurobi(day):
-    demand_nodes, truck_assignments, problem_data = load_data(day)
-
-    #parametroi
-    burrito_price = problem_data['burrito_price'][0]
-    ingredient_cost = problem_data['ingredient_cost'][0]
-    truck_cost = problem_data['truck_cost'][0]
-
-    feasible_assignments = truck_assignments[truck_assignments['scaled_demand'] > 0]
-    all_demands = demand_nodes['index'].unique()
-    all_trucks = truck_assignments['truck_node_index'].unique()
-
-    model = Model("burrito_gurobi")
-    model.setParam("OutputFlag", 0) 
-
-    assign = {}
-    for _, row in feasible_assignments.iterrows():
-        d = row['demand_node_index']
-        t = row['truck_node_index']
-        assign[(d, t)] = model.addVar(vtype=GRB.BINARY, name=f"assign_{d}_{t}")
-
-    truck_active = {
-        t: model.addVar(vtype=GRB.BINARY, name=f"truck_{t}")
-        for t in all_trucks
-    }
-
-    model.update()
-
-    # kathe demand = me mia kantina mono
-    for d in all_demands:
-        relevant = [assign[(d, t)] for (dd, t) in assign if dd == d]
-        if relevant:
-            model.addConstr(quicksum(relevant) <= 1)
-
-    #elegxos gia kantina active or not
-    for (d, t), var in assign.items():
-        model.addConstr(var <= truck_active[t])
-
-    #synoliko plithos burritos pou tha diathethoun
-    total_units = quicksum(assign[(d, t)] * feasible_assignments[
-        (feasible_assignments['demand_node_index'] == d) &
-        (feasible_assignments['truck_node_index'] == t)
-    ]['scaled_demand'].values[0] for (d, t) in assign)
-
-    total_truck_costs = quicksum(truck_active[t] * truck_cost for t in all_trucks)
-    
-    # profit = (price - cost)*units - truck_costs
-    profit = (burrito_price - ingredient_cost) * total_units - total_truck_costs
-    model.setObjective(profit, GRB.MAXIMIZE)
+def build_model(inst, pre, linking='pair'):
+    #to modelo mia fora ws IR (burrito_model.py) kai apo ekei sto matrix API tou Gurobi:
+    #prwta ena x ana zeygos pou emeine (seira pre.pairs), meta ena y ana truck (pre.trucks)
+    problem = burrito_problem(inst, pre, None if linking == 'implication' else linking)
+    model, variables = ir.to_gurobi(problem)
+    model.ModelName = "burrito_gurobi"
+    assign = variables[:pre.pairs.size]
+    truck_active = variables[pre.pairs.size:]
+
+    #elegxos gia kantina active or not: i implication (indicator) den einai grammiki, mpainei edw
+    if linking == 'implication':
+        for var, k in zip(assign, pre.pair_truck):
+            model.addGenConstrIndicator(truck_active[k], False, var == 0)
+    return model, assign, truck_active
+
+
+class IncrementalModel:
+    # To idio modelo me to build_model, alla kratietai anamesa stis meres (rolling horizon):
+    # oles oi metavlites / periorismoi exoun kleidi ta onomata twn nodes, kai se kathe nea
+    # mera prostithentai / afairountai mono ta zeygi, trucks kai demands pou allaksan
+    # (rolling.DayChanges). To presolve efarmozetai ws bounds (ub = 0 / lb = 1) anti na
+    # afairei metavlites, wste to modelo na menei idio gia tin epomeni mera.
+
+    def __init__(self, linking='pair'):
+        self.linking = linking
+        self.model = None
+        self.pair_vars = {}        # (demand, truck) -> var
+        self.truck_vars = {}       # truck -> var
+        self.demand_constrs = {}   # demand -> sum <= 1
+        self.link_constrs = {}     # (demand, truck) -> constr ('pair' / 'implication'), truck -> constr ('aggregated')
+        self.stats = {}
+
+    @traced('build.gurobi_incremental')
+    def sync(self, inst, pre, changes=None):
+        '''
+        Fernei to modelo sti mera tou inst. Epistrefei (model, assign, truck_active) me ta
+        assign / truck_active sti seira tou preprocess (ola ta zeygi / trucks tou inst).
+        '''
+        from gurobipy import Model, GRB, LinExpr, Column, quicksum
+        keys = pair_keys(inst)
+        w = inst.pair_coefficients()
+        if self.model is None or changes is None:
+            #prwti mera (i xwris diff): olokliro to modelo, ola ws "nea"
+            self.pair_vars, self.truck_vars, self.demand_constrs, self.link_constrs = {}, {}, {}, {}
+            self.model = Model("burrito_gurobi")
+            self.model.setParam("OutputFlag", 0)
+            self.model.ModelSense = GRB.MAXIMIZE
+            pairs_added, pairs_changed = np.arange(inst.n_pairs), np.zeros(0, dtype=np.int64)
+            trucks_added, demands_added = np.arange(inst.n_trucks), np.arange(inst.n_demands)
+            pairs_removed = trucks_removed = demands_removed = []
+        else:
+            pairs_added, pairs_changed = changes.pairs_added, changes.pairs_changed
+            trucks_added, demands_added = changes.trucks_added, changes.demands_added
+            pairs_removed, trucks_removed, demands_removed = changes.pairs_removed, changes.trucks_removed, changes.demands_removed
+        model = self.model
+
+        #afairesi prwta (ta zeygi mazi me tous periorismous tous)
+        for key in pairs_removed:
+            model.remove(self.pair_vars.pop(key))
+            if key in self.link_constrs:
+                model.remove(self.link_constrs.pop(key))
+        for name in trucks_removed:
+            model.remove(self.truck_vars.pop(name))
+            if name in self.link_constrs:
+                model.remove(self.link_constrs.pop(name))
+        for name in demands_removed:
+            model.remove(self.demand_constrs.pop(name))
+
+        for t in trucks_added:
+            name = inst.truck_names[t]
+            self.truck_vars[name] = model.addVar(vtype=GRB.BINARY, name=f"truck_{name}")
+        for d in demands_added:
+            name = inst.demand_names[d]
+            self.demand_constrs[name] = model.addLConstr(LinExpr(), GRB.LESS_EQUAL, 1, name=f"demand_{name}")
+        model.update()
+
+        # kathe neo zeygos mpainei katey8eian sto "kathe demand me mia kantina" (Column)
+        for p in pairs_added:
+            demand, truck = keys[p]
+            self.pair_vars[demand, truck] = model.addVar(vtype=GRB.BINARY, obj=float(w[p]), name=f"assign_{demand}_{truck}",
+                                                         column=Column([1.0], [self.demand_constrs[demand]]))
+        for p in pairs_changed:
+            self.pair_vars[keys[p]].Obj = float(w[p])
+        truck_active = [self.truck_vars[name] for name in inst.truck_names]
+        model.setAttr("Obj", truck_active, [-float(inst.truck_cost)] * len(truck_active))
+        model.update()
+
+        #elegxos gia kantina active or not, mono gia ta nea zeygi (i ta trucks pou allaksan)
+        if self.linking == 'aggregated':
+            touched = set(inst.truck_names[inst.pair_truck[pairs_added]]) | set(inst.truck_names[trucks_added])
+            touched |= {truck for _, truck in pairs_removed if truck in self.truck_vars}
+            for t in range(inst.n_trucks):
+                name = inst.truck_names[t]
+                if name not in touched:
+                    continue
+                if name in self.link_constrs:
+                    model.remove(self.link_constrs.pop(name))
+                relevant = [self.pair_vars[keys[p]] for p in inst.truck_pairs[inst.truck_ptr[t]:inst.truck_ptr[t + 1]]]
+                if relevant:
+                    self.link_constrs[name] = model.addConstr(quicksum(relevant) <= len(relevant) * self.truck_vars[name])
+        else:
+            for p in pairs_added:
+                demand, truck = keys[p]
+                var, truck_var = self.pair_vars[demand, truck], self.truck_vars[truck]
+                if self.linking == 'implication':
+                    self.link_constrs[demand, truck] = model.addGenConstrIndicator(truck_var, False, var == 0)
+                else:
+                    self.link_constrs[demand, truck] = model.addConstr(var <= truck_var)
+
+        #presolve ws bounds
+        assign = [self.pair_vars[key] for key in keys]
+        pair_ub = np.zeros(inst.n_pairs)
+        pair_ub[pre.pairs] = 1
+        truck_ub = np.zeros(inst.n_trucks)
+        truck_ub[pre.trucks] = 1
+        model.setAttr("UB", assign, pair_ub.tolist())
+        model.setAttr("UB", truck_active, truck_ub.tolist())
+        model.setAttr("LB", truck_active, pre.fixed_open.astype(float).tolist())
+        model.update()
+
+        self.stats = {'pairs_added': len(pairs_added), 'pairs_removed': len(pairs_removed),
+                      'pairs_changed': len(pairs_changed), 'trucks_added': len(trucks_added),
+                      'trucks_removed': len(trucks_removed)}
+        current().set(variables=model.NumVars, constraints=model.NumConstrs, nonzeros=model.NumNZs, **self.stats)
+        return model, assign, truck_active
+
+
+def incumbent_callback(day, truck_active, truck_names, on_solution):
+    #MIPSOL: kathe nea kalyteri lysi tou Gurobi -> on_solution(event) (vlepe anytime.py)
+    from gurobipy import GRB
+    start = time.time()
+
+    def callback(model, where):
+        if where == GRB.Callback.MIPSOL:
+            values = model.cbGetSolution(truck_active)
+            active = [name for value, name in zip(values, truck_names) if value > 0.5]
+            on_solution(incumbent_event(day, start, model.cbGet(GRB.Callback.MIPSOL_OBJ),
+                                        model.cbGet(GRB.Callback.MIPSOL_OBJBND), active))
+    return callback
+
+
+def solve_with_gurobi(day, scenario=SCENARIO, threads=None, time_limit=None, use_presolve=True, linking='pair', rolling=None,
+                      gap_limit=None, on_solution=None):
+    from gurobipy import GRB
+    inst = load_instance(day, scenario)
+    #presolve: trucks pou den symferei pote / anoigoun panta kai zeygi pou den xreiazontai
+    pre = presolve(inst) if use_presolve else no_presolve(inst)
+
+    build_start = time.time()
+    if rolling is None:
+        model, assign, truck_active = build_model(inst, pre, linking)
+        mapping = pre
+    else:
+        #rolling horizon: to modelo tis proigoumenis meras allazei mono ekei pou diaferei
+        changes = rolling.start(inst)
+        incremental = rolling.models.get('gurobi')
+        #allo linking = alles periorismoi, ksanaxtizetai apo tin arxi
+        if incremental is None or incremental.linking != linking:
+            incremental = rolling.models['gurobi'] = IncrementalModel(linking)
+        model, assign, truck_active = incremental.sync(inst, pre, changes)
+        mapping = no_presolve(inst)
+        hint = rolling.warm_start(inst)
+        #to plano tis proigoumenis meras ws arxiki lysi
+        if hint is not None:
+            model.setAttr("Start", assign + truck_active, np.concatenate(hint[:2]).astype(float).tolist())
+        else:
+            model.setAttr("Start", assign + truck_active, [GRB.UNDEFINED] * (len(assign) + len(truck_active)))
+    build_time = time.time() - build_start
+
+    #posa threads kai xroniko orio ana mera, an dothoun
+    if threads:
+        model.setParam("Threads", threads)
+    if time_limit is not None:
+        model.setParam("TimeLimit", time_limit)
+    #anytime: stamataei otan (bound - profit) / profit <= gap_limit
+    if gap_limit is not None:
+        model.setParam("MIPGap", gap_limit)
+    callback = None
+    if on_solution is not None:
+        callback = incumbent_callback(day, truck_active, inst.truck_names[mapping.trucks], on_solution)
 
     start_time = time.time()
-    model.optimize()
+    with span('solve.gurobi', day=day) as solve_span:
+        model.optimize(callback)
+        solve_span.set(status=model.status, nodes=model.NodeCount, solutions=model.SolCount,
+                       simplex_iterations=model.IterCount, gap=model.MIPGap if model.SolCount else None)
     end_time = time.time()
     elapsed = end_time - start_time
 
-    if model.status == GRB.OPTIMAL:
+    #kai se orio xronou / gap kratame tin kalyteri lysi pou vrethike (SolCount > 0)
+    if model.status == GRB.OPTIMAL or (model.status in (GRB.TIME_LIMIT, GRB.INTERRUPTED, GRB.SUBOPTIMAL) and model.SolCount > 0):
         print(f"\nDay {day}")
         print(f"Profit: €{model.objVal:.2f}")
         print(f"Total Time (Gurobi): {elapsed:.4f} seconds")
-
-        active_trucks = [t for t in all_trucks if truck_active[t].x > 0.5]
-        print("Active trucks:", active_trucks)
-
-        total_units = 0
-        for (d, t), var in assign.items():
-            if var.x > 0.5:
-                units = feasible_assignments[
-                    (feasible_assignments['demand_node_index'] == d) &
-                    (feasible_assignments['truck_node_index'] == t)
-                ]['scaled_demand'].values[0]
-                total_units += units
-
-        revenue = total_units * burrito_price
-        ingredient_total = total_units * ingredient_cost
-        truck_total = len(active_trucks) * truck_cost
-
-        print(f"Total units sold: {total_units}")
-        print(f"Revenue: €{revenue:.2f}")
-        print(f"Ingredient costs: €{ingredient_total:.2f}")
-        print(f"Truck costs: €{truck_total:.2f}")
+        if not proven(model.objVal, model.ObjBound, inst.profit_step()):
+            print(bound_line(model.objVal, model.ObjBound))
+
+        print(pre.describe())
+        print(f"Nodes: {model.NodeCount:.0f}, Simplex iterations: {model.IterCount:.0f}")
+        if rolling is not None:
+            print(changes.describe() if changes is not None else 'Changes: first day, full build')
+            if hint is not None:
+                print(f"Warm start: previous plan €{hint[2]:.2f}, after local search €{hint[3]:.2f}")
+            print(f"Model build: {build_time:.4f} seconds")
+
+        selected = np.array(model.getAttr("X", assign)) > 0.5
+        open_trucks = np.array(model.getAttr("X", truck_active)) > 0.5
+        selected, open_trucks = mapping.expand(selected, open_trucks)
+        if rolling is not None:
+            rolling.record(inst, selected, open_trucks)
+        summary = inst.summary(selected, open_trucks)
+        print("Active trucks:", summary["active_trucks"])
+
+        print(f"Total units sold: {summary['total_units']}")
+        print(f"Revenue: €{summary['revenue']:.2f}")
+        print(f"Ingredient costs: €{summary['ingredient_costs']:.2f}")
+        print(f"Truck costs: €{summary['truck_costs']:.2f}")
         return model.objVal
     else:
         print(f"\nDay {day}")
-        print("No optimal solution found.")
+        print("No solution found." if model.status == GRB.TIME_LIMIT else "No optimal solution found.")
         return 0
 
 
-if __name__ == "__main__":
-    total_profit = 0
-    total_start = time.time()  
-
-    for day in range(1, 6):
-        total_profit += solve_with_gurobi(day)
-
-    total_end = time.time()
-    total_elapsed = total_end - total_start
-
-    print("\n==============================")
-    print(f"Total Score (5 days): €{total_profit:.2f}")
-    print(f"Total Time (Gurobi): {total_elapsed:.4f} seconds")
+if __name__ == '__main__':
+    # oi meres lynontai parallila, vlepe run_scenarios.py gia tis epiloges (--days, --jobs, --time-limit)
+    import sys
+    from run_scenarios import main
+    main(sys.argv[1:], solver='gurobi')
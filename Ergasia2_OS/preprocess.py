@@ -0,0 +1,107 @@
+import numpy as np
+from read_dataset import load_data, SCENARIO
+import _paths
+from opsearch.instrument import traced, current
+
+# Metatrepei ta DataFrames tou load_data se akeraious deiktes kai NumPy pinakes mia fora,
+# wste oi solvers na ftiaxnoun periorismous kai objective se grammiko xrono
+# (xwris boolean mask ana zeygos demand-truck).
+#
+# Ta feasible zeygi (scaled_demand > 0) einai taksinomimena ana demand, me CSR deiktes:
+# ta zeygi tou demand d einai ta pair_* [demand_ptr[d] : demand_ptr[d + 1]].
+# Antistoixa truck_ptr / truck_pairs dinoun ta zeygi kathe truck.
+
+
+class BurritoInstance:
+
+    def __init__(self, demand_nodes, truck_assignments, problem_data):
+        import pandas as pd
+        self._set_prices(problem_data)
+
+        # onomata me ti seira pou emfanizontai sta CSV, opws ta unique() twn arxikwn solvers
+        self.demand_names = np.asarray(pd.unique(pd.concat([demand_nodes['index'], truck_assignments['demand_node_index']])), dtype=object)
+        self.truck_names = np.asarray(pd.unique(truck_assignments['truck_node_index']), dtype=object)
+
+        feasible = truck_assignments[truck_assignments['scaled_demand'] > 0]
+        demand_ids = pd.Index(self.demand_names).get_indexer(feasible['demand_node_index'])
+        truck_ids = pd.Index(self.truck_names).get_indexer(feasible['truck_node_index'])
+        units = feasible['scaled_demand'].to_numpy(dtype=np.int64)
+        self._set_pairs(demand_ids, truck_ids, units)
+
+    @classmethod
+    def from_arrays(cls, demand_names, truck_names, demand_ids, truck_ids, units, problem_data):
+        # xwris DataFrame zeygwn: ta zeygi ws akeraioi deiktes sta demand_names / truck_names
+        # (p.x. apo to spatial.py, pou ta paragei se chunks)
+        inst = cls.__new__(cls)
+        inst._set_prices(problem_data)
+        inst.demand_names = np.asarray(demand_names, dtype=object)
+        inst.truck_names = np.asarray(truck_names, dtype=object)
+        units = np.asarray(units, dtype=np.int64)
+        feasible = units > 0
+        inst._set_pairs(np.asarray(demand_ids)[feasible], np.asarray(truck_ids)[feasible], units[feasible])
+        return inst
+
+    def _set_prices(self, problem_data):
+        # opws sto CSV, xwris stroggylopoiisi (to ir.to_cpsat klimakwnei ena dekadiko objective)
+        self.price = float(problem_data['burrito_price'][0])
+        self.ingredient_cost = float(problem_data['ingredient_cost'][0])
+        self.truck_cost = float(problem_data['truck_cost'][0])
+        self.margin = self.price - self.ingredient_cost
+
+    def _set_pairs(self, demand_ids, truck_ids, units):
+        order = np.argsort(demand_ids, kind='stable')
+        self.pair_demand = demand_ids[order].astype(np.int64)
+        self.pair_truck = truck_ids[order].astype(np.int64)
+        self.pair_units = units[order]
+        self.demand_ptr = np.zeros(len(self.demand_names) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.pair_demand, minlength=len(self.demand_names)), out=self.demand_ptr[1:])
+
+        self.truck_pairs = np.argsort(self.pair_truck, kind='stable')
+        self.truck_ptr = np.zeros(len(self.truck_names) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.pair_truck, minlength=len(self.truck_names)), out=self.truck_ptr[1:])
+
+    @property
+    def n_demands(self):
+        return len(self.demand_names)
+
+    @property
+    def n_trucks(self):
+        return len(self.truck_names)
+
+    @property
+    def n_pairs(self):
+        return len(self.pair_units)
+
+    def demand_pairs(self, d):
+        return range(self.demand_ptr[d], self.demand_ptr[d + 1])
+
+    def profit_step(self):
+        # ta kerdi einai pollaplasia tou 1 otan margin kai truck_cost einai akeraia, alliws 0
+        integral = self.margin == round(self.margin) and self.truck_cost == round(self.truck_cost)
+        return 1.0 if integral else 0.0
+
+    def pair_coefficients(self):
+        # syntelestis kathe zeygous sto objective: (price - cost) * scaled_demand
+        return self.margin * self.pair_units
+
+    def summary(self, selected, open_trucks):
+        # analysi kerdous gia mia lysi (boolean pinakes ana zeygos kai ana truck)
+        selected = np.asarray(selected, dtype=bool)
+        open_trucks = np.asarray(open_trucks, dtype=bool)
+        total_units = int(self.pair_units[selected].sum())
+        active_trucks = list(self.truck_names[open_trucks])
+        return {
+            'active_trucks': active_trucks,
+            'total_units': total_units,
+            'revenue': total_units * self.price,
+            'ingredient_costs': total_units * self.ingredient_cost,
+            'truck_costs': len(active_trucks) * self.truck_cost,
+            'profit': total_units * self.margin - len(active_trucks) * self.truck_cost,
+        }
+
+
+@traced('load.instance')
+def load_instance(day, scenario=SCENARIO):
+    inst = BurritoInstance(*load_data(day, scenario))
+    current().set(day=day, demands=inst.n_demands, trucks=inst.n_trucks, pairs=inst.n_pairs)
+    return inst
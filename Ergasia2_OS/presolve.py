@@ -0,0 +1,141 @@
+import numpy as np
+import _paths
+from opsearch.instrument import traced, current
+
+# Presolve gia to provlima twn burritos, panw stous pinakes tou preprocess.BurritoInstance.
+# Kathe kanonas krataei toulaxiston mia veltisti lysi, opote to veltisto kerdos den allazei:
+#
+# - drop: truck pou, akoma kai an pairnei ola ta demands tou, den kalyptei to truck_cost
+#   (me to kerdos metrimeno pera apo ta idi anoixta trucks) -> kleisto
+# - fix open: truck pou kerdizei perissotero apo to truck_cost akoma kai an ola ta alla
+#   trucks einai anoixta (kyriarxo) -> anoixto
+# - dominated assignments: zeygos (d, t) otan ena anoixto truck dinei sto d toulaxiston
+#   idio kerdos -> afaireitai
+#
+# Oi kanones epanalamvanontai mexri na min allazei tipota.
+#
+# Linking (syndesi assignment me truck):
+# - 'pair' (default): x_dt <= y_t gia kathe zeygos, i isxyri (disaggregated) morfi
+# - 'aggregated': sum_d x_dt <= |D_t| * y_t, ena constraint ana truck (asthenestero LP, mikrotero modelo)
+# - 'implication': x_dt => y_t (AddImplication sto CP-SAT, indicator sto Gurobi)
+
+LINKING = ('pair', 'aggregated', 'implication')
+
+
+class PresolveResult:
+
+    def __init__(self, inst, pairs, trucks, fixed_open, rounds):
+        self.inst = inst
+        self.pairs = pairs                # deiktes twn zeygwn pou menoun (seira preprocess)
+        self.trucks = trucks              # deiktes twn trucks pou menoun
+        self.fixed_open = fixed_open      # boolean ana truck (olwn), trucks pou menoun anoixta
+        self.rounds = rounds
+        # to truck kathe zeygou pou menei, ws thesi mesa sto self.trucks
+        position = np.full(inst.n_trucks, -1, dtype=np.int64)
+        position[trucks] = np.arange(trucks.size)
+        self.pair_truck = position[inst.pair_truck[pairs]]
+        self.pair_demand = inst.pair_demand[pairs]
+
+    @property
+    def report(self):
+        inst = self.inst
+        return {
+            'trucks_dropped': int(inst.n_trucks - self.trucks.size),
+            'trucks_fixed_open': int(self.fixed_open.sum()),
+            'pairs_removed': int(inst.n_pairs - self.pairs.size),
+            'rounds': self.rounds,
+        }
+
+    def describe(self):
+        r = self.report
+        return (f"Presolve: dropped {r['trucks_dropped']}/{self.inst.n_trucks} trucks, "
+                f"fixed {r['trucks_fixed_open']} open, removed {r['pairs_removed']}/{self.inst.n_pairs} assignments")
+
+    def demand_slices(self):
+        # ta zeygi pou menoun einai akoma taksinomimena ana demand: CSR deiktes
+        ptr = np.zeros(self.inst.n_demands + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.pair_demand, minlength=self.inst.n_demands), out=ptr[1:])
+        return ptr
+
+    def expand(self, selected, open_trucks):
+        # lysi tou meiwmenou modelou -> boolean pinakes tou arxikou (gia to inst.summary)
+        full_selected = np.zeros(self.inst.n_pairs, dtype=bool)
+        full_selected[self.pairs[np.asarray(selected, dtype=bool)]] = True
+        full_open = np.zeros(self.inst.n_trucks, dtype=bool)
+        full_open[self.trucks[np.asarray(open_trucks, dtype=bool)]] = True
+        return full_selected, full_open
+
+
+def _best_two(d, w, n_demands):
+    # megalyteri kai deuteri megalyteri aksia ana demand (0 an den yparxei)
+    order = np.lexsort((-w, d))
+    d_sorted, w_sorted = d[order], w[order]
+    first = np.ones(d_sorted.size, dtype=bool)
+    first[1:] = d_sorted[1:] != d_sorted[:-1]
+    second = np.zeros(d_sorted.size, dtype=bool)
+    second[1:] = ~first[1:] & first[:-1]
+    best1 = np.zeros(n_demands)
+    best2 = np.zeros(n_demands)
+    best1[d_sorted[first]] = w_sorted[first]
+    best2[d_sorted[second]] = w_sorted[second]
+    return best1, best2
+
+
+@traced('presolve')
+def presolve(inst, max_rounds=100):
+    f = float(inst.truck_cost)
+    T, D = inst.n_trucks, inst.n_demands
+    d, t = inst.pair_demand, inst.pair_truck
+    w = inst.pair_coefficients().astype(np.float64)
+
+    alive_pair = w > 0
+    alive_truck = np.ones(T, dtype=bool)
+    fixed_open = np.zeros(T, dtype=bool)
+
+    rounds = 0
+    for rounds in range(1, max_rounds + 1):
+        changed = False
+
+        # kalytero kerdos pou exei idi kathe demand apo ta anoixta (fixed) trucks
+        from_fixed = alive_pair & fixed_open[t]
+        fixed_best = np.zeros(D)
+        np.maximum.at(fixed_best, d[from_fixed], w[from_fixed])
+
+        # dominated assignments
+        dominated = alive_pair & ~fixed_open[t] & (w <= fixed_best[d])
+        if dominated.any():
+            alive_pair &= ~dominated
+            changed = True
+
+        # drop: to megisto epipleon kerdos tou truck den ftanei to truck_cost
+        extra = np.where(alive_pair, np.maximum(0.0, w - fixed_best[d]), 0.0)
+        reach = np.bincount(t, weights=extra, minlength=T)
+        drop = alive_truck & ~fixed_open & (reach <= f)
+        if drop.any():
+            alive_truck &= ~drop
+            alive_pair &= alive_truck[t]
+            changed = True
+
+        # fix open: kerdos tou truck akoma kai me ola ta alla anoixta
+        best1, best2 = _best_two(d[alive_pair], w[alive_pair], D)
+        other = np.where(w >= best1[d], best2[d], best1[d])
+        worst_gain = np.bincount(t, weights=np.where(alive_pair, np.maximum(0.0, w - other), 0.0), minlength=T)
+        fix = alive_truck & ~fixed_open & (worst_gain > f)
+        if fix.any():
+            fixed_open |= fix
+            changed = True
+
+        if not changed:
+            break
+
+    trucks = np.flatnonzero(alive_truck)
+    pairs = np.flatnonzero(alive_pair)
+    current().set(rounds=rounds, trucks=f'{trucks.size}/{T}', pairs=f'{pairs.size}/{inst.n_pairs}',
+                  fixed_open=int(fixed_open.sum()))
+    return PresolveResult(inst, pairs, trucks, fixed_open, rounds)
+
+
+def no_presolve(inst):
+    # to idio apotelesma xwris kamia meiwsi, gia na xtizoun oi solvers me enan tropo
+    return PresolveResult(inst, np.arange(inst.n_pairs), np.arange(inst.n_trucks),
+                          np.zeros(inst.n_trucks, dtype=bool), 0)
@@ -1,7 +1,162 @@
-import pandas as pd
+import os
+import re
+import glob
+import hashlib
+import functools
+import numpy as np
 
-def load_data(day):
-    demand_nodes = pd.read_csv(f'burrito_dataset/scenDE4BD4_round1_day{day}_demand_node_data.csv')
-    truck_assignments = pd.read_csv(f'burrito_dataset/scenDE4BD4_round1_day{day}_demand_truck_data.csv')
-    problem_data = pd.read_csv(f'burrito_dataset/scenDE4BD4_round1_day{day}_problem_data.csv')
-    return demand_nodes, truck_assignments, problem_data
+import _paths
+from opsearch.instrument import traced, current
+
+# Fortwsi twn CSV enos scenario (oles oi meres mazi) me rhta dtypes kai categorical ids.
+# To apotelesma apothikeuetai se .npz (stili-stili) sto burrito_dataset/.cache, me kleidi
+# to hash tou periexomenou twn CSV, wste oi epomenes ektelesis na min ksanadiavazoun CSV.
+# Mesa sti diergasia, ena LRU krataei ta scenarios pou fortwthikan (koino gia CP-SAT / Gurobi).
+
+DATASET_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'burrito_dataset')
+SCENARIO = 'scenDE4BD4_round1'
+CACHE_DIR = '.cache'
+CACHE_VERSION = 2
+
+# pinakas -> {stili: dtype}, 'category' gia ta onomata / ids
+SCHEMA = {
+    'demand_node_data': {'index': 'category', 'name': 'category', 'x': np.float64, 'y': np.float64,
+                         'demand': np.int64},
+    'demand_truck_data': {'demand_node_index': 'category', 'truck_node_index': 'category',
+                          'distance': np.float64, 'scaled_demand': np.int64},
+    'problem_data': {'burrito_price': np.float64, 'ingredient_cost': np.float64, 'truck_cost': np.float64},
+    'truck_node_data': {'index': 'category', 'x': np.float64, 'y': np.float64},
+}
+
+
+def csv_path(scenario, day, table, directory=DATASET_DIR):
+    return os.path.join(directory, f'{scenario}_day{day}_{table}.csv')
+
+
+def scenario_days(scenario=SCENARIO, directory=DATASET_DIR):
+    pattern = re.compile(re.escape(scenario) + r'_day(\d+)_problem_data\.csv$')
+    days = []
+    for path in glob.glob(os.path.join(directory, f'{glob.escape(scenario)}_day*_problem_data.csv')):
+        match = pattern.search(os.path.basename(path))
+        if match:
+            days.append(int(match.group(1)))
+    return sorted(days)
+
+
+def scenario_hash(scenario=SCENARIO, directory=DATASET_DIR):
+    digest = hashlib.sha256(f'{CACHE_VERSION}'.encode())
+    for day in scenario_days(scenario, directory):
+        for table in SCHEMA:
+            path = csv_path(scenario, day, table, directory)
+            digest.update(f'{day}/{table}\n'.encode())
+            if os.path.exists(path):
+                with open(path, 'rb') as file:
+                    digest.update(file.read())
+    return digest.hexdigest()[:16]
+
+
+def read_csv_table(path, table):
+    # rhta dtypes, xwris inference· ta truck_node_data mporei na ksekinane me kenes grammes
+    import pandas as pd
+    dtypes = {column: (dtype if dtype == 'category' else np.dtype(dtype)) for column, dtype in SCHEMA[table].items()}
+    return pd.read_csv(path, dtype=dtypes, skip_blank_lines=True)
+
+
+def _to_arrays(frames):
+    import pandas as pd
+    arrays = {}
+    for day, tables in frames.items():
+        for table, frame in tables.items():
+            for column in frame.columns:
+                key = f'day{day}__{table}__{column}'
+                values = frame[column]
+                if isinstance(values.dtype, pd.CategoricalDtype):
+                    arrays[key + '__codes'] = values.cat.codes.to_numpy()
+                    arrays[key + '__categories'] = np.asarray(values.cat.categories, dtype=str)
+                else:
+                    arrays[key] = values.to_numpy()
+    return arrays
+
+
+def _from_arrays(arrays, days):
+    # to pandas fortwnetai edw (kai sto read_csv_table), oxi sto import tou module
+    import pandas as pd
+    frames = {}
+    for day in days:
+        frames[day] = {}
+        for table, schema in SCHEMA.items():
+            columns = {}
+            for column, dtype in schema.items():
+                key = f'day{day}__{table}__{column}'
+                if dtype == 'category':
+                    if key + '__codes' not in arrays:
+                        break
+                    columns[column] = pd.Categorical.from_codes(arrays[key + '__codes'], arrays[key + '__categories'])
+                elif key in arrays:
+                    columns[column] = arrays[key]
+                else:
+                    break
+            else:
+                frames[day][table] = pd.DataFrame(columns)
+    return frames
+
+
+def _write_cache(path, arrays):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f'{path}.{os.getpid()}.tmp.npz'
+        np.savez(tmp_path, **arrays)
+        os.replace(tmp_path, path)
+    except OSError:
+        # read-only dataset: apla den kratame cache
+        return None
+    return path
+
+
+@functools.lru_cache(maxsize=8)
+@traced('load.scenario')
+def load_scenario(scenario=SCENARIO, directory=DATASET_DIR, cache=True):
+    '''
+    Ola ta days enos scenario: {day: {pinakas: DataFrame}}, me pinakes demand_node_data,
+    demand_truck_data, problem_data kai truck_node_data (an yparxei to CSV).
+    Ta DataFrames einai koina metaksi twn klisewn (LRU), ara den prepei na allazoun.
+    '''
+    days = scenario_days(scenario, directory)
+    if not days:
+        raise FileNotFoundError(f'no days found for scenario {scenario!r} in {directory}')
+
+    path = os.path.join(directory, CACHE_DIR, f'{scenario}_{scenario_hash(scenario, directory)}.npz')
+    current().set(scenario=scenario, days=len(days), cached=bool(cache and os.path.exists(path)))
+    if cache and os.path.exists(path):
+        with np.load(path, allow_pickle=False) as data:
+            return _from_arrays(dict(data), days)
+
+    frames = {}
+    for day in days:
+        frames[day] = {}
+        for table in SCHEMA:
+            table_path = csv_path(scenario, day, table, directory)
+            if os.path.exists(table_path):
+                frames[day][table] = read_csv_table(table_path, table)
+    if cache and _write_cache(path, _to_arrays(frames)):
+        # palia cache tou idiou scenario (allo hash) den xreiazontai pia
+        for old in glob.glob(os.path.join(directory, CACHE_DIR, f'{glob.escape(scenario)}_*.npz')):
+            if old != path and re.fullmatch(re.escape(scenario) + r'_[0-9a-f]{16}\.npz', os.path.basename(old)):
+                os.remove(old)
+    return frames
+
+
+def load_day(day, scenario=SCENARIO, directory=DATASET_DIR):
+    tables = load_scenario(scenario, directory).get(day)
+    if tables is None:
+        raise FileNotFoundError(f'day {day} not found for scenario {scenario!r}')
+    return tables
+
+
+def load_data(day, scenario=SCENARIO, directory=DATASET_DIR):
+    tables = load_day(day, scenario, directory)
+    return tables['demand_node_data'], tables['demand_truck_data'], tables['problem_data']
+
+
+def load_truck_nodes(day, scenario=SCENARIO, directory=DATASET_DIR):
+    return load_day(day, scenario, directory).get('truck_node_data')
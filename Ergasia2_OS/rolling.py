@@ -0,0 +1,116 @@
+import numpy as np
+from ufl_burrito import UFLSearch
+
+# Rolling horizon: oi meres enos scenario lynontai me ti seira kai kathe mera ksekinaei
+# apo to plano tis proigoumenis (anoixta trucks kai anatheseis, me kleidi ta onomata twn
+# nodes, afou oi deiktes allazoun apo mera se mera).
+#
+# - diff_instances: poia demands / trucks / zeygi (demand, truck) prostethikan, fygan i
+#   allaksan syntelesti, wste o solver na allazei mono auta sto modelo
+# - RollingHorizon.hint: to proigoumeno plano panw sta zeygi tis neas meras
+# - RollingHorizon.warm_start: to idio plano veltiwmeno me to local search tou ufl_burrito
+#   (AddHint sto CP-SAT, Start sto Gurobi, arxiki lysi sto ufl_burrito)
+# - RollingHorizon.models: o kathe solver kratei edw oti thelei na ksanaxrisimopoiisei
+
+
+def pair_keys(inst):
+    # (demand name, truck name) gia kathe zeygos, me ti seira tou preprocess
+    import pandas as pd
+    return pd.MultiIndex.from_arrays([inst.demand_names[inst.pair_demand], inst.truck_names[inst.pair_truck]])
+
+
+class DayChanges:
+
+    def __init__(self, previous, inst):
+        import pandas as pd
+        self.previous = previous
+        self.inst = inst
+        keys = pair_keys(inst)
+        previous_keys = pair_keys(previous)
+
+        # gia kathe zeygos tis neas meras: i thesi tou stin proigoumeni (-1 an einai neo)
+        self.pair_previous = previous_keys.get_indexer(keys)
+        new_coefficients = inst.pair_coefficients()
+        old_coefficients = previous.pair_coefficients()
+        known = self.pair_previous >= 0
+        self.pairs_added = np.flatnonzero(~known)
+        self.pairs_changed = np.flatnonzero(known & (new_coefficients != old_coefficients[np.maximum(self.pair_previous, 0)]))
+        self.pairs_removed = list(previous_keys[keys.get_indexer(previous_keys) < 0])
+
+        truck_previous = pd.Index(previous.truck_names).get_indexer(inst.truck_names)
+        self.trucks_added = np.flatnonzero(truck_previous < 0)
+        self.trucks_removed = list(pd.Index(previous.truck_names).difference(pd.Index(inst.truck_names), sort=False))
+        demand_previous = pd.Index(previous.demand_names).get_indexer(inst.demand_names)
+        self.demands_added = np.flatnonzero(demand_previous < 0)
+        self.demands_removed = list(pd.Index(previous.demand_names).difference(pd.Index(inst.demand_names), sort=False))
+        self.truck_cost_changed = inst.truck_cost != previous.truck_cost
+
+    @property
+    def unchanged(self):
+        return not (self.pairs_added.size or self.pairs_changed.size or self.pairs_removed
+                    or self.trucks_added.size or self.trucks_removed
+                    or self.demands_added.size or self.demands_removed or self.truck_cost_changed)
+
+    def describe(self):
+        return (f'Changes: demands +{self.demands_added.size}/-{len(self.demands_removed)}, '
+                f'trucks +{self.trucks_added.size}/-{len(self.trucks_removed)}, '
+                f'assignments +{self.pairs_added.size}/-{len(self.pairs_removed)}/~{self.pairs_changed.size}'
+                + (', truck cost changed' if self.truck_cost_changed else ''))
+
+
+def diff_instances(previous, inst):
+    return DayChanges(previous, inst)
+
+
+class RollingHorizon:
+
+    def __init__(self):
+        self.previous = None            # to BurritoInstance tis proigoumenis meras
+        self.open_names = set()         # onomata twn anoixtwn trucks
+        self.assignment = {}            # demand name -> truck name
+        self.models = {}                # kratimena modela ana solver
+
+    def start(self, inst):
+        # oi allages apo tin proigoumeni mera (None gia tin prwti)
+        if self.previous is None:
+            return None
+        return diff_instances(self.previous, inst)
+
+    def hint(self, inst):
+        '''
+        To proigoumeno plano panw sti nea mera: (selected ana zeygos, open ana truck) i None.
+        Kathe demand krataei tin palia anathesi an to zeygos yparxei kai to truck einai
+        anoixto, alliws pigainei sto kalytero anoixto truck tou (an yparxei).
+        '''
+        if self.previous is None:
+            return None
+        open_trucks = np.fromiter((name in self.open_names for name in inst.truck_names), dtype=bool, count=inst.n_trucks)
+        w = inst.pair_coefficients()
+        selected = np.zeros(inst.n_pairs, dtype=bool)
+        for d in range(inst.n_demands):
+            pairs = [p for p in inst.demand_pairs(d) if open_trucks[inst.pair_truck[p]] and w[p] > 0]
+            if not pairs:
+                continue
+            kept = self.assignment.get(inst.demand_names[d])
+            same = [p for p in pairs if inst.truck_names[inst.pair_truck[p]] == kept]
+            selected[same[0] if same else max(pairs, key=lambda p: w[p])] = True
+        return selected, open_trucks
+
+    def warm_start(self, inst):
+        '''
+        (selected, open_trucks, previous_profit, profit) i None: to hint meta apo local
+        search (add / drop / swap) panw sti nea mera, kai ta kerdi prin kai meta.
+        '''
+        hint = self.hint(inst)
+        if hint is None:
+            return None
+        search = UFLSearch(inst)
+        profit, open_trucks = search.local_search(hint[1])
+        return search.selection(open_trucks), open_trucks, inst.summary(*hint)['profit'], profit
+
+    def record(self, inst, selected, open_trucks):
+        # to plano tis meras pou molis lythike, gia tin epomeni
+        selected = np.asarray(selected, dtype=bool)
+        self.previous = inst
+        self.open_names = set(inst.truck_names[np.asarray(open_trucks, dtype=bool)])
+        self.assignment = dict(zip(inst.demand_names[inst.pair_demand[selected]], inst.truck_names[inst.pair_truck[selected]]))
@@ -0,0 +1,211 @@
+import io
+import os
+import sys
+import time
+import argparse
+import importlib
+import contextlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from read_dataset import SCENARIO, scenario_days, load_scenario
+from presolve import LINKING
+from rolling import RollingHorizon
+from anytime import print_incumbent
+import _paths
+from opsearch.instrument import traced, current
+
+# Parallili epilysi pollwn (scenario, day) me process pool. Oi meres einai anexartites,
+# opote o synolikos xronos plisiazei ti pio argi mera anti gia to athroisma.
+# Oi pyrines moirazontai: --jobs tautoxrones epilyseis x --threads workers/threads i kathe mia.
+#
+#   python run_scenarios.py --solver cpsat --days 1-5 --time-limit 60
+#   python run_scenarios.py --solver gurobi --scenarios scenDE4BD4_round1,scenDE4BD4_round2
+#   python run_scenarios.py --solver gurobi --rolling   (meres me ti seira, warm start)
+#   python run_scenarios.py --solver cpsat --days 5 --time-limit 10 --progress   (kathe incumbent sto stderr, kalyteri lysi sto orio)
+#   python run_scenarios.py --solver portfolio --jobs 1   (ola ta backends se kathe mera)
+
+SOLVERS = {
+    # onoma -> (module, synartisi, onoma parametrou gia pyrines, onoma stin eksodo)
+    'cpsat': ('cpsat_burrito', 'cpsat_solver', 'workers', 'CP-SAT'),
+    'gurobi': ('gurobi_burrito', 'solve_with_gurobi', 'threads', 'Gurobi'),
+    'ufl': ('ufl_burrito', 'ufl_solver', None, 'UFL'),
+    # CP-SAT, Gurobi kai UFL mazi, to prwto pou apodeiknyei kerdizei (opsearch.portfolio)
+    'portfolio': ('burrito_model', 'portfolio_solver', 'threads', 'Portfolio'),
+}
+
+# ta vary packages kathe solver: ta modules tous ta fortwnoun mono otan lynoun (lazy imports)
+BACKENDS = {
+    'cpsat': ('ortools.sat.python.cp_model',),
+    'gurobi': ('gurobipy',),
+    'ufl': (),
+    'portfolio': ('ortools.sat.python.cp_model', 'gurobipy'),
+}
+
+
+def split_cores(tasks, jobs=None, threads=None, cores=None):
+    # posa solves tautoxrona kai posoi pyrines to kathe ena
+    cores = cores or os.cpu_count() or 1
+    jobs = max(1, min(jobs or cores, tasks or 1))
+    threads = threads or max(1, cores // jobs)
+    return jobs, threads
+
+
+def parse_days(text):
+    # "1-5,8" -> [1, 2, 3, 4, 5, 8]
+    days = []
+    for part in text.split(','):
+        if '-' in part:
+            first, last = part.split('-')
+            days.extend(range(int(first), int(last) + 1))
+        elif part.strip():
+            days.append(int(part))
+    return days
+
+
+@traced('load.preload')
+def preload(solver, scenarios=(SCENARIO,)):
+    # import kai fortwsi twn scenarios mia fora ston parent, wste ta forked paidia na ta vroun etoima
+    __import__(SOLVERS[solver][0])
+    for name in BACKENDS[solver]:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            pass
+    for scenario in scenarios:
+        load_scenario(scenario)
+
+
+@traced('run.day')
+def solve_day(solver, scenario, day, threads, time_limit, options=None):
+    module_name, function_name, threads_arg, _ = SOLVERS[solver]
+    current().set(solver=solver, scenario=scenario, day=day, threads=threads)
+    solve = getattr(__import__(module_name), function_name)
+    output = io.StringIO()
+    start = time.perf_counter()
+    # i anafora tou solver kratietai kai typwnetai olokliri, wste na min anakatevontai oi meres·
+    # ta incumbents tou --progress (print_incumbent) pane sto stderr kai fainontai amesws
+    with contextlib.redirect_stdout(output):
+        options = dict(options or {})
+        if threads_arg:
+            options[threads_arg] = threads
+        profit = solve(day, scenario, time_limit=time_limit, **options)
+    return {'scenario': scenario, 'day': day, 'profit': profit,
+            'time': time.perf_counter() - start, 'output': output.getvalue()}
+
+
+def solve_days(solver, scenario, days, threads, time_limit, options=None):
+    # rolling horizon: oi meres enos scenario me ti seira, i kathe mia ksekinaei apo tin
+    # proigoumeni (hint / kratimeno modelo), ara sto idio process
+    options = dict(options or {}, rolling=RollingHorizon())
+    results = []
+    for day in days:
+        # mia mera pou apotygxanei den kratietai sto rolling, i epomeni ksekinaei apo tin teleutaia epityxia
+        try:
+            results.append(solve_day(solver, scenario, day, threads, time_limit, options))
+        except Exception as error:
+            results.append(failed_day(scenario, day, f'{type(error).__name__}: {error}'))
+    return results
+
+
+def failed_day(scenario, day, error):
+    # i mera pou apetyxe anaferetai san apotelesma, wste oi ypoloipes na synexisoun
+    return {'scenario': scenario, 'day': day, 'profit': 0, 'time': 0.0, 'error': error,
+            'output': f'\nDay {day}\nFailed: {error}\n'}
+
+
+def run_scenarios(solver, tasks, jobs=None, threads=None, time_limit=None, options=None, rolling=False):
+    '''
+    Generator: ena apotelesma (dict) gia kathe (scenario, day) molis teleiwsei.
+    Me rolling=True kathe scenario einai mia seira apo meres (parallila mono ta scenarios).
+    '''
+    if rolling:
+        sequences = {}
+        for scenario, day in tasks:
+            sequences.setdefault(scenario, []).append(day)
+        jobs, threads = split_cores(len(sequences), jobs, threads)
+    else:
+        jobs, threads = split_cores(len(tasks), jobs, threads)
+    preload(solver, sorted({scenario for scenario, _ in tasks}))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        if rolling:
+            futures = {executor.submit(solve_days, solver, scenario, days, threads, time_limit, options): (scenario, days)
+                       for scenario, days in sequences.items()}
+            for future in as_completed(futures):
+                scenario, days = futures[future]
+                try:
+                    yield from future.result()
+                except Exception as error:
+                    # to process tis seiras xathike (p.x. crash): oles oi meres tis anaferontai ws failed
+                    yield from (failed_day(scenario, day, f'{type(error).__name__}: {error}') for day in days)
+        else:
+            futures = {executor.submit(solve_day, solver, scenario, day, threads, time_limit, options): (scenario, day)
+                       for scenario, day in tasks}
+            for future in as_completed(futures):
+                try:
+                    yield future.result()
+                except Exception as error:
+                    yield failed_day(*futures[future], f'{type(error).__name__}: {error}')
+
+
+def main(argv=None, solver=None):
+    parser = argparse.ArgumentParser(description='Parallili epilysi burrito scenarios')
+    parser.add_argument('--solver', default=solver or 'cpsat', choices=sorted(SOLVERS))
+    parser.add_argument('--scenarios', default=SCENARIO, help='prefixes xwrismena me koma')
+    parser.add_argument('--days', default=None, help='p.x. 1-5 (default: oles oi meres tou scenario)')
+    parser.add_argument('--jobs', type=int, default=None, help='tautoxrones epilyseis (default: oi pyrines)')
+    parser.add_argument('--threads', type=int, default=None, help='workers / threads ana epilysi')
+    parser.add_argument('--time-limit', type=float, default=None, help='deuterolepta ana mera')
+    parser.add_argument('--no-presolve', action='store_true', help='xwris presolve (cpsat / gurobi)')
+    parser.add_argument('--linking', default=None, choices=LINKING, help='morfi tou x_dt <= y_t (cpsat / gurobi)')
+    parser.add_argument('--gap-limit', type=float, default=None, help='stamataei sto (bound - profit) / profit, p.x. 0.01')
+    parser.add_argument('--progress', action='store_true', help='typwnei kathe kalytero incumbent')
+    parser.add_argument('--rolling', action='store_true', help='oi meres me ti seira, me warm start apo tin proigoumeni')
+    args = parser.parse_args(argv)
+
+    options = {}
+    if args.no_presolve:
+        options['use_presolve'] = False
+    if args.linking:
+        options['linking'] = args.linking
+    if options and args.solver not in ('cpsat', 'gurobi'):
+        parser.error('--no-presolve / --linking apply only to cpsat and gurobi')
+    if args.solver == 'portfolio' and (args.progress or args.rolling):
+        parser.error('--progress / --rolling do not apply to portfolio')
+    if args.gap_limit is not None:
+        options['gap_limit'] = args.gap_limit
+    if args.progress:
+        options['on_solution'] = print_incumbent
+
+    tasks = []
+    for scenario in args.scenarios.split(','):
+        days = parse_days(args.days) if args.days else scenario_days(scenario)
+        tasks.extend((scenario, day) for day in days)
+    n_parallel = len({scenario for scenario, _ in tasks}) if args.rolling else len(tasks)
+    jobs, threads = split_cores(n_parallel, args.jobs, args.threads)
+    name = SOLVERS[args.solver][3]
+    print(f'{len(tasks)} days, {jobs} parallel solves x {threads} threads' + (' (rolling horizon)' if args.rolling else ''))
+
+    total_profit = 0
+    failed = []
+    total_start = time.time()
+    for result in run_scenarios(args.solver, tasks, jobs, threads, args.time_limit, options, args.rolling):
+        total_profit += result['profit']
+        if 'error' in result:
+            failed.append((result['scenario'], result['day']))
+        if len(args.scenarios.split(',')) > 1:
+            print(f"\n[{result['scenario']}]", end='')
+        print(result['output'], end='')
+        print(f"Running total: €{total_profit:.2f}")
+
+    total_end = time.time()
+    total_time = total_end - total_start
+
+    print("\n==============================")
+    print(f"Total Score ({len(tasks)} days): €{total_profit:.2f}")
+    print(f"Total Time ({name}): {total_time:.4f} seconds")
+    if failed:
+        print(f"Failed ({len(failed)} days): " + ', '.join(f'{scenario} day {day}' for scenario, day in failed))
+    return total_profit
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
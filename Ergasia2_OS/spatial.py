@@ -0,0 +1,220 @@
+import os
+import sys
+import argparse
+import numpy as np
+from preprocess import BurritoInstance
+from read_dataset import SCENARIO, DATASET_DIR, csv_path, load_day, read_csv_table
+import _paths
+from opsearch.instrument import traced
+
+# Paragwgi tou pinaka demand_truck_data apo tis syntetagmenes (x, y) twn demand / truck
+# nodes, gia scenarios me xiliades nodes. Ta trucks mpainoun se ena grid me keli iso me
+# tin aktina eksypiretisis, opote gia kathe demand elegxontai mono ta 3x3 gyrw kelia
+# (anti gia ola ta zeygi).
+#
+# - distance: eukleidia apostasi epi detour (ta CSV tou dataset exoun apostasi dromou,
+#   pou einai panta >= tis eukleidias, ara i aktina pou vgainei apo to decay einai asfalis)
+# - scaled_demand = round(demand * decay(distance)), me opoiodipote decay (callable me radius)
+# - ta zeygi vgainoun se chunks apo demands (stream_pairs), eite se CSV eite katey8eian
+#   se BurritoInstance (build_instance) xwris na kratietai olos o pinakas se DataFrame
+#
+#   python spatial.py --day 5 --full 100 --zero 300 --output my_scenario_day5_demand_truck_data.csv
+
+
+class LinearDecay:
+    # olo to demand mexri full, grammika mexri to 0 sto zero. To dataset einai
+    # LinearDecay(100, 300) stis meres 1, 2, 3, 5 kai LinearDecay(80, 150) sti mera 4
+    # (panw stis apostaseis tou demand_truck_data)
+
+    def __init__(self, full=100.0, zero=300.0):
+        self.full = float(full)
+        self.zero = float(zero)
+        self.radius = self.zero
+
+    def __call__(self, distance):
+        return np.clip((self.zero - distance) / (self.zero - self.full), 0.0, 1.0)
+
+
+class ExponentialDecay:
+    # exp(-distance / scale), mideniko meta to cutoff
+
+    def __init__(self, scale=100.0, cutoff=300.0):
+        self.scale = float(scale)
+        self.radius = float(cutoff)
+
+    def __call__(self, distance):
+        return np.where(distance <= self.radius, np.exp(-distance / self.scale), 0.0)
+
+
+DECAYS = {'linear': LinearDecay, 'exponential': ExponentialDecay}
+
+
+def scaled_demand(demand, ratio):
+    return np.round(demand * ratio).astype(np.int64)
+
+
+class GridIndex:
+    '''
+    Ta simeia (x, y) taksinomimena ana keli tetragwnou grid. Ena query aktinas r <= cell
+    koitaei mono ta 9 kelia gyrw apo kathe simeio.
+    '''
+
+    def __init__(self, x, y, cell):
+        self.x = np.asarray(x, dtype=np.float64)
+        self.y = np.asarray(y, dtype=np.float64)
+        self.cell = float(cell)
+        self.x0, self.y0 = (self.x.min(), self.y.min()) if self.x.size else (0.0, 0.0)
+        # +3 gia na xwrane kai ta geitonika kelia eksw apo ta oria (-1 / +1)
+        self.width = int((self.x.max() - self.x0) // self.cell) + 3 if self.x.size else 3
+        keys = self._keys(self.x, self.y)
+        self.order = np.argsort(keys, kind='stable')
+        self.cells, starts = np.unique(keys[self.order], return_index=True)
+        self.starts = starts
+        self.ends = np.append(starts[1:], keys.size)
+
+    def _cell(self, x, y):
+        return (np.floor((x - self.x0) / self.cell).astype(np.int64) + 1,
+                np.floor((y - self.y0) / self.cell).astype(np.int64) + 1)
+
+    def _keys(self, x, y):
+        cx, cy = self._cell(x, y)
+        return cy * self.width + cx
+
+    def query_radius(self, x, y, radius):
+        '''
+        Ola ta zeygi (query, simeio) me apostasi <= radius: (query_ids, point_ids, distance),
+        taksinomimena ana query kai meta ana simeio.
+        '''
+        if radius > self.cell:
+            raise ValueError(f'radius {radius} is larger than the grid cell {self.cell}')
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        if self.cells.size == 0:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty, np.zeros(0)
+        cx, cy = self._cell(x, y)
+        query_parts, point_parts = [], []
+        for dy in (-1, 0, 1):
+            for dx in (-1, 0, 1):
+                keys = (cy + dy) * self.width + (cx + dx)
+                # to keli kathe query (an yparxei) kai to diastima twn simeiwn tou
+                slot = np.minimum(np.searchsorted(self.cells, keys), self.cells.size - 1)
+                queries = np.flatnonzero(self.cells[slot] == keys)
+                start, end = self.starts[slot[queries]], self.ends[slot[queries]]
+                counts = end - start
+                query_parts.append(np.repeat(queries, counts))
+                point_parts.append(self.order[np.repeat(start - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())])
+        query_ids = np.concatenate(query_parts)
+        point_ids = np.concatenate(point_parts)
+        distance = np.hypot(x[query_ids] - self.x[point_ids], y[query_ids] - self.y[point_ids])
+        keep = distance <= radius
+        query_ids, point_ids, distance = query_ids[keep], point_ids[keep], distance[keep]
+        order = np.lexsort((point_ids, query_ids))
+        return query_ids[order], point_ids[order], distance[order]
+
+
+def _pair_chunks(demand_nodes, truck_nodes, decay, chunk_size, detour, keep_zero=False):
+    # (demand_ids, truck_ids, distance, units) ana chunk_size demands, ws akeraioi deiktes
+    radius = decay.radius / detour
+    grid = GridIndex(truck_nodes['x'].to_numpy(), truck_nodes['y'].to_numpy(), radius)
+    x, y = demand_nodes['x'].to_numpy(np.float64), demand_nodes['y'].to_numpy(np.float64)
+    demand = demand_nodes['demand'].to_numpy(np.int64)
+    for start in range(0, len(demand), chunk_size):
+        stop = min(start + chunk_size, len(demand))
+        demand_ids, truck_ids, distance = grid.query_radius(x[start:stop], y[start:stop], radius)
+        demand_ids += start
+        distance *= detour
+        units = scaled_demand(demand[demand_ids], decay(distance))
+        if not keep_zero:
+            positive = units > 0
+            demand_ids, truck_ids, distance, units = demand_ids[positive], truck_ids[positive], distance[positive], units[positive]
+        yield demand_ids, truck_ids, distance, units
+
+
+def stream_pairs(demand_nodes, truck_nodes, decay=None, chunk_size=4096, detour=1.0, keep_zero=False):
+    '''
+    Generator: DataFrames me tis stiles tou demand_truck_data (demand_node_index,
+    truck_node_index, distance, scaled_demand), ena ana chunk_size demands, me ti seira
+    twn demand_nodes. An keep_zero=False ta zeygi me scaled_demand 0 paraleipontai.
+    '''
+    import pandas as pd
+    demand_names = np.asarray(demand_nodes['index'], dtype=object)
+    truck_names = np.asarray(truck_nodes['index'], dtype=object)
+    for demand_ids, truck_ids, distance, units in _pair_chunks(demand_nodes, truck_nodes, decay or LinearDecay(),
+                                                               chunk_size, detour, keep_zero):
+        yield pd.DataFrame({
+            'demand_node_index': demand_names[demand_ids],
+            'truck_node_index': truck_names[truck_ids],
+            'distance': distance,
+            'scaled_demand': units,
+        })
+
+
+@traced('write.pairs')
+def write_pairs(path, demand_nodes, truck_nodes, decay=None, chunk_size=4096, detour=1.0):
+    # to demand_truck_data CSV grammeno chunk-chunk (tmp + replace). Epistrefei to plithos twn zeygwn
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    rows = 0
+    try:
+        with open(tmp_path, 'w', newline='') as file:
+            file.write('demand_node_index,truck_node_index,distance,scaled_demand\n')
+            for chunk in stream_pairs(demand_nodes, truck_nodes, decay, chunk_size, detour):
+                chunk.to_csv(file, header=False, index=False)
+                rows += len(chunk)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return rows
+
+
+@traced('build.spatial_instance')
+def build_instance(demand_nodes, truck_nodes, problem_data, decay=None, chunk_size=4096, detour=1.0):
+    '''
+    BurritoInstance katey8eian apo ta nodes: kathe chunk menei akeraioi deiktes, xwris na
+    ftiaxtei pote olos o pinakas zeygwn me onomata.
+    '''
+    parts = list(_pair_chunks(demand_nodes, truck_nodes, decay or LinearDecay(), chunk_size, detour))
+    demand_ids, truck_ids, _, units = (np.concatenate([part[i] for part in parts]) if parts else np.zeros(0, dtype=np.int64)
+                                       for i in range(4))
+    return BurritoInstance.from_arrays(demand_nodes['index'], truck_nodes['index'], demand_ids, truck_ids, units, problem_data)
+
+
+def load_nodes(day=None, scenario=SCENARIO, directory=DATASET_DIR, demand_csv=None, truck_csv=None):
+    # ta node CSVs: eite mias meras tou dataset eite opoiadipote arxeia me to idio format
+    if demand_csv or truck_csv:
+        return read_csv_table(demand_csv, 'demand_node_data'), read_csv_table(truck_csv, 'truck_node_data')
+    tables = load_day(day, scenario, directory)
+    if 'truck_node_data' not in tables:
+        raise FileNotFoundError(csv_path(scenario, day, 'truck_node_data', directory))
+    return tables['demand_node_data'], tables['truck_node_data']
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='demand_truck_data apo tis syntetagmenes twn nodes')
+    parser.add_argument('--scenario', default=SCENARIO)
+    parser.add_argument('--day', type=int, default=1)
+    parser.add_argument('--demand-csv', default=None, help='demand_node_data CSV (anti gia --day)')
+    parser.add_argument('--truck-csv', default=None, help='truck_node_data CSV (anti gia --day)')
+    parser.add_argument('--decay', default='linear', choices=sorted(DECAYS))
+    parser.add_argument('--full', type=float, default=100.0, help='linear: olo to demand mexri edw')
+    parser.add_argument('--zero', type=float, default=300.0, help='linear: mideniko apo edw')
+    parser.add_argument('--scale', type=float, default=100.0, help='exponential: klimaka')
+    parser.add_argument('--cutoff', type=float, default=300.0, help='exponential: aktina')
+    parser.add_argument('--detour', type=float, default=1.0, help='apostasi = eukleidia * detour')
+    parser.add_argument('--chunk-size', type=int, default=4096)
+    parser.add_argument('--output', required=True)
+    args = parser.parse_args(argv)
+
+    if args.decay == 'linear':
+        decay = LinearDecay(args.full, args.zero)
+    else:
+        decay = ExponentialDecay(args.scale, args.cutoff)
+    demand_nodes, truck_nodes = load_nodes(args.day, args.scenario, demand_csv=args.demand_csv, truck_csv=args.truck_csv)
+    rows = write_pairs(args.output, demand_nodes, truck_nodes, decay, args.chunk_size, args.detour)
+    print(f'{rows} pairs ({len(demand_nodes)} demands x {len(truck_nodes)} trucks) -> {args.output}')
+    return rows
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
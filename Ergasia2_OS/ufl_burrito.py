@@ -0,0 +1,323 @@
+import time
+import numpy as np
+from preprocess import load_instance
+from read_dataset import SCENARIO
+from anytime import incumbent_event, proven, bound_line
+import _paths
+from opsearch.instrument import traced, current, gap
+
+# To provlima twn burritos einai uncapacitated facility location: anoigoume trucks me
+# kostos truck_cost kai kathe demand pigainei sto kalytero anoixto truck (an yparxei)
+# me kerdos (price - cost) * scaled_demand. Edw lynetai xwris MIP/CP solver:
+#
+# - local search me add / drop / swap trucks panw stous pinakes tou preprocess
+# - anw fragma me dual ascent (Erlenkotter): kathe demand d krataei "timi" u_d >= 0 kai
+#       sum_d max(0, w_dt - u_d) <= truck_cost   gia kathe truck t
+#   opote kathe lysi exei kerdos <= sum_d u_d
+# - branch and bound panw sta trucks (anoixto / kleisto) me to idio fragma, gia apodeiksi
+#   veltistotitas
+#
+# Otan ola ta margin * scaled_demand kai to truck_cost einai akeraia, ta kerdi einai akeraia
+# kai enas komvos kovetai otan to fragma tou einai < incumbent + 1. Me dekadikes times
+# (p.x. price 10.35) kovetai mono otan to fragma den ksepernaei to incumbent (me anoxi EPS).
+
+EPS = 1e-9
+
+
+class UFLSearch:
+    # ta zeygi taksinomimena ana demand kai fthinousa aksia w, gia grigori evresi
+    # tou kalyterou kai tou deuterou kalyterou anoixtou truck kathe demand
+
+    def __init__(self, inst):
+        self.inst = inst
+        self.n_demands, self.n_trucks = inst.n_demands, inst.n_trucks
+        self.truck_cost = float(inst.truck_cost)
+        w = inst.pair_coefficients().astype(np.float64)
+        order = np.lexsort((-w, inst.pair_demand))
+        self.order = order
+        self.d = inst.pair_demand[order]
+        self.t = inst.pair_truck[order]
+        self.w = w[order]
+        self.seg_start = inst.demand_ptr[self.d]
+        self.integral = bool(np.all(self.w == np.round(self.w)) and self.truck_cost == round(self.truck_cost))
+
+    def closes(self, bound, profit):
+        # kamia lysi me fragma bound den mporei na einai kalyteri apo to profit
+        if self.integral:
+            return bound < profit + 1 - EPS
+        return bound <= profit + EPS * max(1.0, abs(profit))
+
+    def state(self, open_trucks):
+        # best1 / best2: aksia kalyterou kai deuterou anoixtou truck, arg1: to zeygos tou best1
+        flag = open_trucks[self.t]
+        count = np.cumsum(flag)
+        before = np.where(self.seg_start > 0, count[self.seg_start - 1], 0)
+        rank = np.where(flag, count - before, 0)
+        best1 = np.zeros(self.n_demands)
+        best2 = np.zeros(self.n_demands)
+        arg1 = np.full(self.n_demands, -1, dtype=np.int64)
+        first = np.flatnonzero(rank == 1)
+        second = np.flatnonzero(rank == 2)
+        best1[self.d[first]] = self.w[first]
+        arg1[self.d[first]] = first
+        best2[self.d[second]] = self.w[second]
+        profit = best1.sum() - self.truck_cost * open_trucks.sum()
+        return profit, best1, best2, arg1
+
+    def _pairs_of(self, demands):
+        # oi theseis (stous taksinomimenous pinakes) olwn twn zeygwn kapoiwn demands
+        ptr = self.inst.demand_ptr
+        lengths = ptr[demands + 1] - ptr[demands]
+        offsets = np.repeat(ptr[demands] - np.cumsum(lengths) + lengths, lengths)
+        return offsets + np.arange(lengths.sum())
+
+    def add_gains(self, best1):
+        extra = np.maximum(0.0, self.w - best1[self.d])
+        return np.bincount(self.t, weights=extra, minlength=self.n_trucks) - self.truck_cost
+
+    def drop_gains(self, best1, best2, arg1):
+        served = np.flatnonzero(arg1 >= 0)
+        loss = np.bincount(self.t[arg1[served]], weights=best1[served] - best2[served], minlength=self.n_trucks)
+        return self.truck_cost - loss
+
+    def local_search(self, open_trucks=None, fixed_open=None, fixed_closed=None, max_moves=100000):
+        '''
+        Add / drop / swap mexri topiko veltisto. Ta fixed_* trucks den allazoun.
+        Epistrefei (profit, open_trucks).
+        '''
+        T = self.n_trucks
+        open_trucks = np.zeros(T, dtype=bool) if open_trucks is None else open_trucks.copy()
+        fixed_open = np.zeros(T, dtype=bool) if fixed_open is None else fixed_open
+        fixed_closed = np.zeros(T, dtype=bool) if fixed_closed is None else fixed_closed
+        open_trucks |= fixed_open
+        open_trucks &= ~fixed_closed
+
+        for _ in range(max_moves):
+            profit, best1, best2, arg1 = self.state(open_trucks)
+            add = self.add_gains(best1)
+            add[open_trucks | fixed_closed] = -np.inf
+            drop = self.drop_gains(best1, best2, arg1)
+            drop[~open_trucks | fixed_open] = -np.inf
+            t_add, t_drop = int(add.argmax()), int(drop.argmax())
+            if max(add[t_add], drop[t_drop]) > EPS:
+                if add[t_add] >= drop[t_drop]:
+                    open_trucks[t_add] = True
+                else:
+                    open_trucks[t_drop] = False
+                continue
+
+            # swap: kleinoume ena truck kai anoigoume to kalytero allo. Otan kleinei to t_out
+            # allazei to best1 mono gia ta demands pou eksypiretouse (pane sto best2), ara ta
+            # add gains diorthwnontai mono sta zeygi autwn twn demands
+            add = self.add_gains(best1)
+            add[open_trucks | fixed_closed] = -np.inf
+            server = np.where(arg1 >= 0, self.t[np.maximum(arg1, 0)], -1)
+            by_server = np.argsort(server, kind='stable')
+            server_ptr = np.searchsorted(server[by_server], np.arange(T + 1))
+            improved = False
+            for t_out in np.argsort(-drop):
+                if not np.isfinite(drop[t_out]):
+                    break
+                demands = by_server[server_ptr[t_out]:server_ptr[t_out + 1]]
+                pairs = self._pairs_of(demands)
+                d = self.d[pairs]
+                correction = np.maximum(0.0, self.w[pairs] - best2[d]) - np.maximum(0.0, self.w[pairs] - best1[d])
+                swap_add = add.copy()
+                np.add.at(swap_add, self.t[pairs], correction)
+                swap_add[t_out] = -np.inf
+                t_in = int(swap_add.argmax())
+                if drop[t_out] + swap_add[t_in] > EPS:
+                    open_trucks[t_out] = False
+                    open_trucks[t_in] = True
+                    improved = True
+                    break
+            if not improved:
+                break
+        profit, _, _, _ = self.state(open_trucks)
+        return profit, open_trucks
+
+    def dual_ascent(self, fixed_open=None, fixed_closed=None):
+        '''
+        Erlenkotter dual ascent (se morfi kerdous: ta u_d katevainoun apo to W_d).
+        Epistrefei (bound, u, slack) me bound >= kerdos kathe lysis pou sevetai ta fixed.
+        '''
+        T = self.n_trucks
+        fixed_open = np.zeros(T, dtype=bool) if fixed_open is None else fixed_open
+        fixed_closed = np.zeros(T, dtype=bool) if fixed_closed is None else fixed_closed
+        keep = ~fixed_closed[self.t]
+        d, t, w = self.d[keep], self.t[keep], self.w[keep]
+        ptr = np.zeros(self.n_demands + 1, dtype=np.int64)
+        np.cumsum(np.bincount(d, minlength=self.n_demands), out=ptr[1:])
+
+        # ta anoixta fixed trucks den plirwnontai mesa sto ypoprovlima (slack 0)
+        slack = np.where(fixed_open, 0.0, self.truck_cost)
+        u = np.zeros(self.n_demands)
+        level = np.zeros(self.n_demands, dtype=np.int64)   # posa zeygi exoun w >= u_d
+        active = []
+        for k in range(self.n_demands):
+            a, b = ptr[k], ptr[k + 1]
+            if a == b or w[a] <= 0:
+                continue
+            u[k] = w[a]
+            level[k] = np.searchsorted(-w[a:b], -u[k], side='right')
+            active.append(k)
+        # prwta ta demands me ligotera trucks, opws sto DUALOC
+        active.sort(key=lambda k: ptr[k + 1] - ptr[k])
+
+        changed = True
+        while changed:
+            changed = False
+            for k in active:
+                if u[k] <= EPS:
+                    continue
+                a, b = ptr[k], ptr[k + 1]
+                trucks = t[a:a + level[k]]
+                next_value = w[a + level[k]] if a + level[k] < b else 0.0
+                delta = min(u[k] - next_value, slack[trucks].min())
+                if delta > EPS:
+                    u[k] -= delta
+                    slack[trucks] -= delta
+                    changed = True
+                if u[k] <= next_value + EPS:
+                    u[k] = next_value
+                    level[k] = np.searchsorted(-w[a:b], -u[k] + EPS, side='right')
+        bound = u.sum() - self.truck_cost * fixed_open.sum()
+        slack[fixed_closed] = np.inf
+        return bound, u, slack
+
+    @traced('solve.ufl_branch_and_bound')
+    def branch_and_bound(self, time_limit=None, incumbent=None, max_nodes=None, gap_limit=None, on_improve=None,
+                         fixed_open=None):
+        '''
+        Depth-first branch and bound panw sta trucks. Epistrefei
+        (profit, open_trucks, bound, optimal, nodes). Me gap_limit kovontai kai oi komvoi
+        pou den veltiwnoun to incumbent pano apo gap_limit * |profit|; to on_improve(profit,
+        open_trucks) kaleitai se kathe kalytero incumbent. Ta fixed_open trucks menoun
+        anoixta se olo to dentro (p.x. apo to presolve).
+        '''
+        start = time.time()
+        T = self.n_trucks
+        root_open = np.zeros(T, dtype=bool) if fixed_open is None else np.asarray(fixed_open, dtype=bool)
+        if incumbent is None:
+            incumbent = self.local_search(fixed_open=root_open)
+        best_profit, best_open = incumbent
+        stack = [(root_open.copy(), np.zeros(T, dtype=bool))]
+        nodes = 0
+        open_bounds = []
+        gap_bound = -np.inf      # to megalytero fragma komvou pou kopike mono logw gap_limit
+
+        def pruned(bound):
+            nonlocal gap_bound
+            if self.closes(bound, best_profit):
+                return True
+            if gap_limit is not None and bound - best_profit <= gap_limit * abs(best_profit):
+                gap_bound = max(gap_bound, bound)
+                return True
+            return False
+
+        while stack:
+            if (time_limit is not None and time.time() - start > time_limit) or \
+                    (max_nodes is not None and nodes >= max_nodes):
+                break
+            fixed_open, fixed_closed = stack.pop()
+            nodes += 1
+            bound, _, slack = self.dual_ascent(fixed_open, fixed_closed)
+            if pruned(bound):
+                continue
+
+            # primal apo ta "tight" trucks tou dual kai local search
+            tight = (slack <= EPS) & ~fixed_closed
+            profit, open_trucks = self.local_search(tight, fixed_open, fixed_closed)
+            if profit > best_profit + EPS:
+                best_profit, best_open = profit, open_trucks
+                if on_improve is not None:
+                    on_improve(best_profit, best_open)
+                if pruned(bound):
+                    continue
+
+            free = ~(fixed_open | fixed_closed)
+            if not free.any():
+                continue
+            # branch sto eleythero truck me to mikrotero slack (pio "sfixto" sto dual)
+            branch = int(np.where(free, slack, np.inf).argmin())
+            closed_child = fixed_closed.copy()
+            closed_child[branch] = True
+            open_child = fixed_open.copy()
+            open_child[branch] = True
+            stack.append((fixed_open, closed_child))
+            stack.append((open_child, fixed_closed))
+        else:
+            bound = max(best_profit, gap_bound)
+            current().set(nodes=nodes, objective=best_profit, bound=bound, gap=gap(best_profit, bound))
+            return best_profit, best_open, bound, self.closes(bound, best_profit), nodes
+
+        # diakopi: to fragma einai to megalytero twn komvwn pou emeinan
+        for fixed_open, fixed_closed in stack:
+            open_bounds.append(self.dual_ascent(fixed_open, fixed_closed)[0])
+        bound = max([best_profit, gap_bound] + open_bounds)
+        current().set(nodes=nodes, objective=best_profit, bound=bound, gap=gap(best_profit, bound), stopped=True)
+        return best_profit, best_open, bound, False, nodes
+
+    def selection(self, open_trucks):
+        # boolean ana zeygos (seira tou preprocess) gia ti lysi me ta anoixta trucks
+        _, best1, _, arg1 = self.state(open_trucks)
+        selected = np.zeros(self.inst.n_pairs, dtype=bool)
+        served = np.flatnonzero((arg1 >= 0) & (best1 > 0))
+        selected[self.order[arg1[served]]] = True
+        return selected
+
+
+def ufl_solver(day, scenario=SCENARIO, time_limit=None, exact=True, rolling=None, gap_limit=None, on_solution=None):
+    inst = load_instance(day, scenario)
+    search = UFLSearch(inst)
+    #rolling horizon: ta anoixta trucks tis proigoumenis meras ws arxi tou local search
+    changes = rolling.start(inst) if rolling is not None else None
+
+    start_time = time.time()
+    hint = rolling.warm_start(inst) if rolling is not None else None
+    upper_bound, _, slack = search.dual_ascent()
+    profit, open_trucks = search.local_search(slack <= EPS)
+    if hint is not None and hint[3] > profit:
+        profit, open_trucks = hint[3], hint[1]
+
+    #anytime: kathe kalytero incumbent me to fragma tis rizas (egkyro gia oles tis lyseis)
+    def on_improve(value, trucks):
+        if on_solution is not None:
+            on_solution(incumbent_event(day, start_time, value, upper_bound, inst.truck_names[trucks]))
+    on_improve(profit, open_trucks)
+
+    optimal = proven(profit, upper_bound, inst.profit_step())
+    within_gap = gap_limit is not None and upper_bound - profit <= gap_limit * abs(profit)
+    if exact and not optimal and not within_gap:
+        remaining = None if time_limit is None else max(0.0, time_limit - (time.time() - start_time))
+        profit, open_trucks, upper_bound, optimal, _ = search.branch_and_bound(
+            remaining, (profit, open_trucks), gap_limit=gap_limit, on_improve=on_improve)
+    end_time = time.time()
+    total_time = end_time - start_time
+
+    print(f'\nDay {day}')
+    print(f'Profit: €{profit:.2f}')
+    print(f"Total Time (UFL): {total_time:.4f}")
+    if not optimal:
+        print(bound_line(profit, upper_bound))
+    if rolling is not None:
+        print(changes.describe() if changes is not None else 'Changes: first day, full build')
+        if hint is not None:
+            print(f"Warm start: previous plan €{hint[2]:.2f}, after local search €{hint[3]:.2f}")
+        rolling.record(inst, search.selection(open_trucks), open_trucks)
+
+    summary = inst.summary(search.selection(open_trucks), open_trucks)
+    print('Active trucks:', summary['active_trucks'])
+
+    print(f'Total units sold: {summary["total_units"]}')
+    print(f'Revenue: €{summary["revenue"]:.2f}')
+    print(f'Ingredient costs: €{summary["ingredient_costs"]:.2f}')
+    print(f'Truck costs: €{summary["truck_costs"]:.2f}')
+    return profit
+
+
+if __name__ == '__main__':
+    # oi meres lynontai parallila, vlepe run_scenarios.py gia tis epiloges (--days, --jobs, --time-limit)
+    import sys
+    from run_scenarios import main
+    main(sys.argv[1:], solver='ufl')
@@ -0,0 +1,10 @@
+'''
+Κοινά εργαλεία των δύο εργασιών (Ergasia1_OS, Ergasia2_OS).
+
+- ir: ενδιάμεση αναπαράσταση μοντέλων (πίνακες + CSR) και adapters προς τους solvers
+- instrument: spans ανά φάση (load / build / solve / write), JSONL και Chrome trace
+- portfolio: παράλληλη επίλυση σε πολλά backends, κερδίζει το πρώτο που αποδεικνύει
+- service: μόνιμη διεργασία (asyncio) που λύνει αιτήματα με cache αποτελεσμάτων, και ο client της
+
+Όλα τα entry points των εργασιών τρέχουν και ως `python -m opsearch <command>` (βλ. __main__).
+'''
@@ -0,0 +1,132 @@
+'''
+Ενιαίο CLI για όλα τα entry points των δύο εργασιών:
+
+    python -m opsearch erotima1 --solver LAP
+    python -m opsearch run_scenarios --solver cpsat --days 1-5
+    python -m opsearch service serve
+    python -m opsearch importtime            # έλεγχος του χρόνου import κάθε entry point
+
+Κάθε command τρέχει το αντίστοιχο script όπως το `python erotima1.py`, μέσα στον φάκελο
+της εργασίας του (όπως με το cd του README), οπότε οι σχετικές διαδρομές είναι ως προς αυτόν.
+Το ίδιο το CLI δεν φορτώνει τίποτα πριν διαλέξει command, και τα scripts φορτώνουν
+τα βαριά packages (matplotlib, networkx, pandas, scipy, ortools, gurobipy) μόνο όταν τα χρειαστούν.
+
+Το importtime τρέχει `python -X importtime -c "import <module>"` για κάθε command και
+αποτυγχάνει (exit 1) όταν ένα import ξεπερνά το budget του ή φορτώνει κάποιο βαρύ package.
+'''
+
+import os
+import sys
+import runpy
+import argparse
+import subprocess
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ERGASIA1_DIR = os.path.join(ROOT_DIR, "Ergasia1_OS")
+ERGASIA2_DIR = os.path.join(ROOT_DIR, "Ergasia2_OS")
+
+# command -> (φάκελος, module, περιγραφή, budget του import σε ms)
+# κάθε budget είναι περίπου 2.5x ο μετρημένος χρόνος (ζεστό cache), ώστε ένα import που αργεί αισθητά
+# να αποτυγχάνει· σε πιο αργά μηχανήματα / CI τα budgets μεγαλώνουν με --scale ή OPSEARCH_IMPORT_SCALE
+COMMANDS = {
+    "erotima1": (ERGASIA1_DIR, "erotima1", "ανάθεση (SCIP, CBC, LAP, AUCTION)", 300),
+    "erotima2": (ERGASIA1_DIR, "erotima2", "σύγκριση OR-Tools / Hungarian", 300),
+    "erotima3": (ERGASIA1_DIR, "erotima3", "ανάθεση με blocks (SCIP, CBC, LAGRANGE, PORTFOLIO)", 350),
+    "er3_test": (ERGASIA1_DIR, "er3_test", "erotima3 με CBC και SCIP", 350),
+    "hungarian": (ERGASIA1_DIR, "hungarian", "Hungarian / sparse matching και σχεδίαση", 300),
+    "batch": (ERGASIA1_DIR, "batch", "παράλληλη επίλυση instances", 120),
+    "benchmark": (ERGASIA1_DIR, "benchmark", "benchmark των solvers", 120),
+    "generator": (ERGASIA1_DIR, "generator", "συνθετικά instances", 300),
+    "out_of_core": (ERGASIA1_DIR, "out_of_core", "ανάθεση για πίνακες εκτός μνήμης (auction)", 300),
+    "solution_io": (ERGASIA1_DIR, "solution_io", "έλεγχος / μετατροπή λύσεων", 300),
+    "cpsat_burrito": (ERGASIA2_DIR, "cpsat_burrito", "burritos με CP-SAT", 350),
+    "gurobi_burrito": (ERGASIA2_DIR, "gurobi_burrito", "burritos με Gurobi", 350),
+    "ufl_burrito": (ERGASIA2_DIR, "ufl_burrito", "burritos με τον εξειδικευμένο solver", 300),
+    "run_scenarios": (ERGASIA2_DIR, "run_scenarios", "παράλληλα scenarios / μέρες", 400),
+    "spatial": (ERGASIA2_DIR, "spatial", "ζεύγη demand–truck από συντεταγμένες", 350),
+    "service": (ROOT_DIR, "opsearch.service", "solver service και client", 80),
+    "portfolio": (ROOT_DIR, "opsearch.portfolio", "portfolio πάνω σε αποθηκευμένο problem", 350),
+    "instrument": (ROOT_DIR, "opsearch.instrument", "σύνοψη / Chrome trace των spans", 50),
+}
+
+# δεν πρέπει να φορτώνονται στο import κανενός entry point
+HEAVY = ("matplotlib", "networkx", "pandas", "scipy", "ortools", "gurobipy")
+
+
+def run_command(command, argv):
+    directory, module, _, _ = COMMANDS[command]
+    for path in (ROOT_DIR, directory):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+    os.chdir(directory)
+    sys.argv = [module] + list(argv)
+    runpy.run_module(module, run_name="__main__", alter_sys=True)
+
+
+def measure_import(command, repeat=3):
+    '''
+    (χρόνος σε ms, βαριά packages που φορτώθηκαν) για το import του module του command·
+    ο μικρότερος χρόνος από repeat διεργασίες (η πρώτη γράφει και τα .pyc).
+    '''
+    directory, module, _, _ = COMMANDS[command]
+    code = (f"import sys; sys.path[:0] = [{directory!r}, {ROOT_DIR!r}]; import {module}; "
+            f"print(','.join(name for name in {HEAVY!r} if name in sys.modules))")
+    best, heavy = None, []
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=directory,
+                                capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"import {module} failed:\n{result.stderr.strip().splitlines()[-1]}")
+        for line in result.stderr.splitlines():
+            # "import time: self [us] | cumulative | imported package"
+            fields = line.split("|")
+            if line.startswith("import time:") and len(fields) == 3 and fields[2].strip() == module:
+                milliseconds = int(fields[1]) / 1000
+                best = milliseconds if best is None else min(best, milliseconds)
+        heavy = [name for name in result.stdout.strip().split(",") if name]
+    return best, heavy
+
+
+def import_budget(commands=None, repeat=3, scale=1.0):
+    print(f"{'command':<16} {'import ms':>10} {'budget ms':>10}  heavy")
+    failures = 0
+    for command in commands or COMMANDS:
+        milliseconds, heavy = measure_import(command, repeat)
+        budget = COMMANDS[command][3] * scale
+        failed = milliseconds > budget or heavy
+        failures += bool(failed)
+        print(f"{command:<16} {milliseconds:>10.1f} {budget:>10.0f}  {','.join(heavy) or '-'}"
+              + ("  FAIL" if failed else ""))
+    print("OK" if not failures else f"{failures} commands over budget")
+    return 1 if failures else 0
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    # τα ορίσματα μετά το command περνάνε αυτούσια στο script
+    if argv and argv[0] in COMMANDS:
+        return run_command(argv[0], argv[1:])
+
+    parser = argparse.ArgumentParser(prog="python -m opsearch", description="Entry points των δύο εργασιών",
+                                     formatter_class=argparse.RawDescriptionHelpFormatter,
+                                     epilog="commands:\n" + "\n".join(
+                                         f"  {name:<16} {description}" for name, (_, _, description, _) in COMMANDS.items()))
+    commands = parser.add_subparsers(dest="command", metavar="command")
+    budget = commands.add_parser("importtime", help="χρόνος import κάθε entry point απέναντι στο budget του")
+    budget.add_argument("commands", nargs="*", help="default: όλα")
+    budget.add_argument("--repeat", type=int, default=3)
+    budget.add_argument("--scale", type=float, default=float(os.environ.get("OPSEARCH_IMPORT_SCALE", "1")),
+                        help="πολλαπλασιάζει τα budgets (πιο αργά μηχανήματα, default OPSEARCH_IMPORT_SCALE ή 1)")
+    args = parser.parse_args(argv)
+
+    if args.command == "importtime":
+        unknown = sorted(set(args.commands) - set(COMMANDS))
+        if unknown:
+            parser.error(f"unknown commands: {', '.join(unknown)}")
+        return import_budget(args.commands, args.repeat, args.scale)
+    parser.print_help()
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,297 @@
+'''
+Μετρήσεις ανά φάση (load / presolve / build / solve / write) για όλους τους solvers.
+
+    with span("build.ir", kind=problem.kind) as s:
+        ...
+        s.set(**problem.stats())          # μεταβλητές, περιορισμοί, nonzeros
+
+    @traced("solve.lap")
+    def lap_solver(...): ...
+
+Κάθε span μετράει με time.perf_counter_ns, ξέρει τον γονιό του (φωλιασμένα spans
+ανά thread) και κρατά ό,τι attrs του δοθούν (μεγέθη μοντέλου, status, nodes,
+branches, conflicts, gap, ...). Όταν η καταγραφή είναι κλειστή, το span() επιστρέφει
+ένα κοινό κενό αντικείμενο και δεν κοστίζει σχεδόν τίποτα.
+
+Ενεργοποίηση με μεταβλητές περιβάλλοντος (περνάνε και στις διεργασίες των pools):
+    OPSEARCH_TRACE=trace.jsonl          κάθε span ως μία γραμμή JSON (append)
+    OPSEARCH_PROFILE=cprofile           ή tracemalloc, στα εξωτερικά spans
+    OPSEARCH_PROFILE_EVERY=10           μόνο ένα στα 10 εξωτερικά spans (δειγματοληψία)
+ή με enable(path, profile, profile_every) μέσα από κώδικα.
+
+Τα spans γράφονται όταν κλείσει το εξωτερικό span της κάθε διεργασίας, άρα και από
+workers που τερματίζουν χωρίς atexit. Το JSONL γίνεται Chrome trace (chrome://tracing,
+Perfetto) ή σύνοψη ανά φάση:
+    python -m opsearch.instrument trace.jsonl --chrome trace.json --summary
+'''
+
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+import functools
+
+PROFILERS = ("cprofile", "tracemalloc")
+PROFILE_TOP = 15
+
+_local = threading.local()
+_lock = threading.Lock()
+_records = []
+_config = {"enabled": False, "path": None, "profile": None, "profile_every": 1, "outer": 0, "next_id": 0}
+
+
+def enable(path=None, profile=None, profile_every=1):
+    # path: JSONL που συμπληρώνεται μετά από κάθε εξωτερικό span (None: μόνο στη μνήμη, βλ. records)
+    if profile is not None and profile not in PROFILERS:
+        raise ValueError(f"profile must be one of {PROFILERS}, not {profile!r}")
+    _config.update(enabled=True, path=path, profile=profile, profile_every=max(1, int(profile_every)))
+
+
+def disable():
+    _config.update(enabled=False, path=None, profile=None)
+
+
+def enabled():
+    return _config["enabled"]
+
+
+def records(clear=False):
+    # τα spans που δεν έχουν γραφτεί σε αρχείο (όλα, όταν δεν δόθηκε path)
+    with _lock:
+        result = list(_records)
+        if clear:
+            _records.clear()
+    return result
+
+
+def _stack():
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+class _NullSpan:
+    # όταν η καταγραφή είναι κλειστή: ίδιο interface, καμία δουλειά
+    __slots__ = ()
+
+    def set(self, **attrs):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Span:
+    __slots__ = ("name", "attrs", "id", "parent", "depth", "start_ns", "wall", "profiler")
+
+    def __init__(self, name, attrs):
+        self.name = name
+        self.attrs = attrs
+        self.profiler = None
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+        return self
+
+    def __enter__(self):
+        stack = _stack()
+        with _lock:
+            _config["next_id"] += 1
+            self.id = f"{os.getpid()}:{_config['next_id']}"
+        self.parent = stack[-1].id if stack else None
+        self.depth = len(stack)
+        if not stack and _config["profile"]:
+            _config["outer"] += 1
+            if (_config["outer"] - 1) % _config["profile_every"] == 0:
+                self.profiler = _start_profiler(_config["profile"])
+        stack.append(self)
+        self.wall = time.time()
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        duration_ns = time.perf_counter_ns() - self.start_ns
+        stack = _stack()
+        stack.pop()
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        if self.profiler is not None:
+            self.attrs.update(_stop_profiler(*self.profiler))
+        record = {
+            "name": self.name, "id": self.id, "parent": self.parent, "depth": self.depth,
+            "pid": os.getpid(), "tid": threading.get_ident(), "wall": self.wall,
+            "start_ns": self.start_ns, "duration_ns": duration_ns, "attrs": self.attrs,
+        }
+        with _lock:
+            _records.append(record)
+        if not stack and _config["path"]:
+            flush()
+        return False
+
+
+def span(name, **attrs):
+    '''
+    Context manager για μία φάση· το name είναι "φάση.λεπτομέρεια" (π.χ. "solve.SCIP")
+    και η φάση γίνεται η κατηγορία στο Chrome trace.
+    '''
+    if not _config["enabled"]:
+        return NULL_SPAN
+    return Span(name, attrs)
+
+
+def traced(name=None, **attrs):
+    # decorator: όλη η κλήση σε ένα span (default όνομα: module.συνάρτηση)
+    def decorate(function):
+        span_name = name or f"{function.__module__}.{function.__qualname__}"
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _config["enabled"]:
+                return function(*args, **kwargs)
+            with Span(span_name, dict(attrs)):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def current():
+    # το ανοιχτό span του thread (ή NULL_SPAN), για attrs από βαθύτερες συναρτήσεις
+    stack = _stack() if _config["enabled"] else None
+    return stack[-1] if stack else NULL_SPAN
+
+
+def gap(objective, bound):
+    # σχετικό gap για τα attrs (None όταν λείπει κάποιο από τα δύο)
+    if objective is None or bound is None or abs(bound) >= 1e30:
+        return None
+    return abs(bound - objective) / max(abs(objective), 1e-9)
+
+
+# ---------------------------------------------------------------- profiling
+def _start_profiler(kind):
+    if kind == "cprofile":
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+        return kind, profiler
+    import tracemalloc
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    return kind, (started, tracemalloc.get_traced_memory()[0])
+
+
+def _stop_profiler(kind, state):
+    if kind == "cprofile":
+        import pstats
+        state.disable()
+        stats = pstats.Stats(state)
+        # χωρίς τα frames του ίδιου του instrument (__exit__ που σταματά τον profiler)
+        rows = sorted(((key, value) for key, value in stats.stats.items() if key[0] != __file__),
+                      key=lambda item: -item[1][3])[:PROFILE_TOP]
+        return {"profile": [
+            {"function": f"{os.path.basename(filename)}:{line}({function})", "calls": calls,
+             "own_s": round(own, 6), "cumulative_s": round(cumulative, 6)}
+            for (filename, line, function), (_, calls, own, cumulative, _) in rows
+        ]}
+    import tracemalloc
+    started, before = state
+    current_bytes, peak = tracemalloc.get_traced_memory()
+    if started:
+        tracemalloc.stop()
+    return {"peak_kb": round(peak / 1024, 1), "allocated_kb": round((current_bytes - before) / 1024, 1)}
+
+
+# ---------------------------------------------------------------- export
+def flush(path=None):
+    # γράφει (append) και αδειάζει τα spans· μία εγγραφή ανά διεργασία κάθε φορά
+    path = path or _config["path"]
+    with _lock:
+        pending = list(_records)
+        _records.clear()
+    if pending and path:
+        write_jsonl(path, pending)
+    return pending
+
+
+def write_jsonl(path, spans):
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    text = "".join(json.dumps(record, default=_json_default) + "\n" for record in spans)
+    with open(path, "a") as file:
+        file.write(text)
+
+
+def _json_default(value):
+    # numpy αριθμοί / πίνακες στα attrs
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    return str(value)
+
+
+def read_jsonl(path):
+    with open(path) as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+
+def chrome_trace(spans):
+    # "complete" events (ph X) σε μικροδευτερόλεπτα· η φάση (πριν την τελεία) ως κατηγορία
+    events = [{
+        "name": record["name"], "cat": record["name"].split(".")[0], "ph": "X",
+        "ts": record["start_ns"] / 1000, "dur": record["duration_ns"] / 1000,
+        "pid": record["pid"], "tid": record["tid"], "args": record["attrs"],
+    } for record in spans]
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def write_chrome_trace(path, spans):
+    with open(path, "w") as file:
+        json.dump(chrome_trace(spans), file, default=_json_default)
+
+
+def summarize(spans):
+    # ανά όνομα: πλήθος, συνολικός / μέσος / μέγιστος χρόνος σε ms, τα πιο ακριβά πρώτα
+    groups = {}
+    for record in spans:
+        groups.setdefault(record["name"], []).append(record["duration_ns"] / 1e6)
+    rows = [{"name": name, "count": len(times), "total_ms": sum(times), "mean_ms": sum(times) / len(times),
+             "max_ms": max(times)} for name, times in groups.items()]
+    return sorted(rows, key=lambda row: -row["total_ms"])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Σύνοψη / μετατροπή των spans (JSONL)")
+    parser.add_argument("trace", help="το αρχείο του OPSEARCH_TRACE")
+    parser.add_argument("--chrome", default=None, help="γράφει Chrome trace (JSON) εδώ")
+    parser.add_argument("--summary", action="store_true", help="χρόνοι ανά span")
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    spans = read_jsonl(args.trace)
+    print(f"{len(spans)} spans from {len({record['pid'] for record in spans})} processes")
+    if args.chrome:
+        write_chrome_trace(args.chrome, spans)
+        print(f"Chrome trace written to {args.chrome}")
+    if args.summary or not args.chrome:
+        print(f"{'span':<32} {'count':>7} {'total ms':>12} {'mean ms':>10} {'max ms':>10}")
+        for row in summarize(spans)[:args.top]:
+            print(f"{row['name']:<32} {row['count']:>7} {row['total_ms']:>12.2f} {row['mean_ms']:>10.2f} {row['max_ms']:>10.2f}")
+
+
+if os.environ.get("OPSEARCH_TRACE"):
+    enable(os.environ["OPSEARCH_TRACE"], os.environ.get("OPSEARCH_PROFILE") or None,
+           os.environ.get("OPSEARCH_PROFILE_EVERY", 1))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,410 @@
+'''
+Ενδιάμεση αναπαράσταση (IR) των μοντέλων και των δύο εργασιών.
+
+Ένα Problem είναι μόνο πίνακες:
+    min / max  c @ x + offset
+    row_lower <= A @ x <= row_upper      (A σε CSR)
+    lb <= x <= ub,  x[integer] ακέραια
+Οι builders (assignment_model.assignment_problem, burrito_model.burrito_problem)
+το φτιάχνουν μία φορά και οι adapters το περνάνε σε κάθε backend:
+
+    SCIP / CBC / άλλοι του ModelBuilder   to_model_builder
+    CPSAT                                 to_cpsat   (ακέραιοι περιορισμοί, δεκαδικό objective κλιμακωμένο)
+    GUROBI                                to_gurobi  (matrix API)
+    NATIVE                                ο native solver του problem.kind (register_native)
+
+Οι adapters επιστρέφουν και τις μεταβλητές του backend, ώστε ο caller να προσθέσει
+ό,τι δεν εκφράζεται με γραμμικές γραμμές (implications, callbacks, hints).
+Κάθε backend φορτώνεται μόνο όταν χρειαστεί. Με save/load το μοντέλο
+κρατιέται σε .npz ανάμεσα σε εκτελέσεις (βλ. cached). Κάθε build / solve είναι ένα
+span του opsearch.instrument (μεγέθη μοντέλου, status, gap, nodes / branches).
+'''
+
+import os
+import hashlib
+import numpy as np
+
+from opsearch.instrument import traced, current, gap
+
+# solvers που δεν υποστηρίζει ο ModelSolverHelper λύνονται μέσω MPModelRequest
+PROTO_SOLVERS = ("CBC",)
+
+# kind -> συνάρτηση(problem, time_limit, threads, gap_limit, hint) -> (status, best_bound, objective, values)
+NATIVE_SOLVERS = {}
+
+
+class Problem:
+
+    def __init__(self, c, A, row_lower, row_upper, lb=None, ub=None, integer=True, sense="min",
+                 offset=0.0, kind=None, data=None):
+        import scipy.sparse as sp
+        self.c = np.asarray(c, dtype=np.float64)
+        n_vars = self.c.size
+        self.A = sp.csr_matrix(A, shape=(len(row_lower), n_vars))
+        self.row_lower = np.asarray(row_lower, dtype=np.float64)
+        self.row_upper = np.asarray(row_upper, dtype=np.float64)
+        self.lb = np.zeros(n_vars) if lb is None else np.asarray(lb, dtype=np.float64)
+        self.ub = np.ones(n_vars) if ub is None else np.asarray(ub, dtype=np.float64)
+        self.integer = np.broadcast_to(np.asarray(integer, dtype=bool), (n_vars,)).copy()
+        if sense not in ("min", "max"):
+            raise ValueError(f"sense must be 'min' or 'max', not {sense!r}")
+        self.sense = sense
+        self.offset = float(offset)
+        # ό,τι χρειάζεται ο native solver του kind (πίνακες, για να σώζονται στο .npz)
+        self.kind = kind
+        self.data = dict(data or {})
+
+    @property
+    def n_vars(self):
+        return self.c.size
+
+    @property
+    def n_rows(self):
+        return self.row_lower.size
+
+    def stats(self):
+        return {"variables": self.n_vars, "constraints": self.n_rows, "nonzeros": int(self.A.nnz),
+                "integer": int(self.integer.sum())}
+
+    def objective(self, values):
+        return float(self.c @ np.asarray(values, dtype=np.float64) + self.offset)
+
+    def is_feasible(self, values, tolerance=1e-6):
+        values = np.asarray(values, dtype=np.float64)
+        activity = self.A @ values
+        integral = np.abs(values[self.integer] - np.round(values[self.integer])) <= tolerance
+        return bool(np.all(values >= self.lb - tolerance) and np.all(values <= self.ub + tolerance)
+                    and np.all(activity >= self.row_lower - tolerance)
+                    and np.all(activity <= self.row_upper + tolerance) and np.all(integral))
+
+    def _arrays(self):
+        arrays = {
+            "c": self.c, "lb": self.lb, "ub": self.ub, "integer": self.integer,
+            "row_lower": self.row_lower, "row_upper": self.row_upper,
+            "A_data": self.A.data, "A_indices": self.A.indices, "A_indptr": self.A.indptr,
+            "meta": np.array([self.sense, self.kind or "", repr(self.offset)]),
+        }
+        for key, value in self.data.items():
+            arrays[f"data__{key}"] = np.asarray(value)
+        return arrays
+
+    def content_hash(self):
+        # ίδιο hash <=> ίδιο μοντέλο (για cache αποτελεσμάτων / μοντέλων)
+        digest = hashlib.sha256()
+        for key, value in sorted(self._arrays().items()):
+            value = np.ascontiguousarray(value)
+            digest.update(f"{key}:{value.dtype.str}:{value.shape}\n".encode())
+            digest.update(value.tobytes())
+        return digest.hexdigest()[:16]
+
+    @traced("write.problem")
+    def save(self, path):
+        tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(tmp_path, **self._arrays())
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    @traced("load.problem")
+    def load(cls, path):
+        import scipy.sparse as sp
+        with np.load(path, allow_pickle=False) as arrays:
+            sense, kind, offset = arrays["meta"].tolist()
+            A = sp.csr_matrix((arrays["A_data"], arrays["A_indices"], arrays["A_indptr"]),
+                              shape=(arrays["row_lower"].size, arrays["c"].size))
+            data = {key[len("data__"):]: arrays[key] for key in arrays.files if key.startswith("data__")}
+            return cls(arrays["c"], A, arrays["row_lower"], arrays["row_upper"], arrays["lb"], arrays["ub"],
+                       arrays["integer"], sense, float(offset), kind or None, data)
+
+
+def cached(path, build, *args, **kwargs):
+    # Problem από το .npz αν υπάρχει, αλλιώς build(*args, **kwargs) και αποθήκευση
+    if path and os.path.exists(path):
+        return Problem.load(path)
+    problem = build(*args, **kwargs)
+    if path:
+        problem.save(path)
+    return problem
+
+
+def register_native(kind, function):
+    NATIVE_SOLVERS[kind] = function
+
+
+def _row_slices(problem):
+    A = problem.A
+    for r in range(problem.n_rows):
+        start, end = A.indptr[r], A.indptr[r + 1]
+        yield r, A.indices[start:end], A.data[start:end]
+
+
+# ---------------------------------------------------------------- ModelBuilder (SCIP, CBC, ...)
+
+@traced("build.model_builder")
+def to_model_builder(problem, hint=None):
+    '''
+    model_builder.Model με τις μεταβλητές 0..n_vars-1 στη σειρά του problem.
+    hint: (indices, values) μιας γνωστής λύσης.
+    '''
+    from ortools.linear_solver.python import model_builder
+
+    current().set(kind=problem.kind, **problem.stats())
+
+    model = model_builder.Model()
+    model.helper.fill_model_from_sparse_data(
+        problem.lb, problem.ub, problem.c, problem.row_lower, problem.row_upper, problem.A,
+    )
+    for k in np.flatnonzero(problem.integer):
+        model.helper.set_var_integrality(int(k), True)
+    if problem.sense == "max":
+        model.helper.set_maximize(True)
+    if problem.offset:
+        model.helper.set_objective_offset(problem.offset)
+    if hint is not None:
+        for k, value in zip(*hint):
+            model.helper.add_hint(int(k), float(value))
+    return model
+
+
+@traced("solve.model_builder")
+def solve_model_builder(model, solver_name="SCIP", time_limit=None):
+    '''
+    Λύνει ένα model_builder.Model: (status, best_bound, objective, values),
+    με values None αν δεν βρέθηκε λύση.
+    '''
+    from ortools.linear_solver import pywraplp, linear_solver_pb2
+    from ortools.linear_solver.python import model_builder_helper
+
+    objective, values = None, None
+    if solver_name.upper() in PROTO_SOLVERS:
+        request = linear_solver_pb2.MPModelRequest(
+            model=model.export_to_proto(),
+            solver_type=getattr(linear_solver_pb2.MPModelRequest, f"{solver_name.upper()}_MIXED_INTEGER_PROGRAMMING"),
+        )
+        if time_limit is not None:
+            request.solver_time_limit_seconds = time_limit
+        response = linear_solver_pb2.MPSolutionResponse()
+        pywraplp.Solver.SolveWithProto(request, response)
+        status = linear_solver_pb2.MPSolverResponseStatus.Name(response.status).replace("MPSOLVER_", "")
+        best_bound = response.best_objective_bound
+        if status in ("OPTIMAL", "FEASIBLE"):
+            objective = response.objective_value
+            values = np.array(response.variable_value)
+    else:
+        solver = model_builder_helper.ModelSolverHelper(solver_name)
+        if time_limit is not None:
+            solver.set_time_limit_in_seconds(time_limit)
+        solver.solve(model.helper)
+        status = solver.status().name
+        best_bound = None
+        if status in ("OPTIMAL", "FEASIBLE"):
+            best_bound = solver.best_objective_bound()
+            objective = solver.objective_value()
+            values = solver.variable_values()
+    current().set(solver=solver_name.upper(), status=status, objective=objective, bound=best_bound,
+                  gap=gap(objective, best_bound))
+    return status, best_bound, objective, values
+
+
+def model_builder_available(solver_name):
+    from ortools.linear_solver import pywraplp
+    from ortools.linear_solver.python import model_builder_helper
+
+    if solver_name.upper() in PROTO_SOLVERS:
+        return pywraplp.Solver.CreateSolver(solver_name) is not None
+    return model_builder_helper.ModelSolverHelper(solver_name).solver_is_supported()
+
+
+# ---------------------------------------------------------------- CP-SAT
+
+# το objective κλιμακώνεται με 10^k, k <= OBJECTIVE_DECIMALS, ώστε να γίνει ακέραιο
+OBJECTIVE_DECIMALS = 6
+
+
+def _objective_scale(values):
+    '''
+    Ο μικρότερος κοινός πολλαπλασιαστής 10^k που κάνει όλους τους συντελεστές ακέραιους
+    (π.χ. 100 για τιμή 10.35), ή None αν δεν υπάρχει μέχρι 10^OBJECTIVE_DECIMALS.
+    '''
+    values = np.asarray(values, dtype=np.float64)
+    for k in range(OBJECTIVE_DECIMALS + 1):
+        scaled = values * 10.0 ** k
+        if np.allclose(scaled, np.round(scaled), rtol=1e-12, atol=1e-6):
+            return 10 ** k
+    return None
+
+
+def _integral(values, what):
+    values = np.asarray(values, dtype=np.float64)
+    finite = values[np.isfinite(values)]
+    if np.any(finite != np.round(finite)):
+        raise ValueError(f"CP-SAT needs integer {what}")
+    return values
+
+
+@traced("build.cpsat")
+def to_cpsat(problem, hint=None):
+    '''
+    (CpModel, variables): BoolVar για τις 0/1 ακέραιες, IntVar για τις υπόλοιπες.
+    Οι συντελεστές και τα όρια των περιορισμών πρέπει να είναι ακέραια. Ένα δεκαδικό
+    objective πολλαπλασιάζεται με 10^k και το scaling_factor του CP-SAT το διαιρεί πίσω,
+    οπότε ObjectiveValue / BestObjectiveBound είναι στις μονάδες του problem.
+    '''
+    from ortools.sat.python import cp_model
+
+    current().set(kind=problem.kind, **problem.stats())
+    if not problem.integer.all():
+        raise ValueError("CP-SAT needs integer variables")
+    c = np.asarray(problem.c, dtype=np.float64)
+    scale = _objective_scale(np.append(c, problem.offset))
+    _integral(problem.A.data, "constraint coefficients")
+    row_lower = _integral(problem.row_lower, "constraint bounds")
+    row_upper = _integral(problem.row_upper, "constraint bounds")
+
+    model = cp_model.CpModel()
+    variables = []
+    for k in range(problem.n_vars):
+        lb, ub = int(problem.lb[k]), int(problem.ub[k])
+        if 0 <= lb and ub <= 1:
+            var = model.NewBoolVar(f"x{k}")
+            if lb == ub:
+                model.Add(var == lb)
+        else:
+            var = model.NewIntVar(lb, ub, f"x{k}")
+        variables.append(var)
+
+    for r, indices, coefficients in _row_slices(problem):
+        if indices.size == 0:
+            continue
+        expr = cp_model.LinearExpr.WeightedSum([variables[k] for k in indices], [int(a) for a in coefficients])
+        lower, upper = row_lower[r], row_upper[r]
+        if lower == upper:
+            model.Add(expr == int(lower))
+        elif np.isfinite(lower) and np.isfinite(upper):
+            model.AddLinearConstraint(expr, int(lower), int(upper))
+        elif np.isfinite(upper):
+            model.Add(expr <= int(upper))
+        elif np.isfinite(lower):
+            model.Add(expr >= int(lower))
+
+    nonzero = np.flatnonzero(c)
+    if scale is None:
+        # χωρίς κοινό δεκαδικό πολλαπλασιαστή: floating point objective του CP-SAT
+        coefficients, offset = [float(a) for a in c[nonzero]], float(problem.offset)
+    else:
+        coefficients = [int(round(a * scale)) for a in c[nonzero]]
+        offset = int(round(problem.offset * scale))
+    objective = cp_model.LinearExpr.WeightedSum([variables[k] for k in nonzero], coefficients)
+    if offset:
+        objective = objective + offset
+    if problem.sense == "max":
+        model.Maximize(objective)
+    else:
+        model.Minimize(objective)
+    if scale is not None and scale != 1:
+        model.Proto().objective.scaling_factor /= scale
+    if hint is not None:
+        for k, value in zip(*hint):
+            model.AddHint(variables[int(k)], int(round(value)))
+    return model, variables
+
+
+@traced("solve.cpsat")
+def _solve_cpsat(problem, time_limit=None, threads=None, gap_limit=None, hint=None):
+    from ortools.sat.python import cp_model
+
+    model, variables = to_cpsat(problem, hint)
+    solver = cp_model.CpSolver()
+    if threads:
+        solver.parameters.num_workers = threads
+    if time_limit is not None:
+        solver.parameters.max_time_in_seconds = time_limit
+    if gap_limit is not None:
+        solver.parameters.relative_gap_limit = gap_limit
+    status = solver.Solve(model)
+    name = solver.StatusName(status)
+    current().set(status=name, branches=solver.NumBranches(), conflicts=solver.NumConflicts(),
+                  objective=solver.ObjectiveValue(), bound=solver.BestObjectiveBound(),
+                  gap=gap(solver.ObjectiveValue(), solver.BestObjectiveBound()))
+    if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        return name, None, None, None
+    values = np.array([solver.Value(var) for var in variables], dtype=np.float64)
+    return name, solver.BestObjectiveBound(), solver.ObjectiveValue(), values
+
+
+# ---------------------------------------------------------------- Gurobi
+
+@traced("build.gurobi")
+def to_gurobi(problem, hint=None):
+    '''
+    (gurobipy.Model, variables) με όλο το μοντέλο μέσω του matrix API (addMVar / addMConstr).
+    Τα variables είναι λίστα από Var, στη σειρά του problem.
+    '''
+    from gurobipy import Model, GRB
+
+    current().set(kind=problem.kind, **problem.stats())
+    model = Model()
+    model.setParam("OutputFlag", 0)
+    binary = problem.integer & (problem.lb >= 0) & (problem.ub <= 1)
+    vtype = np.where(binary, GRB.BINARY, np.where(problem.integer, GRB.INTEGER, GRB.CONTINUOUS))
+    x = model.addMVar(problem.n_vars, lb=problem.lb, ub=problem.ub, obj=problem.c, vtype=vtype)
+    model.ModelSense = GRB.MAXIMIZE if problem.sense == "max" else GRB.MINIMIZE
+    model.ObjCon = problem.offset
+
+    equal = problem.row_lower == problem.row_upper
+    less = ~equal & np.isfinite(problem.row_upper)
+    greater = ~equal & np.isfinite(problem.row_lower)
+    for rows, sense, rhs in ((equal, "=", problem.row_upper), (less, "<", problem.row_upper),
+                             (greater, ">", problem.row_lower)):
+        if rows.any():
+            model.addMConstr(problem.A[rows], x, sense, rhs[rows])
+    model.update()
+    variables = x.tolist()
+    if hint is not None:
+        indices, values = hint
+        model.setAttr("Start", [variables[int(k)] for k in indices], [float(v) for v in values])
+    return model, variables
+
+
+@traced("solve.gurobi")
+def _solve_gurobi(problem, time_limit=None, threads=None, gap_limit=None, hint=None):
+    from gurobipy import GRB
+
+    model, variables = to_gurobi(problem, hint)
+    if threads:
+        model.setParam("Threads", threads)
+    if time_limit is not None:
+        model.setParam("TimeLimit", time_limit)
+    if gap_limit is not None:
+        model.setParam("MIPGap", gap_limit)
+    model.optimize()
+    status = {GRB.OPTIMAL: "OPTIMAL", GRB.TIME_LIMIT: "TIME_LIMIT", GRB.INFEASIBLE: "INFEASIBLE"}.get(model.status, str(model.status))
+    current().set(status=status, nodes=model.NodeCount, solutions=model.SolCount,
+                  gap=model.MIPGap if model.SolCount else None)
+    if model.SolCount == 0:
+        return status, None, None, None
+    if status != "OPTIMAL":
+        status = "FEASIBLE"
+    return status, model.ObjBound, model.ObjVal, np.array(model.getAttr("X", variables))
+
+
+# ---------------------------------------------------------------- κοινή είσοδος
+
+@traced("solve.ir")
+def solve(problem, backend="SCIP", time_limit=None, threads=None, gap_limit=None, hint=None):
+    '''
+    Λύνει το problem στο backend: (status, best_bound, objective, values),
+    με values None αν δεν βρέθηκε λύση. Backends: CPSAT, GUROBI, NATIVE
+    και κάθε όνομα solver του ModelBuilder (SCIP, CBC, ...).
+    '''
+    name = backend.upper()
+    current().set(backend=name, kind=problem.kind)
+    if name in ("CPSAT", "CP-SAT"):
+        return _solve_cpsat(problem, time_limit, threads, gap_limit, hint)
+    if name == "GUROBI":
+        return _solve_gurobi(problem, time_limit, threads, gap_limit, hint)
+    if name == "NATIVE":
+        if problem.kind not in NATIVE_SOLVERS:
+            raise ValueError(f"no native solver registered for {problem.kind!r}")
+        return NATIVE_SOLVERS[problem.kind](problem, time_limit, threads, gap_limit, hint)
+    return solve_model_builder(to_model_builder(problem, hint), name, time_limit)
@@ -0,0 +1,292 @@
+'''
+Portfolio: το ίδιο Problem λύνεται ταυτόχρονα σε πολλά backends, το καθένα σε δική του
+διεργασία, και κερδίζει το πρώτο που αποδεικνύει τη βέλτιστη λύση:
+
+- οι διεργασίες ξεκινούν με fork όπου υπάρχει: τα modules των backends φορτώνονται μία
+  φορά στον parent και το problem δεν γίνεται pickle· με spawn (π.χ. Windows) το problem
+  περνά ως .npz και κάθε διεργασία φορτώνει μόνη της ό,τι χρειάζεται
+
+- μόλις ένα backend επιστρέψει OPTIMAL (ή INFEASIBLE), τα υπόλοιπα τερματίζονται
+- αν κανένα δεν αποδείξει μέσα στο time_limit, κρατιέται το καλύτερο incumbent
+  (και το καλύτερο φράγμα από όλα)
+- κάθε νίκη γράφεται ως μία γραμμή JSON μαζί με τα features του instance (μέγεθος,
+  πυκνότητα, εύρος κόστους, ...), ώστε το select_backends να διαλέγει με k-NN
+  ποια backends αξίζει να τρέξουν σε ένα καινούργιο instance
+
+    python -m opsearch.portfolio model.npz --backends SCIP,CBC,NATIVE --time-limit 60
+    python -m opsearch.portfolio model.npz --select 2 --log .cache/portfolio_wins.jsonl
+'''
+
+import os
+import sys
+import json
+import math
+import time
+import argparse
+import importlib
+import tempfile
+import multiprocessing
+from multiprocessing.connection import wait
+
+import numpy as np
+
+from opsearch import ir
+from opsearch.instrument import traced, current
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_LOG = os.path.join(ROOT_DIR, ".cache", "portfolio_wins.jsonl")
+DEFAULT_BACKENDS = ("SCIP", "CBC", "NATIVE")
+
+# αποτελέσματα που δεν βελτιώνονται περιμένοντας τα υπόλοιπα backends
+DECISIVE = ("OPTIMAL", "INFEASIBLE")
+
+# χρόνος μετά το time_limit για να επιστρέψουν τα backends το incumbent τους: οι solvers
+# ξεπερνούν το όριο (κατασκευή μοντέλου, presolve), οπότε GRACE δευτ. + ένα ποσοστό του ορίου
+GRACE = 10.0
+GRACE_SHARE = 0.25
+
+# modules κάθε backend (τα υπόλοιπα ονόματα είναι solvers του ModelBuilder), βλ. ir.solve
+BACKEND_MODULES = {"CPSAT": ("ortools.sat.python.cp_model",), "CP-SAT": ("ortools.sat.python.cp_model",),
+                   "GUROBI": ("gurobipy",), "NATIVE": ()}
+MODEL_BUILDER_MODULES = ("ortools.linear_solver.pywraplp", "ortools.linear_solver.python.model_builder")
+
+
+def features(problem):
+    # αριθμητικά χαρακτηριστικά του instance για το log και τον selector
+    A = problem.A
+    costs = np.abs(problem.c[problem.c != 0])
+    row_lengths = np.diff(A.indptr)
+    equality = problem.row_lower == problem.row_upper
+    return {
+        "kind": problem.kind or "",
+        "variables": problem.n_vars,
+        "constraints": problem.n_rows,
+        "nonzeros": int(A.nnz),
+        "density": A.nnz / max(1, problem.n_vars * problem.n_rows),
+        "integer_share": float(problem.integer.mean()) if problem.n_vars else 0.0,
+        "equality_share": float(equality.mean()) if problem.n_rows else 0.0,
+        "max_row_length": int(row_lengths.max()) if problem.n_rows else 0,
+        "cost_range": math.log10(costs.max() / costs.min()) if costs.size else 0.0,
+    }
+
+
+def _better(problem, objective, other):
+    return objective > other if problem.sense == "max" else objective < other
+
+
+def _tighter(problem, bound, other):
+    if bound is None or not math.isfinite(bound) or abs(bound) >= 1e30:
+        return False
+    if other is None:
+        return True
+    return bound < other if problem.sense == "max" else bound > other
+
+
+def _worker(conn, problem, backend, time_limit, threads, gap_limit, hint, path, native_module):
+    # με spawn: problem είναι η διαδρομή του .npz και το sys.path του parent
+    try:
+        if isinstance(problem, str):
+            sys.path[:] = path
+            # ο native solver του kind καταχωρείται όταν φορτωθεί το module του builder
+            if native_module:
+                importlib.import_module(native_module)
+            problem = ir.Problem.load(problem)
+        start = time.perf_counter()
+        status, best_bound, objective, values = ir.solve(problem, backend, time_limit, threads, gap_limit, hint)
+        result = {"backend": backend, "status": status,
+                  "best_bound": None if best_bound is None else float(best_bound),
+                  "objective": None if objective is None else float(objective),
+                  "values": None if values is None else np.asarray(values, dtype=np.float64),
+                  "time": time.perf_counter() - start}
+    except Exception as error:
+        result = {"backend": backend, "status": "FAILED", "error": repr(error)}
+    conn.send(result)
+    conn.close()
+
+
+def _context():
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return multiprocessing.get_context("spawn")
+
+
+def _preload(backends):
+    # πριν το fork, ώστε οι διεργασίες να μην ξαναφορτώνουν ortools / gurobipy
+    for backend in backends:
+        for name in BACKEND_MODULES.get(backend.upper(), MODEL_BUILDER_MODULES):
+            try:
+                importlib.import_module(name)
+            except ImportError:
+                # το backend αποτυγχάνει στη διεργασία του με το δικό του μήνυμα
+                pass
+
+
+def _native_module(problem):
+    function = ir.NATIVE_SOLVERS.get(problem.kind)
+    # ένα script που τρέχει ως __main__ ξαναφορτώνεται από το spawn ως __mp_main__
+    if function is None or function.__module__ == "__main__":
+        return None
+    return function.__module__
+
+
+@traced("solve.portfolio")
+def race(problem, backends=DEFAULT_BACKENDS, time_limit=None, threads=1, gap_limit=None, hint=None,
+         log_path=DEFAULT_LOG):
+    '''
+    Λύνει το problem σε όλα τα backends παράλληλα και επιστρέφει dict με
+    backend, status, objective, best_bound, values, time (του νικητή) και
+    results: ένα σύντομο dict ανά backend (status, objective, time ή "cancelled").
+    Με status OPTIMAL / INFEASIBLE το αποτέλεσμα είναι αποδεδειγμένο, αλλιώς
+    είναι το καλύτερο incumbent (values None αν κανένα δεν βρήκε λύση).
+    '''
+    context = _context()
+    start = time.perf_counter()
+    source, native_module, spawn_dir = problem, None, None
+    if context.get_start_method() == "fork":
+        _preload(backends)
+    else:
+        spawn_dir = tempfile.TemporaryDirectory(prefix="portfolio-")
+        source = problem.save(os.path.join(spawn_dir.name, "problem.npz"))
+        native_module = _native_module(problem)
+    running = {}
+    for backend in backends:
+        parent_conn, child_conn = context.Pipe(duplex=False)
+        process = context.Process(target=_worker, daemon=True,
+                                  args=(child_conn, source, backend, time_limit, threads, gap_limit, hint,
+                                        list(sys.path), native_module))
+        process.start()
+        child_conn.close()
+        running[parent_conn] = (backend, process)
+
+    deadline = None if time_limit is None else start + time_limit * (1 + GRACE_SHARE) + GRACE
+    results, winner = {}, None
+    while running and winner is None:
+        timeout = None if deadline is None else max(0.0, deadline - time.perf_counter())
+        ready = wait(list(running), timeout)
+        if not ready:
+            break
+        for conn in ready:
+            backend, process = running.pop(conn)
+            try:
+                result = conn.recv()
+            except EOFError:
+                result = {"backend": backend, "status": "FAILED", "error": f"exit code {process.exitcode}"}
+            process.join()
+            results[backend] = result
+            if result["status"] in DECISIVE and winner is None:
+                winner = result
+
+    # ό,τι τρέχει ακόμα ακυρώνεται (νικητής ή λήξη χρόνου)
+    for conn, (backend, process) in running.items():
+        process.kill()
+        process.join()
+        results[backend] = {"backend": backend, "status": "CANCELLED" if winner else "TIMEOUT"}
+    if spawn_dir is not None:
+        spawn_dir.cleanup()
+
+    best_bound, incumbent = None, None
+    for result in results.values():
+        if _tighter(problem, result.get("best_bound"), best_bound):
+            best_bound = result["best_bound"]
+        if result.get("values") is not None and (incumbent is None or _better(problem, result["objective"], incumbent["objective"])):
+            incumbent = result
+    winner = winner or incumbent
+    if winner is None:
+        winner = {"backend": None, "status": "NOT_SOLVED", "objective": None, "values": None}
+
+    race_result = {
+        "backend": winner["backend"],
+        "status": winner["status"],
+        "objective": winner["objective"],
+        "best_bound": winner.get("best_bound") if winner["status"] in DECISIVE else best_bound,
+        "values": winner["values"],
+        "time": time.perf_counter() - start,
+        "results": {backend: {key: value for key, value in results[backend].items() if key != "values"}
+                    for backend in backends},
+    }
+    current().set(backends=list(backends), winner=race_result["backend"], status=race_result["status"],
+                  objective=race_result["objective"], bound=race_result["best_bound"])
+    if log_path and winner["backend"] is not None:
+        log_win(log_path, problem, race_result)
+    return race_result
+
+
+def log_win(path, problem, race_result):
+    # μία γραμμή JSON ανά αγώνα: features, νικητής και χρόνοι όσων τελείωσαν
+    record = dict(features(problem), hash=problem.content_hash(), winner=race_result["backend"],
+                  status=race_result["status"], proven=race_result["status"] in DECISIVE,
+                  times={backend: result["time"] for backend, result in race_result["results"].items()
+                         if "time" in result})
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "a") as file:
+        file.write(json.dumps(record) + "\n")
+
+
+def read_log(path):
+    if not os.path.exists(path):
+        return []
+    with open(path) as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+
+# features που συγκρίνονται (σε λογαριθμική κλίμακα για τα μεγέθη)
+SELECTOR_FEATURES = ("variables", "constraints", "nonzeros", "max_row_length")
+SELECTOR_RATIOS = ("density", "integer_share", "equality_share", "cost_range")
+
+
+def _feature_vector(record):
+    sizes = [math.log10(1 + record[name]) for name in SELECTOR_FEATURES]
+    return np.array(sizes + [record[name] for name in SELECTOR_RATIOS], dtype=np.float64)
+
+
+def select_backends(problem, backends=DEFAULT_BACKENDS, log_path=DEFAULT_LOG, k=3, top=None):
+    '''
+    Ταξινομεί τα backends με ψήφους των k πλησιέστερων αποδεδειγμένων νικών του
+    ίδιου kind στο log (απόσταση στα features). Χωρίς ιστορικό κρατά τη σειρά που δόθηκε.
+    Με top επιστρέφει μόνο τα πρώτα top (π.χ. για μικρότερο αγώνα).
+    '''
+    records = [record for record in read_log(log_path)
+               if record["proven"] and record["kind"] == (problem.kind or "") and record["winner"] in backends]
+    votes = dict.fromkeys(backends, 0.0)
+    if records:
+        target = _feature_vector(features(problem))
+        distances = np.array([np.linalg.norm(_feature_vector(record) - target) for record in records])
+        for index in np.argsort(distances, kind="stable")[:k]:
+            # πιο κοντινά instances μετράνε περισσότερο
+            votes[records[index]["winner"]] += 1.0 / (1.0 + distances[index]) ** 2
+    ranked = sorted(backends, key=lambda backend: -votes[backend])
+    return ranked[:top] if top else ranked
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Portfolio επίλυση ενός αποθηκευμένου Problem (.npz)")
+    parser.add_argument("problem", help="αρχείο .npz από Problem.save / ir.cached")
+    parser.add_argument("--backends", default=",".join(DEFAULT_BACKENDS), help="π.χ. SCIP,CBC,CPSAT,GUROBI,NATIVE")
+    parser.add_argument("--time-limit", type=float, default=None)
+    parser.add_argument("--threads", type=int, default=1, help="threads ανά backend")
+    parser.add_argument("--gap-limit", type=float, default=None)
+    parser.add_argument("--log", default=DEFAULT_LOG, help="JSONL με τις νίκες ('' χωρίς log)")
+    parser.add_argument("--select", type=int, default=None, help="τρέχουν μόνο τα N backends που προτείνει το log")
+    parser.add_argument("--native-module", default=None,
+                        help="αρχείο .py που καταχωρεί τον native solver, π.χ. Ergasia2_OS/burrito_model.py")
+    args = parser.parse_args(argv)
+
+    if args.native_module:
+        directory, filename = os.path.split(os.path.abspath(args.native_module))
+        sys.path.insert(0, directory)
+        importlib.import_module(os.path.splitext(filename)[0])
+    problem = ir.Problem.load(args.problem)
+    backends = [backend.strip().upper() for backend in args.backends.split(",") if backend.strip()]
+    if args.select:
+        backends = select_backends(problem, backends, args.log or DEFAULT_LOG, top=args.select)
+    result = race(problem, backends, args.time_limit, args.threads, args.gap_limit, log_path=args.log or None)
+    for backend, outcome in result["results"].items():
+        details = f", objective {outcome['objective']}, {outcome['time']:.3f} sec" if outcome.get("objective") is not None else ""
+        print(f"  {backend}: {outcome['status']}{details}")
+    print(f"Winner: {result['backend']} ({result['status']}), objective = {result['objective']}, "
+          f"bound = {result['best_bound']}, time = {result['time']:.3f} sec")
+    return result
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
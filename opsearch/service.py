@@ -0,0 +1,410 @@
+'''
+Solver service: μία διεργασία που φορτώνει μία φορά τους solvers (ortools, gurobipy,
+pandas) και το dataset των burritos, και δέχεται αιτήματα μέσα από Unix socket ή
+localhost (JSON ανά γραμμή).
+
+- τα αιτήματα τρέχουν σε process pool (fork, άρα τα modules και το φορτωμένο scenario
+  είναι ήδη στη μνήμη των workers· spawn όπου δεν υπάρχει fork, π.χ. Windows, όπου ο
+  server ακούει μόνο με --port) με το πολύ --workers ταυτόχρονα
+- backpressure: όταν εκτελούνται / περιμένουν ήδη workers + --max-queue αιτήματα,
+  η απάντηση είναι αμέσως {"ok": false, "error": "busy"} και ο client ξαναδοκιμάζει
+- LRU cache αποτελεσμάτων με κλειδί το hash του περιεχομένου (πίνακας κόστους ή
+  CSV του scenario, read_dataset.scenario_hash) και τις επιλογές του solver· ίδια
+  αιτήματα που τρέχουν ήδη περιμένουν το ίδιο αποτέλεσμα αντί να ξαναλυθούν
+- τα hashes κρατιούνται ανά αρχείο (διαδρομή, mtime, μέγεθος) και υπολογίζονται σε thread,
+  ώστε το event loop να μη διαβάζει πίνακες / CSV
+- οι λύσεις ("output") γράφονται μόνο μέσα στο --output-root του serve (default
+  Ergasia1_OS/solutions)· οποιοδήποτε άλλο path απορρίπτεται
+
+    python -m opsearch.service serve --workers 4
+    python -m opsearch.service assignment Ergasia1_OS/dataset/assign800.txt --solver LAP --output-dir Ergasia1_OS/solutions/erotima1
+    python -m opsearch.service assignment Ergasia1_OS/dataset/assign*.txt --groups --solver LAGRANGE
+    python -m opsearch.service burrito --solver cpsat --days 1-5
+    python -m opsearch.service stats
+    python -m opsearch.service shutdown
+
+Ο client χρησιμοποιεί μόνο τη standard library, άρα ξεκινά αμέσως.
+'''
+
+import os
+import sys
+import glob
+import json
+import time
+import socket
+import argparse
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROJECT_DIRS = (os.path.join(ROOT_DIR, "Ergasia1_OS"), os.path.join(ROOT_DIR, "Ergasia2_OS"))
+DEFAULT_SOCKET = os.path.join(ROOT_DIR, ".cache", "opsearch.sock")
+DEFAULT_CACHE_SIZE = 256
+DEFAULT_OUTPUT_ROOT = os.path.join(ROOT_DIR, "Ergasia1_OS", "solutions")
+
+# όπως τα ονόματα αρχείων του erotima1 / erotima3
+SOLUTION_SUFFIX = {False: "_erotima1_solution.txt", True: "_erotima3_solution.txt"}
+
+
+def _project_paths():
+    for directory in PROJECT_DIRS:
+        if directory not in sys.path:
+            sys.path.insert(0, directory)
+
+
+# ---------------------------------------------------------------- εργασίες των workers
+def _solve_assignment(jobs_matrix, solver, groups):
+    _project_paths()
+    from erotima1 import assignment_problem_solver
+    from erotima3 import assignment_groups_solver
+
+    stats = {}
+    solve = assignment_groups_solver if groups else assignment_problem_solver
+    total_cost, assignments, solve_time = solve(jobs_matrix, solver, stats)
+    return {
+        "total_cost": total_cost, "solve_time": solve_time, "build_time": stats.get("build_time", 0.0),
+        "status": stats.get("status"),
+        "assignments": None if assignments is None else [[int(i), int(j), c.item() if hasattr(c, "item") else c] for i, j, c in assignments],
+    }
+
+
+def _solve_burrito(solver, scenario, day, threads, time_limit, options):
+    _project_paths()
+    from run_scenarios import solve_day
+
+    return solve_day(solver, scenario, day, threads, time_limit, options)
+
+
+# ---------------------------------------------------------------- server
+def _matrix_hash(jobs_matrix):
+    import hashlib
+    import numpy as np
+
+    values = np.ascontiguousarray(jobs_matrix, dtype=np.int64 if jobs_matrix.dtype.kind in "iub" else np.float64)
+    digest = hashlib.sha256(f"{values.dtype.str}:{values.shape}".encode())
+    digest.update(values.tobytes())
+    return digest.hexdigest()[:16]
+
+
+class SolverService:
+
+    def __init__(self, workers=None, max_queue=None, cache_size=DEFAULT_CACHE_SIZE, threads=None,
+                 output_root=DEFAULT_OUTPUT_ROOT):
+        from collections import OrderedDict
+
+        self.workers = workers or os.cpu_count() or 1
+        self.max_queue = self.workers * 4 if max_queue is None else max_queue
+        self.threads = threads or max(1, (os.cpu_count() or 1) // self.workers)
+        self.cache_size = cache_size
+        self.output_root = os.path.realpath(output_root)
+        self.cache = OrderedDict()
+        self.inflight = {}
+        # (διαδρομή ή scenario, υπογραφή των αρχείων) -> hash
+        self.digests = {}
+        self.pending = 0
+        self.counters = {"requests": 0, "hits": 0, "misses": 0, "joined": 0, "busy": 0, "errors": 0}
+        self.started = time.time()
+        self.pool = None
+        self.server = None
+
+    def preload(self, scenario=None):
+        # ό,τι φορτωθεί εδώ το κληρονομούν οι workers (fork· με spawn απλώς ζεσταίνει τον server)
+        import importlib
+        _project_paths()
+        # τα entry points φορτώνουν τα βαριά packages μόνο όταν λύνουν, οπότε φορτώνονται ρητά
+        for name in ("erotima1", "erotima3", "assignment_model", "lagrangian", "solution_io",
+                     "ortools.linear_solver.python.model_builder"):
+            try:
+                importlib.import_module(name)
+            except ImportError as error:
+                print(f"preload: {name} not available ({error})")
+        from read_dataset import SCENARIO
+        from run_scenarios import SOLVERS, preload
+        for solver in SOLVERS:
+            preload(solver, [scenario or SCENARIO])
+
+    def start_pool(self):
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        # όπως το portfolio._context: fork όπου υπάρχει, αλλιώς spawn
+        method = "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context(method))
+
+    def output_path(self, path):
+        # το πραγματικό path της λύσης, αν είναι μέσα στο output_root
+        path = os.path.realpath(path)
+        if os.path.commonpath([path, self.output_root]) != self.output_root:
+            raise ValueError(f"output {path} is outside {self.output_root}")
+        return path
+
+    # -------------------------------------------------------- κλειδιά cache
+    # τρέχουν σε thread (run_in_executor), όχι στο event loop
+    def _digest(self, name, paths, compute):
+        signature = tuple((path, stat.st_mtime_ns, stat.st_size) for path, stat in
+                          ((path, os.stat(path)) for path in sorted(paths)))
+        key = (name, signature)
+        if key not in self.digests:
+            self.digests[key] = compute()
+        return self.digests[key]
+
+    def _assignment_key(self, request):
+        import numpy as np
+        from matrix_loader import load_matrix
+
+        if "file" in request:
+            jobs_matrix = load_matrix(request["file"])
+            digest = self._digest(request["file"], [request["file"]], lambda: _matrix_hash(jobs_matrix))
+        else:
+            jobs_matrix = np.asarray(request["matrix"])
+            digest = _matrix_hash(jobs_matrix)
+        options = {"solver": request.get("solver", "SCIP").upper(), "groups": bool(request.get("groups"))}
+        return f"assignment:{digest}:{json.dumps(options, sort_keys=True)}", jobs_matrix
+
+    def _burrito_key(self, request):
+        from read_dataset import scenario_hash, SCENARIO, DATASET_DIR
+
+        scenario = request.get("scenario") or SCENARIO
+        paths = glob.glob(os.path.join(DATASET_DIR, f"{glob.escape(scenario)}_day*_*.csv"))
+        digest = self._digest(scenario, paths, lambda: scenario_hash(scenario))
+        options = {"solver": request.get("solver", "cpsat"), "day": int(request["day"]),
+                   "time_limit": request.get("time_limit"), "options": request.get("options") or {}}
+        return f"burrito:{scenario}:{digest}:{json.dumps(options, sort_keys=True)}"
+
+    # -------------------------------------------------------- αιτήματα
+    async def handle(self, request):
+        import asyncio
+
+        kind = request.get("type")
+        self.counters["requests"] += 1
+        if kind == "stats":
+            return dict(self.counters, ok=True, cache_entries=len(self.cache), pending=self.pending,
+                        workers=self.workers, max_queue=self.max_queue, uptime=time.time() - self.started)
+        if kind == "shutdown":
+            self.server.close()
+            return {"ok": True}
+        if kind == "assignment":
+            output = self.output_path(request["output"]) if request.get("output") else None
+            key, jobs_matrix = await asyncio.get_running_loop().run_in_executor(None, self._assignment_key, request)
+            # ο πίνακας που ήδη φορτώθηκε, όχι το αρχείο (αλλιώς ο worker θα το ξαναδιάβαζε)
+            job = (_solve_assignment, jobs_matrix, request.get("solver", "SCIP"), bool(request.get("groups")))
+        elif kind == "burrito":
+            key = await asyncio.get_running_loop().run_in_executor(None, self._burrito_key, request)
+            from read_dataset import SCENARIO
+            job = (_solve_burrito, request.get("solver", "cpsat"), request.get("scenario") or SCENARIO,
+                   int(request["day"]), request.get("threads") or self.threads, request.get("time_limit"),
+                   request.get("options") or {})
+        else:
+            return {"ok": False, "error": f"unknown request type {kind!r}"}
+
+        result, source = await self._cached(key, job)
+        if result is None:
+            return {"ok": False, "error": "busy", "pending": self.pending}
+        response = dict(result, ok=True, cached=source, key=key)
+        if kind == "assignment" and output and result["assignments"] is not None:
+            response["problems"] = await self._write_solution(output, request, jobs_matrix, result)
+        return response
+
+    async def _cached(self, key, job):
+        import asyncio
+
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            self.counters["hits"] += 1
+            return self.cache[key], "hit"
+        if key in self.inflight:
+            # το ίδιο instance λύνεται ήδη: περιμένει το ίδιο αποτέλεσμα
+            self.counters["joined"] += 1
+            return await asyncio.shield(self.inflight[key]), "joined"
+        if self.pending >= self.workers + self.max_queue:
+            self.counters["busy"] += 1
+            return None, None
+
+        self.counters["misses"] += 1
+        self.pending += 1
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self.pool, *job)
+        self.inflight[key] = future
+        try:
+            result = await future
+        finally:
+            self.pending -= 1
+            del self.inflight[key]
+        self.cache[key] = result
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return result, "miss"
+
+    async def _write_solution(self, output, request, jobs_matrix, result):
+        # ο writer / έλεγχος του solution_io, σε thread για να μην κρατά το event loop
+        import asyncio
+        from solution_io import write_solution, check_solution
+
+        constraints = {"block_size": 5, "block_min": 2} if request.get("groups") else {}
+
+        def write():
+            write_solution(output, result["total_cost"], result["assignments"])
+            return check_solution(output, jobs_matrix, **constraints)
+        return await asyncio.get_running_loop().run_in_executor(None, write)
+
+    async def _client(self, reader, writer):
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            try:
+                response = await self.handle(json.loads(line))
+            except Exception as error:
+                self.counters["errors"] += 1
+                response = {"ok": False, "error": f"{type(error).__name__}: {error}"}
+            writer.write((json.dumps(response) + "\n").encode())
+            await writer.drain()
+        writer.close()
+
+    async def serve(self, socket_path=None, host=None, port=None):
+        import asyncio
+
+        if port is not None:
+            self.server = await asyncio.start_server(self._client, host or "127.0.0.1", port, limit=2 ** 26)
+        else:
+            os.makedirs(os.path.dirname(socket_path), exist_ok=True)
+            if os.path.exists(socket_path):
+                os.remove(socket_path)
+            self.server = await asyncio.start_unix_server(self._client, socket_path, limit=2 ** 26)
+        print(f"Serving on {host or '127.0.0.1'}:{port}" if port is not None else f"Serving on {socket_path}", flush=True)
+        try:
+            async with self.server:
+                await self.server.wait_closed()
+        finally:
+            self.pool.shutdown(cancel_futures=True)
+            if port is None and os.path.exists(socket_path):
+                os.remove(socket_path)
+
+
+# ---------------------------------------------------------------- client
+def request(message, socket_path=DEFAULT_SOCKET, host=None, port=None, retries=30):
+    '''
+    Στέλνει ένα αίτημα (dict) και επιστρέφει την απάντηση· σε "busy" ξαναδοκιμάζει
+    με αυξανόμενη αναμονή, έως retries φορές.
+    '''
+    delay = 0.05
+    for _ in range(retries + 1):
+        if port is not None:
+            connection = socket.create_connection((host or "127.0.0.1", port))
+        else:
+            connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            connection.connect(socket_path)
+        with connection, connection.makefile("rwb") as stream:
+            stream.write((json.dumps(message) + "\n").encode())
+            stream.flush()
+            response = json.loads(stream.readline())
+        if response.get("error") != "busy":
+            return response
+        time.sleep(delay)
+        delay = min(2.0, delay * 2)
+    return response
+
+
+def _parse_days(text):
+    # "1-5,8" -> [1, 2, 3, 4, 5, 8], όπως το run_scenarios.parse_days
+    days = []
+    for part in text.split(","):
+        if "-" in part:
+            first, last = part.split("-")
+            days.extend(range(int(first), int(last) + 1))
+        elif part.strip():
+            days.append(int(part))
+    return days
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solver service και client")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET)
+    parser.add_argument("--host", default=None)
+    parser.add_argument("--port", type=int, default=None, help="localhost TCP αντί για Unix socket")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="ξεκινά τον server")
+    serve.add_argument("--workers", type=int, default=None)
+    serve.add_argument("--max-queue", type=int, default=None, help="αιτήματα σε αναμονή πριν το busy")
+    serve.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_SIZE)
+    serve.add_argument("--threads", type=int, default=None, help="threads ανά burrito solve")
+    serve.add_argument("--scenario", default=None, help="scenario που φορτώνεται από την αρχή")
+    serve.add_argument("--output-root", default=DEFAULT_OUTPUT_ROOT, help="οι λύσεις γράφονται μόνο μέσα εδώ")
+
+    assignment = commands.add_parser("assignment", help="όπως το erotima1 / erotima3")
+    assignment.add_argument("files", nargs="+")
+    assignment.add_argument("--solver", default="SCIP", help="SCIP, CBC, LAP, AUCTION (erotima1) / LAGRANGE, PORTFOLIO (--groups)")
+    assignment.add_argument("--groups", action="store_true", help="περιορισμοί blocks του erotima3")
+    assignment.add_argument("--output-dir", default=None, help="γράφει τις λύσεις εδώ (π.χ. solutions/erotima1)")
+
+    burrito = commands.add_parser("burrito", help="όπως το cpsat_burrito / gurobi_burrito / run_scenarios")
+    burrito.add_argument("--solver", default="cpsat", help="cpsat, gurobi, ufl, portfolio")
+    burrito.add_argument("--scenario", default=None)
+    burrito.add_argument("--days", default="1-5")
+    burrito.add_argument("--time-limit", type=float, default=None)
+    burrito.add_argument("--linking", default=None)
+    burrito.add_argument("--gap-limit", type=float, default=None)
+    burrito.add_argument("--no-presolve", action="store_true")
+
+    commands.add_parser("stats", help="μετρητές του server")
+    commands.add_parser("shutdown", help="σταματά τον server")
+    args = parser.parse_args(argv)
+    address = {"socket_path": args.socket, "host": args.host, "port": args.port}
+
+    if args.command == "serve":
+        import asyncio
+        service = SolverService(args.workers, args.max_queue, args.cache_size, args.threads, args.output_root)
+        service.preload(args.scenario)
+        service.start_pool()
+        asyncio.run(service.serve(args.socket, args.host, args.port))
+        return 0
+
+    if args.command in ("stats", "shutdown"):
+        print(json.dumps(request({"type": args.command}, **address), indent=2))
+        return 0
+
+    if args.command == "assignment":
+        if args.output_dir:
+            os.makedirs(args.output_dir, exist_ok=True)
+        files = [path for pattern in args.files for path in (sorted(glob.glob(pattern)) or [pattern])]
+        for file in files:
+            message = {"type": "assignment", "file": os.path.abspath(file), "solver": args.solver, "groups": args.groups}
+            if args.output_dir:
+                name = os.path.basename(file).replace(".txt", SOLUTION_SUFFIX[args.groups])
+                message["output"] = os.path.abspath(os.path.join(args.output_dir, name))
+            response = request(message, **address)
+            if not response["ok"]:
+                print(f"Failed {file}: {response['error']}")
+                continue
+            if response["total_cost"] is None:
+                print(f"No solution for {file} ({response['status']})")
+                continue
+            print(f"Solved {file}: Total Cost = {response['total_cost']}, Build = {response['build_time']:.2f} seconds, "
+                  f"Time = {response['solve_time']:.2f} seconds" + (" (cached)" if response["cached"] == "hit" else ""))
+            for problem in response.get("problems", []):
+                print(f"    Invalid solution: {problem}")
+        return 0
+
+    options = {key: value for key, value in (("linking", args.linking), ("gap_limit", args.gap_limit)) if value is not None}
+    if args.no_presolve:
+        options["use_presolve"] = False
+    messages = [{"type": "burrito", "solver": args.solver, "scenario": args.scenario, "day": day,
+                 "time_limit": args.time_limit, "options": options} for day in _parse_days(args.days)]
+    # όλες οι μέρες μαζί, ώστε να μοιραστούν στους workers του server· τυπώνονται με τη σειρά
+    from concurrent.futures import ThreadPoolExecutor
+    total_profit = 0
+    total_start = time.time()
+    with ThreadPoolExecutor(max_workers=len(messages) or 1) as executor:
+        for message, response in zip(messages, executor.map(lambda message: request(message, **address), messages)):
+            if not response["ok"]:
+                print(f"\nDay {message['day']}: failed ({response['error']})")
+                continue
+            total_profit += response["profit"]
+            print(response["output"], end="")
+            print(f"Running total: €{total_profit:.2f}" + (" (cached)" if response["cached"] == "hit" else ""))
+    print("\n==============================")
+    print(f"Total Score ({len(messages)} days): €{total_profit:.2f}")
+    print(f"Total Time: {time.time() - total_start:.4f} seconds")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
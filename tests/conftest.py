@@ -0,0 +1,46 @@
+import itertools
+import os
+import sys
+
+import numpy as np
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (ROOT_DIR, os.path.join(ROOT_DIR, "Ergasia1_OS"), os.path.join(ROOT_DIR, "Ergasia2_OS")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+
+def random_burrito_instance(rng, price, ingredient_cost, truck_cost, n_demands=12, n_trucks=7):
+    from preprocess import BurritoInstance
+
+    pairs = [(d, t) for d in range(n_demands) for t in range(n_trucks) if rng.random() < 0.4]
+    demand_ids = np.array([d for d, _ in pairs], dtype=np.int64)
+    truck_ids = np.array([t for _, t in pairs], dtype=np.int64)
+    units = rng.integers(0, 40, size=len(pairs))
+    problem_data = {'burrito_price': [price], 'ingredient_cost': [ingredient_cost], 'truck_cost': [truck_cost]}
+    return BurritoInstance.from_arrays([f'd{d}' for d in range(n_demands)], [f't{t}' for t in range(n_trucks)],
+                                       demand_ids, truck_ids, units, problem_data)
+
+
+def brute_force(inst):
+    # βέλτιστο κέρδος πάνω σε όλα τα σύνολα ανοιχτών trucks (κάθε demand παίρνει το καλύτερο ανοιχτό)
+    w = inst.pair_coefficients()
+    best = 0.0
+    for size in range(1, inst.n_trucks + 1):
+        for trucks in itertools.combinations(range(inst.n_trucks), size):
+            served = np.zeros(inst.n_demands)
+            open_pairs = np.isin(inst.pair_truck, trucks)
+            np.maximum.at(served, inst.pair_demand[open_pairs], w[open_pairs])
+            best = max(best, served.sum() - inst.truck_cost * size)
+    return best
+
+
+def brute_force_problem(problem):
+    # βέλτιστη τιμή ενός ir.Problem πάνω σε όλα τα 0/1 διανύσματα
+    best = None
+    for values in itertools.product((0, 1), repeat=problem.n_vars):
+        if problem.is_feasible(values):
+            value = problem.objective(values)
+            if best is None or (value > best if problem.sense == "max" else value < best):
+                best = value
+    return best
@@ -0,0 +1,17 @@
+import os
+
+import pytest
+
+from opsearch.__main__ import COMMANDS, measure_import
+
+# τα budgets του COMMANDS επί OPSEARCH_IMPORT_SCALE (μεγαλύτερο σε πιο αργά μηχανήματα / CI)
+SCALE = float(os.environ.get("OPSEARCH_IMPORT_SCALE", "1"))
+
+
+@pytest.mark.parametrize("command", sorted(COMMANDS))
+def test_import_time(command):
+    milliseconds, heavy = measure_import(command, repeat=2)
+    assert heavy == [], f"{command} loads {', '.join(heavy)} at import time"
+    ceiling = COMMANDS[command][3] * SCALE
+    assert milliseconds is not None and milliseconds <= ceiling, \
+        f"import {COMMANDS[command][1]} took {milliseconds:.0f} ms (ceiling {ceiling:.0f} ms)"
@@ -0,0 +1,80 @@
+
+import numpy as np
+import pytest
+from scipy.optimize import linear_sum_assignment
+
+from incremental import IncrementalAssignment
+from lap import lap_solver
+
+
+def check_from_scratch(engine):
+    total_cost, assignments, _ = engine.solve()
+    jobs_matrix = engine.jobs_matrix
+    rows, cols = linear_sum_assignment(jobs_matrix)
+    assert total_cost == jobs_matrix[rows, cols].sum()
+    assert total_cost == lap_solver(jobs_matrix)[0]
+    assert sorted(j for _, j, _ in assignments) == list(range(engine.jobs))
+    assert len({i for i, _, _ in assignments}) == engine.jobs
+    assert all(jobs_matrix[i][j] == c for i, j, c in assignments)
+
+
+def random_change(engine, rng):
+    kind = rng.choice(["rows", "cols", "cells", "add", "remove"])
+    if kind == "remove" and engine.workers == engine.jobs:
+        kind = "add"
+    if kind == "rows":
+        rows = rng.choice(engine.workers, size=rng.integers(1, 4), replace=False)
+        engine.update_rows(rows, rng.integers(1, 100, size=(rows.size, engine.jobs)))
+    elif kind == "cols":
+        cols = rng.choice(engine.jobs, size=rng.integers(1, 4), replace=False)
+        engine.update_cols(cols, rng.integers(1, 100, size=(engine.workers, cols.size)))
+    elif kind == "cells":
+        size = rng.integers(1, 10)
+        engine.update_cells(rng.integers(0, engine.workers, size=size), rng.choice(engine.jobs, size=size, replace=False),
+                            rng.integers(1, 100, size=size))
+    elif kind == "add":
+        engine.add_worker(rng.integers(1, 100, size=engine.jobs))
+    else:
+        engine.remove_worker(int(rng.integers(engine.workers)))
+
+
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("workers, jobs", [(20, 20), (25, 18)])
+def test_random_changes_match_full_solve(workers, jobs, seed):
+    rng = np.random.default_rng(seed)
+    engine = IncrementalAssignment(rng.integers(1, 100, size=(workers, jobs)))
+    check_from_scratch(engine)
+    for _ in range(30):
+        random_change(engine, rng)
+        check_from_scratch(engine)
+
+
+def test_changes_before_first_solve():
+    rng = np.random.default_rng(0)
+    engine = IncrementalAssignment(rng.integers(1, 100, size=(12, 10)))
+    engine.update_rows([1, 4], rng.integers(1, 100, size=(2, 10)))
+    engine.update_cols([0], rng.integers(1, 100, size=(12, 1)))
+    engine.add_worker(rng.integers(1, 100, size=10))
+    engine.remove_worker(5)
+    check_from_scratch(engine)
+
+
+def test_unchanged_problem_needs_no_augment():
+    engine = IncrementalAssignment(np.random.default_rng(0).integers(1, 100, size=(15, 15)))
+    engine.solve()
+    engine.solve()
+    assert engine.augmented == 0
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_fractional_costs_are_not_truncated(seed):
+    rng = np.random.default_rng(seed)
+    engine = IncrementalAssignment(rng.integers(1, 100, size=(10, 8)))
+    engine.solve()
+    engine.update_rows([2], rng.random((1, 8)) * 100)
+    engine.add_worker(rng.random(8) * 100)
+    total_cost, assignments, _ = engine.solve()
+    rows, cols = linear_sum_assignment(engine.jobs_matrix)
+    assert engine.jobs_matrix.dtype == np.float64
+    assert total_cost == pytest.approx(engine.jobs_matrix[rows, cols].sum())
+    assert total_cost == pytest.approx(sum(c for _, _, c in assignments))
@@ -0,0 +1,109 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from conftest import ROOT_DIR
+from opsearch import instrument
+from opsearch.instrument import NULL_SPAN, current, span, traced
+
+
+@pytest.fixture
+def tracing(tmp_path):
+    # ό,τι άνοιξε το test κλείνει, ώστε τα υπόλοιπα tests να τρέχουν χωρίς καταγραφή
+    path = str(tmp_path / "trace.jsonl")
+    instrument.records(clear=True)
+    instrument.enable(path)
+    yield path
+    instrument.disable()
+    instrument.records(clear=True)
+
+
+@traced("solve.inner", backend="TEST")
+def inner(value):
+    current().set(value=value)
+    return value * 2
+
+
+def test_spans_nest_and_flush_on_the_outermost(tracing):
+    with span("load.outer", size=3) as outer:
+        assert inner(21) == 42
+        with span("build.middle"):
+            inner(1)
+        # τίποτα δεν γράφεται πριν κλείσει το εξωτερικό span
+        assert not os.path.exists(tracing)
+        outer.set(done=True)
+    spans = instrument.read_jsonl(tracing)
+    assert [record["name"] for record in spans] == ["solve.inner", "solve.inner", "build.middle", "load.outer"]
+    first, second, middle, root = spans
+    assert root["parent"] is None and root["depth"] == 0
+    assert first["parent"] == root["id"] and first["depth"] == 1
+    assert middle["parent"] == root["id"] and second["parent"] == middle["id"] and second["depth"] == 2
+    assert first["attrs"] == {"backend": "TEST", "value": 21}
+    assert root["attrs"] == {"size": 3, "done": True}
+    assert root["duration_ns"] >= middle["duration_ns"] >= second["duration_ns"]
+    assert instrument.records() == []
+
+
+def test_errors_are_recorded(tracing):
+    with pytest.raises(ValueError):
+        with span("solve.failing"):
+            raise ValueError("boom")
+    (record,) = instrument.read_jsonl(tracing)
+    assert record["attrs"] == {"error": "ValueError"}
+
+
+def test_chrome_trace_and_summary(tracing, tmp_path):
+    with span("solve.outer"):
+        inner(1)
+        inner(2)
+    spans = instrument.read_jsonl(tracing)
+    chrome_path = str(tmp_path / "trace.json")
+    instrument.write_chrome_trace(chrome_path, spans)
+    with open(chrome_path) as file:
+        trace = json.load(file)
+    events = trace["traceEvents"]
+    assert [event["name"] for event in events] == ["solve.inner", "solve.inner", "solve.outer"]
+    assert all(event["ph"] == "X" and event["cat"] == "solve" for event in events)
+    assert events[2]["dur"] == spans[2]["duration_ns"] / 1000 and events[0]["args"] == {"backend": "TEST", "value": 1}
+    summary = {row["name"]: row for row in instrument.summarize(spans)}
+    assert summary["solve.inner"]["count"] == 2 and summary["solve.outer"]["count"] == 1
+
+
+def test_tracemalloc_profile_on_the_outer_span(tracing):
+    instrument.enable(tracing, "tracemalloc")
+    with span("solve.outer"):
+        with span("solve.inner"):
+            data = [0] * 100000
+    del data
+    inner_record, outer_record = instrument.read_jsonl(tracing)
+    assert outer_record["attrs"]["peak_kb"] > 0 and "peak_kb" not in inner_record["attrs"]
+
+
+def test_disabled_tracing_writes_nothing(tmp_path):
+    assert not instrument.enabled()
+    assert span("solve.anything", size=1) is NULL_SPAN
+    with span("solve.outer") as outer:
+        assert outer is NULL_SPAN and current() is NULL_SPAN
+        assert inner(3) == 6
+    assert instrument.records() == []
+    assert instrument.flush(str(tmp_path / "trace.jsonl")) == []
+    assert os.listdir(tmp_path) == []
+
+
+SCRIPT = "from opsearch.instrument import span\nwith span('load.child'):\n    pass\n"
+
+
+@pytest.mark.parametrize("trace", [True, False])
+def test_env_switch(tmp_path, trace):
+    path = str(tmp_path / "trace.jsonl")
+    env = {key: value for key, value in os.environ.items() if not key.startswith("OPSEARCH_")}
+    if trace:
+        env["OPSEARCH_TRACE"] = path
+    subprocess.run([sys.executable, "-c", SCRIPT], cwd=ROOT_DIR, env=env, check=True)
+    if trace:
+        assert [record["name"] for record in instrument.read_jsonl(path)] == ["load.child"]
+    else:
+        assert os.listdir(tmp_path) == []
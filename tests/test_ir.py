@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from conftest import brute_force_problem
+from opsearch import ir
+
+WEIGHTS = np.array([[3, 4, 2, 5, 1, 3, 2]])
+
+
+def knapsack(c, sense="max", offset=0.0):
+    return ir.Problem(c, WEIGHTS, [-np.inf], [9], sense=sense, offset=offset)
+
+
+def test_objective_scale():
+    assert ir._objective_scale([3.0, -7.0]) == 1
+    assert ir._objective_scale([10.35 - 10.0, 2.0]) == 100
+    assert ir._objective_scale([1.0 / 3.0]) is None
+
+
+@pytest.mark.parametrize("c, offset", [
+    ([1.35, 2.7, 0.05, 3.141, 1.2, 0.9, 2.0], 0.0),
+    ([0.35 * 12, 0.35 * 30, 0.35 * 7, 0.35 * 41, 0.35 * 3, 0.35 * 18, -5.3], 2.5),
+    ([1 / 3, 2 / 7, 0.1, 1.0, 5 / 9, 0.25, 1 / 6], 0.0),
+])
+@pytest.mark.parametrize("sense", ["max", "min"])
+def test_cpsat_fractional_objective(c, offset, sense):
+    problem = knapsack(np.array(c) if sense == "max" else -np.array(c), sense, offset)
+    status, bound, objective, values = ir.solve(problem, "CPSAT")
+    expected = brute_force_problem(problem)
+    assert status == "OPTIMAL"
+    assert objective == pytest.approx(expected, abs=1e-6)
+    assert bound == pytest.approx(expected, abs=1e-6)
+    assert problem.objective(values) == pytest.approx(expected, abs=1e-6)
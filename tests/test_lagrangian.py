@@ -0,0 +1,111 @@
+
+import os
+
+import numpy as np
+import pytest
+
+import lagrangian
+from assignment_model import solve_assignment, solver_available
+from conftest import ROOT_DIR
+from lagrangian import lagrangian_groups_solver
+from matrix_loader import load_matrix
+
+pytestmark = pytest.mark.skipif(not solver_available("CBC"), reason="CBC is not available")
+
+BLOCK_SIZE, BLOCK_MIN = 5, 2
+
+
+def random_matrix(seed, n=20):
+    return np.random.default_rng(seed).integers(1, 100, size=(n, n))
+
+
+def cbc_optimum(jobs_matrix):
+    stats = {}
+    total_cost, _, _ = solve_assignment(jobs_matrix, "CBC", block_size=BLOCK_SIZE, block_min=BLOCK_MIN, stats=stats)
+    assert stats["status"] == "OPTIMAL"
+    return total_cost
+
+
+def check_assignment(jobs_matrix, total_cost, assignments):
+    n = len(jobs_matrix)
+    rows = sorted(i for i, _, _ in assignments)
+    cols = np.array([j for _, j, _ in sorted(assignments)])
+    assert rows == list(range(n)) and len(set(cols.tolist())) == n
+    assert total_cost == pytest.approx(sum(float(jobs_matrix[i][j]) for i, j, _ in assignments))
+    # κάθε ομάδα BLOCK_SIZE γραμμών παίρνει τουλάχιστον BLOCK_MIN στήλες της ίδιας ομάδας
+    inside = cols // BLOCK_SIZE == np.arange(n) // BLOCK_SIZE
+    assert (np.bincount(np.arange(n)[inside] // BLOCK_SIZE, minlength=n // BLOCK_SIZE) >= BLOCK_MIN).all()
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_exact_matches_cbc(seed):
+    jobs_matrix = random_matrix(seed)
+    stats = {}
+    total_cost, assignments, _ = lagrangian_groups_solver(jobs_matrix, BLOCK_SIZE, BLOCK_MIN, stats=stats)
+    expected = cbc_optimum(jobs_matrix)
+    check_assignment(jobs_matrix, total_cost, assignments)
+    assert total_cost == expected
+    assert stats["lower_bound"] == expected
+    assert stats["gap"] == 0.0 and stats["optimal"]
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_heuristic_bounds_bracket_cbc(seed):
+    jobs_matrix = random_matrix(seed)
+    stats = {}
+    total_cost, assignments, _ = lagrangian_groups_solver(jobs_matrix, BLOCK_SIZE, BLOCK_MIN, exact=False, stats=stats)
+    expected = cbc_optimum(jobs_matrix)
+    check_assignment(jobs_matrix, total_cost, assignments)
+    assert stats["lower_bound"] <= expected <= total_cost
+    assert stats["gap"] == pytest.approx((total_cost - stats["lower_bound"]) / total_cost)
+    assert stats["optimal"] == (total_cost == stats["lower_bound"])
+
+
+def test_time_limit_stops_the_subgradient_loop():
+    jobs_matrix = random_matrix(0)
+    stats = {}
+    total_cost, assignments, _ = lagrangian_groups_solver(jobs_matrix, BLOCK_SIZE, BLOCK_MIN, time_limit=0.0, stats=stats)
+    assert stats["iterations"] == 0
+    check_assignment(jobs_matrix, total_cost, assignments)
+    assert stats["lower_bound"] <= cbc_optimum(jobs_matrix) <= total_cost
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_fractional_costs_are_not_rounded(seed):
+    # με κλασματικά κόστη το κάτω φράγμα δεν στρογγυλεύεται και το "−1" του reduced cost fixing δεν ισχύει
+    jobs_matrix = np.random.default_rng(seed).integers(100, 200, size=(20, 20)) / 100
+    stats = {}
+    total_cost, assignments, _ = lagrangian_groups_solver(jobs_matrix, BLOCK_SIZE, BLOCK_MIN, stats=stats)
+    expected = cbc_optimum(jobs_matrix)
+    check_assignment(jobs_matrix, total_cost, assignments)
+    assert total_cost == pytest.approx(expected)
+    assert stats["lower_bound"] <= expected + 1e-6
+    assert stats["optimal"]
+
+
+@pytest.mark.parametrize("dataset", ["assign100.txt", "assign300.txt"])
+def test_dataset_bounds_close_without_mip(dataset):
+    # το _fix_blocks δίνει από νωρίς λύση κοντά στη βέλτιστη, οπότε το κάτω φράγμα την πιάνει χωρίς MIP
+    jobs_matrix = load_matrix(os.path.join(ROOT_DIR, "Ergasia1_OS", "dataset", dataset), cache=False)
+    stats = {}
+    total_cost, assignments, _ = lagrangian_groups_solver(jobs_matrix, BLOCK_SIZE, BLOCK_MIN, stats=stats)
+    check_assignment(jobs_matrix, total_cost, assignments)
+    assert stats["optimal"] and stats["lower_bound"] == total_cost
+    assert stats["fixed"] == 0
+
+
+def test_large_fixed_model_reports_the_gap(monkeypatch):
+    # αν μετά το reduced cost fixing μένουν πολλές μεταβλητές, δεν λύνεται MIP· το gap μένει στο stats
+    def no_mip(*args, **kwargs):
+        raise AssertionError("the MIP should be skipped")
+
+    monkeypatch.setattr(lagrangian, "MIP_CELLS_PER_ROW", 0)
+    monkeypatch.setattr(lagrangian, "solve_assignment", no_mip)
+    jobs_matrix = random_matrix(0)
+    stats = {}
+    total_cost, assignments, _ = lagrangian_groups_solver(jobs_matrix, BLOCK_SIZE, BLOCK_MIN, stats=stats)
+    expected = cbc_optimum(jobs_matrix)
+    check_assignment(jobs_matrix, total_cost, assignments)
+    assert stats["lower_bound"] <= expected <= total_cost
+    assert stats["fixed"] > 0 and not stats["optimal"]
+    assert stats["gap"] == pytest.approx((total_cost - stats["lower_bound"]) / total_cost) and stats["gap"] > 0
@@ -0,0 +1,91 @@
+
+import numpy as np
+import pytest
+from scipy.optimize import linear_sum_assignment
+
+from lap import lap_solver, pad_matrix, potentials, solve_lap
+
+TOLERANCE = 1e-7
+
+
+def scipy_cost(costs):
+    rows, cols = linear_sum_assignment(costs)
+    return costs[rows, cols].sum()
+
+
+def check_duals(costs, col4row, u, v):
+    # c[i][j] - u[i] - v[j] >= 0 παντού, = 0 στο matching, και άθροισμα δυναμικών = κόστος
+    n = costs.shape[0]
+    reduced = costs - u[:, None] - v[None, :]
+    assert reduced.min() >= -TOLERANCE
+    assert np.abs(reduced[np.arange(n), col4row]).max() <= TOLERANCE
+    assert u.sum() + v.sum() == pytest.approx(costs[np.arange(n), col4row].sum())
+
+
+@pytest.mark.parametrize("seed", range(8))
+@pytest.mark.parametrize("n", [1, 7, 40])
+def test_square_matches_scipy(n, seed):
+    jobs_matrix = np.random.default_rng(seed).integers(1, 100, size=(n, n))
+    total_cost, assignments, _ = lap_solver(jobs_matrix)
+    assert total_cost == scipy_cost(jobs_matrix)
+    assert sorted(i for i, _, _ in assignments) == list(range(n))
+    assert sorted(j for _, j, _ in assignments) == list(range(n))
+
+
+@pytest.mark.parametrize("seed", range(8))
+@pytest.mark.parametrize("workers, jobs", [(6, 6), (9, 5)])
+def test_fractional_costs_match_scipy(workers, jobs, seed):
+    jobs_matrix = np.random.default_rng(seed).random((workers, jobs)) * 10
+    total_cost, assignments, _ = lap_solver(jobs_matrix)
+    assert total_cost == pytest.approx(scipy_cost(jobs_matrix))
+    assert total_cost == pytest.approx(sum(c for _, _, c in assignments))
+
+
+@pytest.mark.parametrize("seed", range(8))
+@pytest.mark.parametrize("workers, jobs", [(5, 3), (30, 12), (41, 40)])
+def test_rectangular_matches_scipy(workers, jobs, seed):
+    jobs_matrix = np.random.default_rng(seed).integers(1, 100, size=(workers, jobs))
+    total_cost, assignments, _ = lap_solver(jobs_matrix)
+    assert total_cost == scipy_cost(jobs_matrix)
+    assert sorted(j for _, j, _ in assignments) == list(range(jobs))
+    assert len({i for i, _, _ in assignments}) == jobs
+    assert pad_matrix(jobs_matrix).shape == (workers, workers)
+
+
+def test_more_jobs_than_workers_is_rejected():
+    with pytest.raises(ValueError):
+        pad_matrix(np.ones((3, 5)))
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_solve_lap_duals_are_feasible(seed):
+    rng = np.random.default_rng(seed)
+    costs = rng.random((30, 30)) * 50 if seed % 2 else pad_matrix(rng.integers(0, 20, size=(30, 22)))
+    col4row, u, v = solve_lap(costs)
+    assert costs[np.arange(30), col4row].sum() == pytest.approx(scipy_cost(costs))
+    check_duals(np.asarray(costs, dtype=np.float64), col4row, u, v)
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_potentials_of_scipy_matching_are_feasible(seed):
+    rng = np.random.default_rng(seed)
+    costs = rng.random((30, 30)) * 50 if seed % 2 else rng.integers(0, 20, size=(30, 30)).astype(np.float64)
+    _, col4row = linear_sum_assignment(costs)
+    u, v = potentials(costs, col4row)
+    check_duals(costs, col4row, u, v)
+
+
+def test_warm_start_from_partial_matching():
+    rng = np.random.default_rng(0)
+    costs = rng.integers(1, 100, size=(25, 25)).astype(np.float64)
+    col4row, u, v = solve_lap(costs)
+    # αλλάζει μία γραμμή: ξεκινά ελεύθερη, με τα δυναμικά ακόμη εφικτά για τις υπόλοιπες
+    costs[3] = rng.integers(1, 100, size=25)
+    row4col = np.full(25, -1, dtype=np.int64)
+    row4col[col4row] = np.arange(25)
+    row4col[col4row[3]] = -1
+    col4row[3] = -1
+    u[3] = (costs[3] - v).min()
+    col4row, u, v = solve_lap(costs, u, v, col4row, row4col)
+    assert costs[np.arange(25), col4row].sum() == pytest.approx(scipy_cost(costs))
+    check_duals(costs, col4row, u, v)
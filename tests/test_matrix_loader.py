@@ -0,0 +1,45 @@
+import os
+
+import numpy as np
+import pytest
+
+import matrix_loader
+from matrix_loader import load_matrix, parse_text
+
+
+@pytest.fixture
+def instance(tmp_path):
+    matrix = np.random.default_rng(0).integers(0, 300, size=(12, 12))
+    filename = tmp_path / "assign12.txt"
+    filename.write_text(f"{len(matrix)}\n" + "\n".join(" ".join(map(str, row)) for row in matrix) + "\n")
+    return str(filename), matrix
+
+
+@pytest.mark.parametrize("streamed", [False, True])
+def test_cache_matches_text(instance, monkeypatch, streamed):
+    filename, matrix = instance
+    if streamed:
+        monkeypatch.setattr(matrix_loader, "STREAM_BYTES", 0)
+    loaded = load_matrix(filename)
+    assert isinstance(loaded, np.memmap)
+    assert np.array_equal(loaded, matrix)
+    assert loaded.dtype == parse_text(filename).dtype
+    assert np.array_equal(load_matrix(filename), matrix)
+
+
+@pytest.mark.parametrize("streamed", [False, True])
+def test_unwritable_cache_falls_back_to_memory(instance, monkeypatch, streamed):
+    filename, matrix = instance
+    # ένα αρχείο στη θέση του .cache/ κάνει κάθε εγγραφή του cache να αποτυγχάνει με OSError
+    open(os.path.join(os.path.dirname(filename), matrix_loader.CACHE_DIR), "w").close()
+    if streamed:
+        monkeypatch.setattr(matrix_loader, "STREAM_BYTES", 0)
+    loaded = load_matrix(filename)
+    assert not isinstance(loaded, np.memmap)
+    assert np.array_equal(loaded, matrix)
+
+
+def test_stream_with_small_chunks(instance):
+    filename, matrix = instance
+    path = matrix_loader.stream_to_cache(filename, chunk_bytes=16)
+    assert np.array_equal(np.load(path), matrix)
@@ -0,0 +1,116 @@
+import os
+
+import numpy as np
+import pytest
+
+from lap import lap_solver
+from out_of_core import auction_solver, fingerprint, open_matrix
+
+SMALL_BLOCK = 4096
+
+
+def memmap(tmp_path, matrix, name="matrix.npy"):
+    filename = str(tmp_path / name)
+    np.save(filename, matrix)
+    return open_matrix(filename)
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("workers, jobs", [(30, 30), (45, 30), (80, 80)])
+def test_matches_lap_solver(tmp_path, workers, jobs, seed):
+    jobs_matrix = np.random.default_rng(seed).integers(1, 1000, size=(workers, jobs))
+    stats = {}
+    total_cost, assignments, _ = auction_solver(memmap(tmp_path, jobs_matrix), stats, block_bytes=SMALL_BLOCK)
+    expected = lap_solver(jobs_matrix)[0]
+    assert total_cost == expected
+    assert sorted(j for _, j, _ in assignments) == list(range(jobs))
+    assert len({i for i, _, _ in assignments}) == jobs
+    assert expected - 1 < stats["best_bound"] <= expected + 1e-6
+    assert stats["optimal"] and stats["gap"] == 0.0 and stats["status"] == "OPTIMAL"
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("scale", [10.0, 1e6])
+def test_fractional_costs_match_lap_solver(tmp_path, scale, seed):
+    # δεκαδικά κόστη: οι φάσεις συνεχίζουν κάτω από ε = 1 και το optimal βγαίνει από το φράγμα
+    jobs_matrix = np.random.default_rng(seed).random((40, 30)) * scale
+    stats = {}
+    total_cost, _, _ = auction_solver(memmap(tmp_path, jobs_matrix), stats, block_bytes=SMALL_BLOCK)
+    expected = lap_solver(jobs_matrix)[0]
+    assert total_cost == pytest.approx(expected, rel=1e-9)
+    assert stats["best_bound"] <= total_cost + 1e-6
+    assert stats["optimal"] and stats["status"] == "OPTIMAL"
+    assert stats["gap"] == pytest.approx((total_cost - stats["best_bound"]) / total_cost, abs=1e-12)
+
+
+def test_without_certificate_only_integer_costs_are_optimal(tmp_path):
+    stats = {}
+    auction_solver(np.random.default_rng(0).random((20, 20)), stats, certify=False)
+    assert not stats["optimal"] and stats["status"] == "FEASIBLE"
+    auction_solver(np.random.default_rng(0).integers(1, 100, size=(20, 20)), stats, certify=False)
+    assert stats["optimal"] and stats["status"] == "OPTIMAL"
+
+
+def test_fingerprint_sees_every_cell(tmp_path):
+    jobs_matrix = np.random.default_rng(0).integers(1, 1000, size=(200, 50))
+    before = fingerprint(memmap(tmp_path, jobs_matrix), SMALL_BLOCK)
+    for i, j in [(1, 7), (101, 0), (199, 49)]:
+        changed = jobs_matrix.copy()
+        changed[i, j] += 1
+        assert fingerprint(memmap(tmp_path, changed), SMALL_BLOCK) != before
+    # ανεξάρτητο από το μέγεθος των blocks
+    assert fingerprint(memmap(tmp_path, jobs_matrix)) == before
+
+
+def interrupted_run(matrix, checkpoint, after=3):
+    calls = []
+
+    def on_progress(event):
+        calls.append(event)
+        if len(calls) >= after:
+            raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        auction_solver(matrix, block_bytes=SMALL_BLOCK, checkpoint=checkpoint, on_progress=on_progress,
+                       progress_every=0.0)
+    return calls[-1]
+
+
+def test_resume_from_checkpoint(tmp_path):
+    jobs_matrix = np.random.default_rng(1).integers(1, 1000, size=(60, 60))
+    matrix = memmap(tmp_path, jobs_matrix)
+    checkpoint = str(tmp_path / "run.ckpt.npz")
+    last = interrupted_run(matrix, checkpoint)
+    assert os.path.exists(checkpoint)
+
+    stats = {}
+    total_cost, _, _ = auction_solver(matrix, stats, block_bytes=SMALL_BLOCK, checkpoint=checkpoint)
+    assert stats["resumed"]
+    assert stats["rounds"] >= last["rounds"]
+    assert total_cost == lap_solver(jobs_matrix)[0]
+    assert not os.path.exists(checkpoint)
+
+
+def test_checkpoint_of_another_matrix_is_ignored(tmp_path):
+    jobs_matrix = np.random.default_rng(2).integers(1, 1000, size=(60, 60))
+    checkpoint = str(tmp_path / "run.ckpt.npz")
+    interrupted_run(memmap(tmp_path, jobs_matrix), checkpoint)
+
+    # αλλάζει ένα κελί που δεν θα έπιανε ένα δείγμα γραμμών
+    jobs_matrix[1, 5] = 1
+    stats = {}
+    total_cost, _, _ = auction_solver(memmap(tmp_path, jobs_matrix), stats, block_bytes=SMALL_BLOCK,
+                                      checkpoint=checkpoint)
+    assert not stats["resumed"]
+    assert total_cost == lap_solver(jobs_matrix)[0]
+
+
+def test_no_resume_ignores_checkpoint(tmp_path):
+    jobs_matrix = np.random.default_rng(3).integers(1, 1000, size=(60, 60))
+    matrix = memmap(tmp_path, jobs_matrix)
+    checkpoint = str(tmp_path / "run.ckpt.npz")
+    interrupted_run(matrix, checkpoint)
+    stats = {}
+    total_cost, _, _ = auction_solver(matrix, stats, block_bytes=SMALL_BLOCK, checkpoint=checkpoint, resume=False)
+    assert not stats["resumed"]
+    assert total_cost == lap_solver(jobs_matrix)[0]
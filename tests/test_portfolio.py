@@ -0,0 +1,85 @@
+import multiprocessing
+import time
+
+import numpy as np
+import pytest
+
+from opsearch import ir, portfolio
+
+# τα ψεύτικα backends περνάνε στις διεργασίες μέσω fork (monkeypatch στον parent)
+pytestmark = pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="needs fork")
+
+KIND = "portfolio-test"
+SLEEP = 30.0
+
+
+def problem():
+    return ir.Problem([3.0, 2.0, 4.0], [[2, 1, 3]], [-np.inf], [4], sense="max", kind=KIND)
+
+
+def optimal(problem, time_limit, threads, gap_limit, hint):
+    return "OPTIMAL", 5.0, 5.0, [1.0, 1.0, 0.0]
+
+
+def broken(problem, time_limit, threads, gap_limit, hint):
+    raise RuntimeError("native solver crashed")
+
+
+def fake_solve(real_solve):
+    # SLOW: δεν τελειώνει μέσα στο test, FEASIBLE: incumbent χωρίς απόδειξη, αλλιώς το πραγματικό ir.solve
+    def solve(problem, backend="SCIP", time_limit=None, threads=None, gap_limit=None, hint=None):
+        if backend == "SLOW":
+            time.sleep(SLEEP)
+            return "OPTIMAL", 5.0, 5.0, [1.0, 1.0, 0.0]
+        if backend == "FEASIBLE":
+            return "FEASIBLE", 7.0, 4.0, [0.0, 0.0, 1.0]
+        if backend == "WORSE":
+            return "FEASIBLE", 6.0, 3.0, [1.0, 0.0, 0.0]
+        return real_solve(problem, backend, time_limit, threads, gap_limit, hint)
+    return solve
+
+
+@pytest.fixture
+def backends(monkeypatch):
+    monkeypatch.setattr(ir, "solve", fake_solve(ir.solve))
+    monkeypatch.setattr(portfolio, "GRACE", 0.5)
+
+    def register(native):
+        monkeypatch.setitem(ir.NATIVE_SOLVERS, KIND, native)
+    return register
+
+
+def test_first_decisive_result_wins_and_cancels_the_rest(backends):
+    backends(optimal)
+    start = time.perf_counter()
+    result = portfolio.race(problem(), ["SLOW", "NATIVE"], log_path=None)
+    assert time.perf_counter() - start < SLEEP / 2
+    assert result["backend"] == "NATIVE" and result["status"] == "OPTIMAL"
+    assert result["objective"] == 5.0 and result["best_bound"] == 5.0
+    assert list(result["values"]) == [1.0, 1.0, 0.0]
+    assert result["results"]["SLOW"]["status"] == "CANCELLED"
+
+
+def test_timeout_keeps_the_best_incumbent(backends):
+    backends(optimal)
+    result = portfolio.race(problem(), ["WORSE", "FEASIBLE", "SLOW"], time_limit=0.1, log_path=None)
+    assert result["backend"] == "FEASIBLE" and result["status"] == "FEASIBLE"
+    assert result["objective"] == 4.0
+    # το πιο σφιχτό φράγμα από όλα τα backends, όχι μόνο του incumbent
+    assert result["best_bound"] == 6.0
+    assert result["results"]["SLOW"]["status"] == "TIMEOUT"
+
+
+def test_failed_backend_does_not_stop_the_race(backends):
+    backends(broken)
+    result = portfolio.race(problem(), ["NATIVE", "FEASIBLE"], log_path=None)
+    assert result["backend"] == "FEASIBLE" and result["objective"] == 4.0
+    assert result["results"]["NATIVE"]["status"] == "FAILED"
+    assert "native solver crashed" in result["results"]["NATIVE"]["error"]
+
+
+def test_no_solution_at_all(backends):
+    backends(broken)
+    result = portfolio.race(problem(), ["NATIVE"], log_path=None)
+    assert result["backend"] is None and result["status"] == "NOT_SOLVED"
+    assert result["values"] is None
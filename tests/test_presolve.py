@@ -0,0 +1,66 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from conftest import brute_force, random_burrito_instance
+from presolve import presolve
+
+PRICES = [
+    (12.0, 10.0, 30.0),
+    (12.0, 10.0, 80.0),
+    (10.35, 10.0, 9.87),
+    (10.35, 10.0, 3.0),
+    (10.05, 10.0, 2.1),
+]
+
+
+def brute_force_presolved(pre):
+    # όπως το brute_force, μόνο με τα trucks / ζεύγη που κράτησε το presolve και τα fixed_open πάντα ανοιχτά
+    inst = pre.inst
+    w = inst.pair_coefficients()[pre.pairs]
+    fixed = pre.fixed_open[pre.trucks]
+    free = np.flatnonzero(~fixed)
+    best = None
+    for size in range(free.size + 1):
+        for chosen in itertools.combinations(free, size):
+            open_trucks = fixed.copy()
+            open_trucks[list(chosen)] = True
+            served = np.zeros(inst.n_demands)
+            open_pairs = open_trucks[pre.pair_truck]
+            np.maximum.at(served, pre.pair_demand[open_pairs], w[open_pairs])
+            profit = served.sum() - inst.truck_cost * open_trucks.sum()
+            best = profit if best is None else max(best, profit)
+    return best
+
+
+@pytest.mark.parametrize("price, ingredient_cost, truck_cost", PRICES)
+@pytest.mark.parametrize("seed", range(30))
+def test_presolve_keeps_the_optimal_profit(price, ingredient_cost, truck_cost, seed):
+    inst = random_burrito_instance(np.random.default_rng(seed), price, ingredient_cost, truck_cost)
+    pre = presolve(inst)
+    assert brute_force_presolved(pre) == pytest.approx(brute_force(inst), abs=1e-6)
+
+
+@pytest.mark.parametrize("price, ingredient_cost, truck_cost", PRICES)
+def test_presolve_rules_fire(price, ingredient_cost, truck_cost):
+    # αλλιώς το προηγούμενο test δεν ελέγχει τίποτα
+    reports = [presolve(random_burrito_instance(np.random.default_rng(seed), price, ingredient_cost, truck_cost)).report
+               for seed in range(30)]
+    for key in ('trucks_dropped', 'trucks_fixed_open', 'pairs_removed'):
+        assert sum(report[key] for report in reports) > 0
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_cpsat_on_the_presolved_model_matches_brute_force(seed):
+    from burrito_model import burrito_problem
+    from opsearch import ir
+    inst = random_burrito_instance(np.random.default_rng(seed), 10.35, 10.0, 9.87)
+    pre = presolve(inst)
+    status, _, profit, values = ir.solve(burrito_problem(inst, pre), "CPSAT")
+    expected = brute_force(inst)
+    assert status == "OPTIMAL"
+    assert profit == pytest.approx(expected, abs=1e-6)
+    values = np.asarray(values) > 0.5
+    selected, open_trucks = pre.expand(values[:pre.pairs.size], values[pre.pairs.size:])
+    assert inst.summary(selected, open_trucks)['profit'] == pytest.approx(expected, abs=1e-6)
@@ -0,0 +1,18 @@
+from anytime import print_incumbent
+from read_dataset import SCENARIO
+from run_scenarios import solve_day
+
+
+def test_progress_is_printed_while_the_day_is_solving(capsys):
+    # το stdout του solve_day κρατιέται για την τελική αναφορά· τα incumbents πρέπει να
+    # έχουν φανεί στο stderr ήδη μέσα στο callback, πριν τελειώσει η μέρα
+    streamed = []
+
+    def on_solution(event):
+        print_incumbent(event)
+        streamed.append(capsys.readouterr().err)
+
+    result = solve_day('ufl', SCENARIO, 1, 1, None, {'on_solution': on_solution})
+    assert streamed and all('[day 1, ' in text and 'incumbent' in text for text in streamed)
+    assert 'incumbent' not in result['output']
+    assert result['output'].startswith('\nDay 1\nProfit: ')
@@ -0,0 +1,77 @@
+
+import os
+
+import numpy as np
+import pytest
+
+from conftest import ROOT_DIR
+from matrix_loader import load_matrix
+from solution_io import (check_solution, format_solution, read_solution, verify_solution, write_binary_solution,
+                         write_solution)
+
+ERGASIA1_DIR = os.path.join(ROOT_DIR, "Ergasia1_OS")
+JOBS_MATRIX = np.array([[4, 1, 3], [2, 0, 5], [3, 2, 2]])
+
+
+def write(file_path, total_cost, assignments):
+    if file_path.endswith(".bin"):
+        write_binary_solution(file_path, total_cost, assignments, JOBS_MATRIX.shape[0])
+    else:
+        write_solution(file_path, total_cost, assignments)
+
+
+@pytest.mark.parametrize("name", ["solution.txt", "solution.bin"])
+def test_round_trip(tmp_path, name):
+    file_path = str(tmp_path / name)
+    write(file_path, 5, [(0, 1, 1), (1, 0, 2), (2, 2, 2)])
+    total_cost, rows, cols, _ = read_solution(file_path)
+    assert total_cost == 5
+    assert rows.tolist() == [0, 1, 2] and cols.tolist() == [1, 0, 2]
+    assert check_solution(file_path, JOBS_MATRIX) == []
+
+
+@pytest.mark.parametrize("name", ["solution.txt", "solution.bin"])
+def test_missing_solution(tmp_path, name):
+    file_path = str(tmp_path / name)
+    write(file_path, None, None)
+    total_cost, rows, cols, _ = read_solution(file_path)
+    assert total_cost is None
+    assert rows.size == 0 and cols.size == 0
+    assert check_solution(file_path, JOBS_MATRIX) == ["3 jobs not assigned exactly once"]
+
+
+@pytest.mark.parametrize("dataset, solution, constraints", [
+    ("assign100.txt", "erotima1/assign100_erotima1_solution.txt", {}),
+    ("assign100.txt", "erotima3/assign100_erotima3_solution.txt", {"block_size": 5, "block_min": 2}),
+])
+def test_format_matches_committed_solutions(dataset, solution, constraints):
+    # οι αναθέσεις όπως τις δίνουν οι solvers: κόστος από τον πίνακα, συνολικό κόστος float
+    jobs_matrix = load_matrix(os.path.join(ERGASIA1_DIR, "dataset", dataset), cache=False)
+    file_path = os.path.join(ERGASIA1_DIR, "solutions", solution)
+    _, rows, cols, _ = read_solution(file_path)
+    assignments = [(int(i), int(j), jobs_matrix[i][j]) for i, j in zip(rows, cols)]
+    total_cost = float(sum(int(c) for _, _, c in assignments))
+    with open(file_path, "rb") as file:
+        assert format_solution(total_cost, assignments).encode() == file.read()
+    assert check_solution(file_path, jobs_matrix, **constraints) == []
+
+
+@pytest.mark.parametrize("rows, cols, options, problem", [
+    ([0, 1, 5], [1, 0, 2], {}, "1 assignments outside the 3x3 matrix"),
+    ([0, 1, 2], [1, 0, -1], {}, "1 assignments outside the 3x3 matrix"),
+    ([0, 0, 2], [1, 0, 2], {}, "1 workers assigned more than once"),
+    ([0, 1], [1, 0], {}, "1 jobs not assigned exactly once"),
+    ([0, 1, 2], [1, 1, 2], {}, "2 jobs not assigned exactly once"),
+    ([0, 1], [1, 0], {"rows_equal": True}, "1 workers without a job"),
+    ([0, 1, 2], [1, 0, 2], {"total_cost": 6}, "total cost 6 but the assignments cost 5"),
+    ([0, 1, 2], [1, 0, 2], {"costs": [1, 2, 3]}, "1 lines with a cost different from the matrix"),
+    ([0, 1, 2], [2, 0, 1], {"block_size": 2, "block_min": 1}, "1 blocks with fewer than 1 assignments (first: block 1)"),
+])
+def test_verify_reports_invalid_solutions(rows, cols, options, problem):
+    assert problem in verify_solution(JOBS_MATRIX, rows, cols, **options)
+
+
+def test_verify_accepts_the_block_constraint():
+    # block 0 = γραμμές / στήλες 0-1, block 1 = γραμμή / στήλη 2
+    assert verify_solution(JOBS_MATRIX, [0, 1, 2], [0, 1, 2], total_cost=6, block_size=2, block_min=1) == []
+    assert verify_solution(JOBS_MATRIX, [0, 1, 2], [1, 0, 2], total_cost=5, block_size=2, block_min=1) == []
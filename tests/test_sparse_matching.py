@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+from scipy.optimize import linear_sum_assignment
+
+from sparse_matching import matching_cost, sparse_matching
+
+
+def scipy_cost(costs):
+    rows, cols = linear_sum_assignment(costs)
+    return costs[rows, cols].sum()
+
+
+@pytest.mark.parametrize("seed", range(8))
+@pytest.mark.parametrize("shape", [(6, 6), (9, 5)])
+def test_fractional_costs_match_scipy(shape, seed):
+    costs = np.random.default_rng(seed).random(shape) * 10
+    rows, cols = sparse_matching(costs)
+    total_cost = matching_cost(costs, rows, cols)
+    assert isinstance(total_cost, float)
+    assert total_cost == pytest.approx(scipy_cost(costs))
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_pruned_fractional_costs_match_scipy(seed):
+    rng = np.random.default_rng(seed)
+    costs = rng.random((12, 12)) * 10
+    forbidden = rng.random((12, 12)) < 0.3
+    np.fill_diagonal(forbidden, False)
+    rows, cols = sparse_matching(costs, forbidden=forbidden)
+    assert not forbidden[rows, cols].any()
+    assert matching_cost(costs, rows, cols) == pytest.approx(scipy_cost(np.where(forbidden, 1e6, costs)))
+
+
+def test_integer_costs_stay_integer():
+    costs = np.random.default_rng(0).integers(0, 100, size=(20, 20)).astype(np.int8)
+    rows, cols = sparse_matching(costs, threshold=90)
+    total_cost = matching_cost(costs, rows, cols)
+    assert isinstance(total_cost, int)
+    assert total_cost == scipy_cost(np.where(costs <= 90, costs.astype(np.int64), 10 ** 6))
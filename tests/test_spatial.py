@@ -0,0 +1,73 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import spatial
+from read_dataset import load_day
+from spatial import GridIndex, LinearDecay, build_instance, scaled_demand, write_pairs
+
+# οι καμπύλες με τις οποίες βγήκε το scaled_demand του dataset (πάνω στις αποστάσεις δρόμου του CSV)
+DATASET_DECAYS = {1: (100, 300), 2: (100, 300), 3: (100, 300), 4: (80, 150), 5: (100, 300)}
+
+
+def node_demand(tables):
+    demand = dict(zip(tables['demand_node_data']['index'], tables['demand_node_data']['demand']))
+    return np.array([demand[name] for name in tables['demand_truck_data']['demand_node_index']])
+
+
+@pytest.mark.parametrize("day", sorted(DATASET_DECAYS))
+def test_linear_decay_reproduces_the_dataset(day):
+    tables = load_day(day)
+    pairs = tables['demand_truck_data']
+    units = scaled_demand(node_demand(tables), LinearDecay(*DATASET_DECAYS[day])(pairs['distance'].to_numpy()))
+    assert (units == pairs['scaled_demand'].to_numpy()).all()
+
+
+@pytest.mark.parametrize("day", sorted(DATASET_DECAYS))
+def test_write_pairs_covers_the_dataset_pairs(tmp_path, day):
+    # η ευκλείδεια απόσταση δεν ξεπερνά την απόσταση δρόμου του CSV: κάθε ζεύγος του dataset
+    # με scaled_demand > 0 βγαίνει και από τις συντεταγμένες, με τουλάχιστον τόσο demand
+    tables = load_day(day)
+    path = str(tmp_path / "pairs.csv")
+    decay = LinearDecay(*DATASET_DECAYS[day])
+    rows = write_pairs(path, tables['demand_node_data'], tables['truck_node_data'], decay, chunk_size=7)
+    written = pd.read_csv(path)
+    assert len(written) == rows and os.listdir(tmp_path) == ["pairs.csv"]
+    assert (written['scaled_demand'] > 0).all()
+
+    dataset = tables['demand_truck_data']
+    dataset = dataset[dataset['scaled_demand'] > 0]
+    merged = dataset.merge(written, on=['demand_node_index', 'truck_node_index'], how='left', suffixes=('', '_xy'))
+    assert merged['scaled_demand_xy'].notna().all()
+    assert (merged['distance_xy'] <= merged['distance'] + 1e-9).all()
+    assert (merged['scaled_demand_xy'] >= merged['scaled_demand']).all()
+
+    inst = build_instance(tables['demand_node_data'], tables['truck_node_data'], tables['problem_data'], decay)
+    assert inst.n_pairs == rows and inst.pair_units.sum() == written['scaled_demand'].sum()
+
+
+def test_write_pairs_removes_the_temporary_file(tmp_path, monkeypatch):
+    tables = load_day(1)
+
+    def broken(*args, **kwargs):
+        yield from ()
+        raise OSError("disk full")
+    monkeypatch.setattr(spatial, "stream_pairs", broken)
+    path = str(tmp_path / "pairs.csv")
+    with pytest.raises(OSError):
+        write_pairs(path, tables['demand_node_data'], tables['truck_node_data'])
+    assert os.listdir(tmp_path) == []
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_grid_query_matches_all_pairs(seed):
+    rng = np.random.default_rng(seed)
+    points, queries = rng.random((300, 2)) * 1000, rng.random((80, 2)) * 1000
+    query_ids, point_ids, distance = GridIndex(points[:, 0], points[:, 1], 120).query_radius(queries[:, 0], queries[:, 1], 100)
+    all_distances = np.hypot(queries[:, None, 0] - points[None, :, 0], queries[:, None, 1] - points[None, :, 1])
+    expected_queries, expected_points = np.nonzero(all_distances <= 100)
+    assert query_ids.tolist() == expected_queries.tolist()
+    assert point_ids.tolist() == expected_points.tolist()
+    assert np.allclose(distance, all_distances[expected_queries, expected_points])
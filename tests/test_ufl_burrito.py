@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from conftest import brute_force, random_burrito_instance
+from ufl_burrito import UFLSearch
+
+
+@pytest.mark.parametrize("price, ingredient_cost, truck_cost", [
+    (12.0, 10.0, 30.0),
+    (10.35, 10.0, 9.87),
+    (10.05, 10.0, 2.1),
+])
+@pytest.mark.parametrize("seed", range(40))
+def test_branch_and_bound_matches_brute_force(price, ingredient_cost, truck_cost, seed):
+    inst = random_burrito_instance(np.random.default_rng(seed), price, ingredient_cost, truck_cost)
+    search = UFLSearch(inst)
+    profit, open_trucks, bound, optimal, _ = search.branch_and_bound()
+    expected = brute_force(inst)
+    assert optimal
+    assert profit == pytest.approx(expected, abs=1e-6)
+    assert bound >= expected - 1e-6
+    assert search.state(open_trucks)[0] == pytest.approx(profit, abs=1e-6)
+
+
+def test_fractional_prices_are_not_integral():
+    inst = random_burrito_instance(np.random.default_rng(0), 10.35, 10.0, 5.3)
+    assert not UFLSearch(inst).integral
+
+
+def test_proven_uses_the_profit_step():
+    from anytime import proven
+    integral = random_burrito_instance(np.random.default_rng(0), 12.0, 10.0, 30.0)
+    fractional = random_burrito_instance(np.random.default_rng(0), 10.35, 10.0, 5.3)
+    assert integral.profit_step() == 1.0 and fractional.profit_step() == 0.0
+    assert proven(100.0, 100.5, integral.profit_step())
+    assert not proven(100.0, 100.5, fractional.profit_step())
+    assert proven(100.35, 100.35 + 1e-9, fractional.profit_step())
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_cpsat_matches_brute_force_with_fractional_prices(seed):
+    from burrito_model import burrito_problem
+    from presolve import no_presolve
+    from opsearch import ir
+    inst = random_burrito_instance(np.random.default_rng(seed), 10.35, 10.0, 9.87)
+    status, bound, profit, _ = ir.solve(burrito_problem(inst, no_presolve(inst)), "CPSAT")
+    expected = brute_force(inst)
+    assert status == "OPTIMAL"
+    assert profit == pytest.approx(expected, abs=1e-6)
+    assert bound == pytest.approx(expected, abs=1e-6)